@@ -0,0 +1,33 @@
+"""
+_njit.py
+========
+
+Optional Numba support for the array kernels in core.
+
+Numba is not a hard dependency. When it is not installed, `njit` is a
+no-op decorator and `prange` is `range`, so the same kernels run as plain
+Python over NumPy arrays.
+
+Author: QuantMetrics Development Team
+Version: 1.0
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports @njit and @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+    prange = range
+
+
+__all__ = ['njit', 'prange', 'NUMBA_AVAILABLE']
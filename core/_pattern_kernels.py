@@ -0,0 +1,234 @@
+"""
+_pattern_kernels.py
+===================
+
+Compiled reductions for the pattern analyzers.
+
+fused_timing walks the trade arrays once and fills the per-hour and
+per-session tallies TimingAnalyzer reports, instead of one NumPy pass per
+statistic. Compiled with Numba when it is installed (see core._njit);
+without Numba, timing_tallies is fused_timing_numpy, which computes the
+same tallies from bincounts and one (sessions, trades) membership matrix.
+Histories of PARALLEL_MIN_TRADES or more go through fused_timing_parallel,
+which runs fused_timing on contiguous chunks in separate threads.
+tp_behavior classifies ExecutionAnalyzer's winning trades the same way
+(tp_tallies: tp_behavior_numpy without Numba).
+
+Author: QuantMetrics Development Team
+Version: 1.0
+"""
+
+import os
+
+import numpy as np
+
+from core._njit import njit, prange, NUMBA_AVAILABLE
+
+# Below this many trades one thread is faster than starting the pool
+PARALLEL_MIN_TRADES = 1_000_000
+
+
+@njit(cache=True)
+def fused_timing(hours, profit_r, is_win, is_loss, hour_session_mask, n_sessions):
+    """
+    Per-hour and per-session tallies in one pass.
+
+    Args:
+        hours: UTC hour (0-23) per trade
+        profit_r: R-multiple per trade
+        is_win, is_loss: result flags per trade
+        hour_session_mask: 24-entry table, bit s set if the hour belongs
+            to session s; sessions may overlap, a trade counts in every
+            session whose bit is set
+        n_sessions: number of sessions (bits) in the table
+
+    Returns:
+        (hour_counts[24], hour_wins[24], hour_profit[24], hour_first[24],
+         session_counts[S], session_wins[S], session_losses[S],
+         session_profit[S], session_win_profit[S], session_loss_profit[S])
+        where hour_first is the index of the first trade in each hour
+        (-1 if none).
+    """
+    hour_counts = np.zeros(24, dtype=np.int64)
+    hour_wins = np.zeros(24, dtype=np.int64)
+    hour_profit = np.zeros(24, dtype=np.float64)
+    hour_first = np.full(24, -1, dtype=np.int64)
+    session_counts = np.zeros(n_sessions, dtype=np.int64)
+    session_wins = np.zeros(n_sessions, dtype=np.int64)
+    session_losses = np.zeros(n_sessions, dtype=np.int64)
+    session_profit = np.zeros(n_sessions, dtype=np.float64)
+    session_win_profit = np.zeros(n_sessions, dtype=np.float64)
+    session_loss_profit = np.zeros(n_sessions, dtype=np.float64)
+
+    for i in range(hours.shape[0]):
+        hour = hours[i]
+        win = 1 if is_win[i] else 0
+        loss = 1 if is_loss[i] else 0
+        profit = profit_r[i]
+
+        if hour_first[hour] < 0:
+            hour_first[hour] = i
+        hour_counts[hour] += 1
+        hour_wins[hour] += win
+        hour_profit[hour] += profit
+
+        bits = hour_session_mask[hour]
+        for s in range(n_sessions):
+            if (bits >> s) & 1:
+                session_counts[s] += 1
+                session_wins[s] += win
+                session_losses[s] += loss
+                session_profit[s] += profit
+                if win:
+                    session_win_profit[s] += profit
+                elif loss:
+                    session_loss_profit[s] += profit
+
+    return (hour_counts, hour_wins, hour_profit, hour_first,
+            session_counts, session_wins, session_losses, session_profit,
+            session_win_profit, session_loss_profit)
+
+
+@njit(cache=True, parallel=True)
+def fused_timing_parallel(hours, profit_r, is_win, is_loss, hour_session_mask, n_sessions,
+                          n_chunks):
+    """
+    fused_timing over n_chunks contiguous chunks, one per thread.
+    
+    Each chunk fills its own row of per-chunk tallies, so threads never
+    share an accumulator; the rows are summed afterwards and hour_first
+    is taken from the earliest chunk that saw the hour. Same arguments
+    (plus n_chunks) and results as fused_timing.
+    """
+    n = hours.shape[0]
+    hour_counts = np.zeros((n_chunks, 24), dtype=np.int64)
+    hour_wins = np.zeros((n_chunks, 24), dtype=np.int64)
+    hour_profit = np.zeros((n_chunks, 24), dtype=np.float64)
+    chunk_first = np.full((n_chunks, 24), -1, dtype=np.int64)
+    session_counts = np.zeros((n_chunks, n_sessions), dtype=np.int64)
+    session_wins = np.zeros((n_chunks, n_sessions), dtype=np.int64)
+    session_losses = np.zeros((n_chunks, n_sessions), dtype=np.int64)
+    session_profit = np.zeros((n_chunks, n_sessions), dtype=np.float64)
+    session_win_profit = np.zeros((n_chunks, n_sessions), dtype=np.float64)
+    session_loss_profit = np.zeros((n_chunks, n_sessions), dtype=np.float64)
+
+    for c in prange(n_chunks):
+        start = c * n // n_chunks
+        end = (c + 1) * n // n_chunks
+        tallies = fused_timing(hours[start:end], profit_r[start:end], is_win[start:end],
+                               is_loss[start:end], hour_session_mask, n_sessions)
+        hour_counts[c] = tallies[0]
+        hour_wins[c] = tallies[1]
+        hour_profit[c] = tallies[2]
+        for hour in range(24):
+            if tallies[3][hour] >= 0:
+                chunk_first[c, hour] = tallies[3][hour] + start
+        session_counts[c] = tallies[4]
+        session_wins[c] = tallies[5]
+        session_losses[c] = tallies[6]
+        session_profit[c] = tallies[7]
+        session_win_profit[c] = tallies[8]
+        session_loss_profit[c] = tallies[9]
+
+    hour_first = np.full(24, -1, dtype=np.int64)
+    for hour in range(24):
+        for c in range(n_chunks):
+            if chunk_first[c, hour] >= 0:
+                hour_first[hour] = chunk_first[c, hour]
+                break
+
+    return (hour_counts.sum(axis=0), hour_wins.sum(axis=0), hour_profit.sum(axis=0), hour_first,
+            session_counts.sum(axis=0), session_wins.sum(axis=0), session_losses.sum(axis=0),
+            session_profit.sum(axis=0), session_win_profit.sum(axis=0),
+            session_loss_profit.sum(axis=0))
+
+
+def fused_timing_numpy(hours, profit_r, is_win, is_loss, hour_session_mask, n_sessions):
+    """fused_timing with NumPy reductions (same arguments and results)."""
+    hours = hours.astype(np.intp)
+    hour_counts = np.bincount(hours, minlength=24)
+    hour_wins = np.bincount(hours, weights=is_win, minlength=24).astype(np.int64)
+    hour_profit = np.bincount(hours, weights=profit_r, minlength=24)
+    hour_first = np.full(24, -1, dtype=np.int64)
+    seen, first = np.unique(hours, return_index=True)
+    hour_first[seen] = first
+
+    # Row s: trades in session s; every session stat is a reduction over it
+    members = (hour_session_mask[hours] >> np.arange(n_sessions, dtype=np.uint8)[:, None]) & 1
+    members = members.astype(np.float64)
+    win_r = np.where(is_win, profit_r, 0.0)
+    loss_r = np.where(is_loss, profit_r, 0.0)
+    session_counts = members.sum(axis=1).astype(np.int64)
+    session_wins = (members @ is_win.astype(np.float64)).astype(np.int64)
+    session_losses = (members @ is_loss.astype(np.float64)).astype(np.int64)
+    return (hour_counts.astype(np.int64), hour_wins, hour_profit, hour_first,
+            session_counts, session_wins, session_losses, members @ profit_r,
+            members @ win_r, members @ loss_r)
+
+
+@njit(cache=True)
+def tp_behavior(is_long, entry_price, sl, tp, profit_r):
+    """
+    Full-TP hits and missed R of winning trades.
+    
+    A win is a full TP hit when its R-multiple is within 0.2R of the
+    planned reward/risk (0 if the risk is not positive); otherwise it
+    is an early exit that missed (planned - achieved) R.
+    
+    Returns:
+        (full_tp_hits, missed_r)
+    """
+    full_tp_hits = 0
+    missed_r = 0.0
+    for i in range(profit_r.shape[0]):
+        if is_long[i]:
+            risk = entry_price[i] - sl[i]
+            reward = tp[i] - entry_price[i]
+        else:
+            risk = sl[i] - entry_price[i]
+            reward = entry_price[i] - tp[i]
+        theoretical_r = reward / risk if risk > 0 else 0.0
+        if abs(profit_r[i] - theoretical_r) < 0.2:
+            full_tp_hits += 1
+        else:
+            missed_r += theoretical_r - profit_r[i]
+    return full_tp_hits, missed_r
+
+
+def tp_behavior_numpy(is_long, entry_price, sl, tp, profit_r):
+    """tp_behavior with NumPy array expressions (same arguments and results)."""
+    risk = np.where(is_long, entry_price - sl, sl - entry_price)
+    reward = np.where(is_long, tp - entry_price, entry_price - tp)
+    theoretical_r = np.divide(reward, risk, out=np.zeros_like(reward), where=risk > 0)
+    full_tp = np.abs(profit_r - theoretical_r) < 0.2
+    return int(full_tp.sum()), float((theoretical_r - profit_r)[~full_tp].sum())
+
+
+def _fused_timing_dispatch(hours, profit_r, is_win, is_loss, hour_session_mask, n_sessions):
+    """fused_timing, or fused_timing_parallel for histories of PARALLEL_MIN_TRADES or more."""
+    n_chunks = os.cpu_count() or 1
+    if n_chunks > 1 and hours.shape[0] >= PARALLEL_MIN_TRADES:
+        return fused_timing_parallel(hours, profit_r, is_win, is_loss, hour_session_mask,
+                                     n_sessions, n_chunks)
+    return fused_timing(hours, profit_r, is_win, is_loss, hour_session_mask, n_sessions)
+
+
+if NUMBA_AVAILABLE:
+    timing_tallies = _fused_timing_dispatch
+    tp_tallies = tp_behavior
+    # Compile (or load from the on-disk cache) at import, not on first analysis;
+    # the parallel kernel only runs on very large histories and compiles there
+    fused_timing(
+        np.zeros(1, dtype=np.int8), np.zeros(1), np.zeros(1, dtype=np.bool_),
+        np.zeros(1, dtype=np.bool_), np.zeros(24, dtype=np.uint8), 1
+    )
+    tp_behavior(np.zeros(1, dtype=np.bool_), np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1))
+else:
+    timing_tallies = fused_timing_numpy
+    tp_tallies = tp_behavior_numpy
+
+
+__all__ = [
+    'PARALLEL_MIN_TRADES', 'fused_timing', 'fused_timing_parallel', 'fused_timing_numpy',
+    'timing_tallies', 'tp_behavior', 'tp_behavior_numpy', 'tp_tallies'
+]
@@ -13,7 +13,9 @@ Version: 2.3 (All template aliases - maximum compatibility)
 
 from typing import List, Dict, Any
 import statistics
-from core.quantmetrics_schema import QuantMetricsTrade, AnalysisResult
+from operator import attrgetter
+import numpy as np
+from core.quantmetrics_schema import QuantMetricsTrade, AnalysisResult, TradeBatch
 from core.pattern_analyzer import (
     TimingAnalyzer,
     DirectionalAnalyzer, 
@@ -108,22 +110,23 @@ class BasicAnalyzer:
     def _calculate_basic_metrics(self, trades: List[QuantMetricsTrade]) -> Dict[str, Any]:
         """Calculate fundamental metrics."""
         
-        total_trades = len(trades)
-        wins = [t for t in trades if t.result == "WIN"]
-        losses = [t for t in trades if t.result == "LOSS"]
-        timeouts = [t for t in trades if t.result == "TIMEOUT"]
+        batch = TradeBatch.from_trades(trades)
+        profit_r = batch.profit_r
+        is_win = np.asarray(batch.result == "WIN")
+        is_loss = np.asarray(batch.result == "LOSS")
         
-        num_wins = len(wins)
-        num_losses = len(losses)
-        num_timeouts = len(timeouts)
+        total_trades = len(batch)
+        num_wins = int(is_win.sum())
+        num_losses = int(is_loss.sum())
+        num_timeouts = int((batch.result == "TIMEOUT").sum())
         
         # Win Rate
         winrate = (num_wins / total_trades) * 100 if total_trades > 0 else 0
         
         # Profit calculations
-        total_profit = sum(t.profit_r for t in trades)
-        gross_profit = sum(t.profit_r for t in wins)
-        gross_loss = abs(sum(t.profit_r for t in losses))
+        total_profit = float(profit_r.sum())
+        gross_profit = float(profit_r[is_win].sum()) if num_wins else 0
+        gross_loss = abs(float(profit_r[is_loss].sum())) if num_losses else 0
         
         # Profit Factor
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
@@ -136,7 +139,7 @@ class BasicAnalyzer:
         avg_loss = gross_loss / num_losses if num_losses > 0 else 0
         
         # Max Drawdown
-        max_dd = self._calculate_max_drawdown(trades)
+        max_dd = self._equity_max_drawdown(profit_r)
         
         # Return with COMPREHENSIVE ALIASES for maximum template compatibility
         return {
@@ -177,25 +180,15 @@ class BasicAnalyzer:
     
     def _calculate_max_drawdown(self, trades: List[QuantMetricsTrade]) -> float:
         """Calculate maximum drawdown percentage."""
-        
-        equity = [100.0]
-        
-        for trade in trades:
-            change_pct = trade.profit_r * 1.0
-            new_equity = equity[-1] * (1 + change_pct / 100)
-            equity.append(new_equity)
-        
-        peak = equity[0]
-        max_dd = 0.0
-        
-        for value in equity:
-            if value > peak:
-                peak = value
-            dd = ((peak - value) / peak) * 100
-            if dd > max_dd:
-                max_dd = dd
-        
-        return max_dd
+        return self._equity_max_drawdown(TradeBatch.from_trades(trades).profit_r)
+    
+    @staticmethod
+    def _equity_max_drawdown(profit_r: np.ndarray) -> float:
+        """Max drawdown (%) of an equity curve starting at 100, 1% per R."""
+        # Same left-to-right products as compounding trade by trade
+        equity = np.cumprod(np.concatenate(([100.0], 1 + profit_r * 1.0 / 100)))
+        peak = np.maximum.accumulate(equity)
+        return float((((peak - equity) / peak) * 100).max())
 
 
 class AdvancedAnalyzer:
@@ -238,14 +231,14 @@ class AdvancedAnalyzer:
         for quarter in quarters:
             if not quarter:
                 continue
-            wins = sum(1 for t in quarter if t.result == "WIN")
+            wins = list(map(attrgetter('result'), quarter)).count("WIN")
             wr = wins / len(quarter)
             winrates.append(wr)
         
         if len(winrates) < 2:
             return 0.0
         
-        mean_wr = statistics.mean(winrates)
+        mean_wr = statistics.fmean(winrates)
         std_wr = statistics.stdev(winrates)
         
         if mean_wr == 0:
@@ -281,8 +274,8 @@ class AdvancedAnalyzer:
         if len(trades) < 2:
             return 0.0
         
-        returns = [t.profit_r for t in trades]
-        mean_return = statistics.mean(returns)
+        returns = list(map(attrgetter('profit_r'), trades))
+        mean_return = statistics.fmean(returns)
         std_return = statistics.stdev(returns)
         
         if std_return == 0:
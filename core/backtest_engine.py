@@ -9,15 +9,100 @@ Author: QuantMetrics Development Team
 Version: 2.0 (Simplified - Performance Optimized)
 """
 
+from types import MappingProxyType
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 
-from core.quantmetrics_schema import QuantMetricsTrade
-from core.strategy import StrategyDefinition, EntryCondition
+from core.quantmetrics_schema import QuantMetricsTrade, build_trades
+from core.strategy import StrategyDefinition
 from core.data_downloader import DataDownloader
 from core.indicators import IndicatorEngine
+from core._njit import njit
+
+
+# Backtest period -> number of days (read-only, built once at import)
+PERIOD_DAYS = MappingProxyType({
+    '5d': 5, '7d': 7, '1mo': 30, '2mo': 60,
+    '3mo': 90, '6mo': 180, '1y': 365, '2y': 730
+})
+
+# Session windows (UTC hours) for the run_modular session filter.
+# Windows overlap (London/NY), so each hour maps to a bitmask of sessions.
+_SESSION_BITS = {'tokyo': 1, 'london': 2, 'ny': 4}
+_SESSION_HOURS = {'tokyo': range(0, 9), 'london': range(7, 16), 'ny': range(12, 21)}
+_HOUR_SESSION_MASK = np.zeros(24, dtype=np.uint8)
+for _name, _hours in _SESSION_HOURS.items():
+    _HOUR_SESSION_MASK[list(_hours)] |= _SESSION_BITS[_name]
+
+
+@njit(cache=True)
+def _walk_signal_trades(entry_signal, close, high, low, dir_code, tp_pct, sl_pct):
+    """
+    Walk entry signals to TP/SL exits, one trade open at a time.
+    
+    Entry at the signal candle's close; the entry candle itself is already
+    checked for an exit. Returns trade arrays (entry_idx, exit_idx,
+    entry_price, exit_price, sl, tp, risk_distance) trimmed to the closed trades.
+    """
+    n = close.shape[0]
+    entry_idx_arr = np.empty(n, dtype=np.int64)
+    exit_idx_arr = np.empty(n, dtype=np.int64)
+    entry_price_arr = np.empty(n, dtype=np.float64)
+    exit_price_arr = np.empty(n, dtype=np.float64)
+    sl_arr = np.empty(n, dtype=np.float64)
+    tp_arr = np.empty(n, dtype=np.float64)
+    risk_arr = np.empty(n, dtype=np.float64)  # |entry - SL|, reused for R-multiples
+    n_trades = 0
+    
+    sign = 1.0 - 2.0 * dir_code  # +1 = LONG, -1 = SHORT
+    # Favourable / adverse extreme for TP / SL checks
+    if dir_code == 0:
+        favourable = high
+        adverse = low
+    else:
+        favourable = low
+        adverse = high
+    
+    in_trade = False
+    entry_index = 0
+    entry_price = 0.0
+    tp_price = 0.0
+    sl_price = 0.0
+    
+    for i in range(n):
+        if not in_trade:
+            if not entry_signal[i]:
+                continue
+            in_trade = True
+            entry_index = i
+            entry_price = close[i]
+            tp_price = entry_price * (1 + sign * tp_pct)
+            sl_price = entry_price * (1 - sign * sl_pct)
+        
+        if sign * (favourable[i] - tp_price) >= 0:
+            exit_price = tp_price  # TP hit
+        elif sign * (sl_price - adverse[i]) >= 0:
+            exit_price = sl_price  # SL hit
+        else:
+            continue
+        
+        entry_idx_arr[n_trades] = entry_index
+        exit_idx_arr[n_trades] = i
+        entry_price_arr[n_trades] = entry_price
+        exit_price_arr[n_trades] = exit_price
+        sl_arr[n_trades] = sl_price
+        tp_arr[n_trades] = tp_price
+        risk_arr[n_trades] = abs(entry_price - sl_price)
+        n_trades += 1
+        in_trade = False
+    
+    return (
+        entry_idx_arr[:n_trades], exit_idx_arr[:n_trades],
+        entry_price_arr[:n_trades], exit_price_arr[:n_trades],
+        sl_arr[:n_trades], tp_arr[:n_trades], risk_arr[:n_trades]
+    )
 
 
 def clean_and_standardize_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -127,65 +212,14 @@ class BacktestEngine:
         for indicator in strategy.indicators:
             data = self.indicator_engine.calculate(data, indicator)
         
-        # Simulate trades
-        trades = []
-        in_trade = False
-        entry_price = None
-        entry_index = None
-        direction = None
-        
-        for i in range(len(data)):
-            row = data.iloc[i]
-            
-            # Check entry conditions
-            if not in_trade:
-                for condition in strategy.entry_conditions:
-                    if self._check_condition(row, condition):
-                        in_trade = True
-                        entry_price = row['close']
-                        entry_index = i
-                        direction = condition.direction
-                        break
-            
-            # Check exit conditions
-            if in_trade:
-                # Simple exit: TP or SL
-                if direction == 'LONG':
-                    if row['high'] >= entry_price * (1 + strategy.tp_r * strategy.sl_r):
-                        # TP hit
-                        exit_price = entry_price * (1 + strategy.tp_r * strategy.sl_r)
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'LONG', True,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
-                    elif row['low'] <= entry_price * (1 - strategy.sl_r):
-                        # SL hit
-                        exit_price = entry_price * (1 - strategy.sl_r)
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'LONG', False,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
-                else:  # SHORT
-                    if row['low'] <= entry_price * (1 - strategy.tp_r * strategy.sl_r):
-                        # TP hit
-                        exit_price = entry_price * (1 - strategy.tp_r * strategy.sl_r)
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'SHORT', True,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
-                    elif row['high'] >= entry_price * (1 + strategy.sl_r):
-                        # SL hit
-                        exit_price = entry_price * (1 + strategy.sl_r)
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'SHORT', False,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
+        # Entry conditions evaluated for all candles at once
+        entry_mask = self._compile_strategy_mask(data, strategy)
         
-        return trades
+        return self._simulate_signals(
+            data, entry_mask, strategy.direction,
+            tp_pct=strategy.tp_r * strategy.sl_r,
+            sl_pct=strategy.sl_r
+        )
     
     def run_modular(
         self,
@@ -225,13 +259,7 @@ class BacktestEngine:
         total_start = time.time()
         
         # Convert period to start/end dates
-        from datetime import datetime, timedelta
-        
-        period_days = {
-            '5d': 5, '7d': 7, '1mo': 30, '2mo': 60,
-            '3mo': 90, '6mo': 180, '1y': 365, '2y': 730
-        }
-        days = period_days.get(period, 60)
+        days = PERIOD_DAYS.get(period, 60)
         end = datetime.now()
         start = end - timedelta(days=days)
         
@@ -322,9 +350,9 @@ class BacktestEngine:
         print(f"[BACKTEST] Indicators calculated: {len(indicator_cols)}")
         
         # Forward fill indicator NaN values (use last known value)
-        for col in indicator_cols:
-            if col in data.columns:
-                data[col] = data[col].ffill()
+        # One block-level ffill instead of a per-column assign loop
+        if indicator_cols:
+            data[indicator_cols] = data[indicator_cols].ffill()
         
         # Drop rows where price data (OHLC) is NaN
         data = data.dropna(subset=['close'])
@@ -350,20 +378,22 @@ class BacktestEngine:
             data['timestamp'] = data.index
         
         # Apply session filter if specified
+        # Session membership is looked up for all candles at once (hour -> bitmask)
+        session_bit = _SESSION_BITS.get(session.lower()) if session else None
+        if session_bit is not None:
+            hours = data['timestamp'].dt.hour.to_numpy()
+            session_arr = _HOUR_SESSION_MASK[hours]
+            data = data[(session_arr & session_bit) != 0]
+        
         if session:
-            if session.lower() == 'tokyo':
-                data = data[data['timestamp'].dt.hour.isin(range(0, 9))]
-            elif session.lower() == 'london':
-                data = data[data['timestamp'].dt.hour.isin(range(7, 16))]
-            elif session.lower() == 'ny':
-                data = data[data['timestamp'].dt.hour.isin(range(12, 21))]
-            
             print(f"[BACKTEST] After session filter ({session}): {len(data)} rows")
         
         # OPTIMIZED APPROACH: Try vectorized first, fallback to row-by-row if needed
         # Many modules already have boolean columns we can use directly
         print(f"[BACKTEST] Computing entry conditions for {len(data)} rows...")
         
+        # Column membership is checked against a set built once, not data.columns per check
+        columns = frozenset(data.columns)
         condition_series = {}
         for module_item in modules:
             module = module_item['module']
@@ -377,14 +407,14 @@ class BacktestEngine:
                 vectorized = False
                 
                 # Simple boolean column checks (kill_zones, liquidity_sweep, etc.)
-                if module_id == 'kill_zones' and 'in_kill_zone' in data.columns:
+                if module_id == 'kill_zones' and 'in_kill_zone' in columns:
                     condition_series[module_id] = data['in_kill_zone'] == True
                     vectorized = True
                 elif module_id == 'liquidity_sweep':
-                    if direction == 'LONG' and 'bullish_sweep' in data.columns:
+                    if direction == 'LONG' and 'bullish_sweep' in columns:
                         condition_series[module_id] = data['bullish_sweep'] == True
                         vectorized = True
-                    elif direction == 'SHORT' and 'bearish_sweep' in data.columns:
+                    elif direction == 'SHORT' and 'bearish_sweep' in columns:
                         condition_series[module_id] = data['bearish_sweep'] == True
                         vectorized = True
                 elif module_id == 'mitigation_blocks':
@@ -428,118 +458,93 @@ class BacktestEngine:
         
         # Combine all conditions (AND logic - all must be True)
         print(f"[BACKTEST] Combining conditions...")
-        entry_signal = pd.Series(True, index=data.index)
+        entry_signal = np.ones(len(data), dtype=bool)
         for module_id, series in condition_series.items():
-            entry_signal = entry_signal & series
+            entry_signal &= series.to_numpy(dtype=bool)
         
         entry_count = entry_signal.sum()
         print(f"[BACKTEST] Entry signals: {entry_count} rows meet all conditions")
         
         # Simulate trades using vectorized entry signals
-        trades = []
-        in_trade = False
-        entry_price = None
-        entry_index = None
-        trade_direction = None
-        
         print(f"[BACKTEST] Simulating trades on {len(data)} rows...")
         
-        for i in range(len(data)):
-            # Check entry signal (pre-computed)
-            if not in_trade:
-                if entry_signal.iloc[i]:
-                    in_trade = True
-                    entry_price = data.iloc[i]['close']
-                    entry_index = i
-                    trade_direction = direction
-            
-            # Check exit conditions (TP/SL)
-            if in_trade:
-                row = data.iloc[i]
-                if trade_direction == 'LONG':
-                    tp_price = entry_price * (1 + tp_r * sl_r)
-                    sl_price = entry_price * (1 - sl_r)
-                    
-                    if row['high'] >= tp_price:
-                        # TP hit
-                        exit_price = tp_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'LONG', True,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
-                    elif row['low'] <= sl_price:
-                        # SL hit
-                        exit_price = sl_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'LONG', False,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
-                else:  # SHORT
-                    tp_price = entry_price * (1 - tp_r * sl_r)
-                    sl_price = entry_price * (1 + sl_r)
-                    
-                    if row['low'] <= tp_price:
-                        # TP hit
-                        exit_price = tp_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'SHORT', True,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
-                    elif row['high'] >= sl_price:
-                        # SL hit
-                        exit_price = sl_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'SHORT', False,
-                            data.index[entry_index], data.index[i]
-                        ))
-                        in_trade = False
+        trades = self._simulate_signals(
+            data, entry_signal, direction,
+            tp_pct=tp_r * sl_r,
+            sl_pct=sl_r
+        )
         
         total_elapsed = time.time() - total_start
         print(f"[BACKTEST] Total time: {total_elapsed:.2f}s, Generated {len(trades)} trades")
         
         return trades
     
-    def _check_condition(self, row: pd.Series, condition: EntryCondition) -> bool:
-        """Check if a condition is met for a given row."""
-        value = row.get(condition.indicator, None)
-        if value is None or pd.isna(value):
-            return False
-        
-        if condition.operator == '>':
-            return value > condition.value
-        elif condition.operator == '<':
-            return value < condition.value
-        elif condition.operator == '>=':
-            return value >= condition.value
-        elif condition.operator == '<=':
-            return value <= condition.value
-        elif condition.operator == '==':
-            return value == condition.value
-        else:
-            return False
-    
-    def _create_trade(
+    def _simulate_signals(
         self,
-        entry_price: float,
-        exit_price: float,
+        data: pd.DataFrame,
+        entry_mask: np.ndarray,
         direction: str,
-        is_winner: bool,
-        entry_time: datetime,
-        exit_time: datetime
-    ) -> QuantMetricsTrade:
-        """Create a QuantMetricsTrade object."""
-        return QuantMetricsTrade(
-            symbol="",  # Will be set by analyzer
-            direction=direction,
-            entry_price=entry_price,
-            exit_price=exit_price,
-            entry_time=entry_time,
-            exit_time=exit_time,
-            pnl=exit_price - entry_price if direction == 'LONG' else entry_price - exit_price,
-            pnl_pct=(exit_price - entry_price) / entry_price * 100 if direction == 'LONG' else (entry_price - exit_price) / entry_price * 100,
-            is_winner=is_winner,
-            r_multiple=(exit_price - entry_price) / (entry_price * 0.01) if direction == 'LONG' else (entry_price - exit_price) / (entry_price * 0.01)
+        tp_pct: float,
+        sl_pct: float
+    ) -> List[QuantMetricsTrade]:
+        """
+        Walk pre-computed entry signals to TP/SL exits.
+        
+        Enters at the close of a signal candle; TP/SL are set as fractions
+        of the entry price. Price columns are read as NumPy arrays once,
+        trades are built in one go via build_trades.
+        """
+        dir_code = 0 if direction == 'LONG' else 1
+        
+        entry_idx, exit_idx, entry_price, exit_price, sl, tp, risk = _walk_signal_trades(
+            np.ascontiguousarray(entry_mask, dtype=np.bool_),
+            data['close'].to_numpy(dtype=np.float64),
+            data['high'].to_numpy(dtype=np.float64),
+            data['low'].to_numpy(dtype=np.float64),
+            dir_code, float(tp_pct), float(sl_pct)
         )
+        
+        timestamps = data.index.to_numpy()  # boxed to Timestamps only for actual trades
+        return build_trades(
+            timestamps[entry_idx],
+            timestamps[exit_idx],
+            np.full(len(entry_idx), dir_code, dtype=np.int8),
+            entry_price,
+            exit_price,
+            sl,
+            tp,
+            risk_distance=risk
+        )
+    
+    # Vectorized comparison for each EntryCondition operator
+    _CONDITION_OPS = {
+        '>': np.greater,
+        '<': np.less,
+        '>=': np.greater_equal,
+        '<=': np.less_equal,
+        '==': np.equal,
+    }
+    
+    def _compile_strategy_mask(self, data: pd.DataFrame, strategy: StrategyDefinition) -> np.ndarray:
+        """
+        Evaluate all entry conditions over the full data at once.
+        
+        All conditions must be true (AND). A condition on a missing
+        indicator column, a NaN value or an unsupported operator never
+        matches.
+        
+        Returns:
+            Boolean array with one entry per row of data
+        """
+        mask = np.ones(len(data), dtype=bool)
+        
+        for condition in strategy.entry_conditions:
+            op = self._CONDITION_OPS.get(condition.operator)
+            if op is None or condition.indicator not in data.columns:
+                mask[:] = False
+                break
+            
+            values = pd.to_numeric(data[condition.indicator], errors='coerce').to_numpy(dtype=np.float64)
+            mask &= op(values, condition.value) & ~np.isnan(values)
+        
+        return mask
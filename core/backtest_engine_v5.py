@@ -9,13 +9,161 @@ Author: QuantMetrics Development Team
 Version: 5.0 (Direct ICT Strategy)
 """
 
+import logging
+from types import MappingProxyType
 from typing import List, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 
-from core.quantmetrics_schema import QuantMetricsTrade
+from core.quantmetrics_schema import QuantMetricsTrade, build_trades
 from core.data_downloader import DataDownloader
+from core._njit import njit
+
+try:
+    import pyarrow  # noqa: F401
+    # Arrow-backed strings: compact storage, C-level comparisons
+    BIAS_DTYPE = 'string[pyarrow]'
+except ImportError:
+    BIAS_DTYPE = 'string'
+
+
+logger = logging.getLogger('edgelab.backtest_v5')
+
+# Test period -> number of days (read-only, built once at import)
+PERIOD_DAYS = MappingProxyType({
+    '1mo': 30,
+    '2mo': 60,
+    '3mo': 90
+})
+
+# How many candles before a displacement to look for a liquidity sweep
+SWEEP_LOOKBACK = 20
+
+
+@njit(cache=True)
+def _walk_trades(
+    high, low, entry_px, sweep_px,
+    not_neutral, displacement_ok, sweep_flag, bias_dir,
+    long_ok, short_ok,
+    tp_r, risk_per_trade, beyond_sweep, lookback
+):
+    """
+    Single pass over the candles: find entries and walk them to TP/SL.
+    
+    Entry and exit handling are fused, so the OHLC arrays are read once.
+    Compiled with Numba when available, plain Python otherwise.
+    
+    Returns:
+        Trade arrays (entry_idx, exit_idx, direction_code, entry_price,
+        exit_price, sl, tp, risk_distance) trimmed to the number of closed trades, plus
+        an int64[5] array with how many candles passed each entry stage.
+    """
+    n = high.shape[0]
+    # At most one trade can be open per candle, so n is an upper bound
+    entry_idx_arr = np.empty(n, dtype=np.int64)
+    exit_idx_arr = np.empty(n, dtype=np.int64)
+    dir_arr = np.empty(n, dtype=np.int8)  # 0 = LONG, 1 = SHORT
+    entry_price_arr = np.empty(n, dtype=np.float64)
+    exit_price_arr = np.empty(n, dtype=np.float64)
+    sl_arr = np.empty(n, dtype=np.float64)
+    tp_arr = np.empty(n, dtype=np.float64)
+    risk_arr = np.empty(n, dtype=np.float64)  # |entry - SL|, reused for R-multiples
+    # htf_bias_ok, displacement_ok, sweep_ok, direction_ok, additional_blocks_ok
+    stage_counts = np.zeros(5, dtype=np.int64)
+    n_trades = 0
+    
+    in_trade = False
+    entry_index = 0
+    dir_code = 0
+    sign = 1.0  # +1 = LONG, -1 = SHORT
+    entry_price = 0.0
+    sl_price = 0.0
+    tp_price = 0.0
+    risk_distance = 0.0
+    
+    for i in range(n):
+        if not in_trade:
+            # Must have HTF bias
+            if not not_neutral[i]:
+                continue
+            stage_counts[0] += 1
+            
+            # Must have displacement detected
+            if not displacement_ok[i]:
+                continue
+            stage_counts[1] += 1
+            
+            # Sweep BEFORE this displacement (first one within the lookback)
+            sweep_idx = -1
+            for j in range(max(0, i - lookback), i):
+                if sweep_flag[j]:
+                    sweep_idx = j
+                    break
+            if sweep_idx < 0:
+                continue
+            stage_counts[2] += 1
+            
+            # BULLISH -> LONG, BEARISH -> SHORT
+            if bias_dir[i] < 0:
+                continue
+            stage_counts[3] += 1
+            
+            if bias_dir[i] == 0:
+                blocks_ok = long_ok[i]
+            else:
+                blocks_ok = short_ok[i]
+            if not blocks_ok:
+                continue
+            stage_counts[4] += 1
+            
+            dir_code = bias_dir[i]
+            sign = 1.0 - 2.0 * dir_code
+            entry_price = entry_px[i]
+            entry_index = i
+            
+            if beyond_sweep:
+                # Slightly below sweep (LONG) / slightly above sweep (SHORT)
+                sl_price = sweep_px[sweep_idx] * (1 - sign * 0.001)
+            else:
+                # Default: 1% risk
+                sl_price = entry_price * (1 - sign * 0.01)
+            
+            risk_distance = abs(entry_price - sl_price)
+            tp_price = entry_price + sign * risk_distance * risk_per_trade * tp_r
+            in_trade = True
+        
+        # Exit: favourable extreme against TP, adverse extreme against SL
+        if dir_code == 0:
+            favourable = high[i]
+            adverse = low[i]
+        else:
+            favourable = low[i]
+            adverse = high[i]
+        
+        if sign * (favourable - tp_price) >= 0:
+            exit_price = tp_price  # TP hit
+        elif sign * (sl_price - adverse) >= 0:
+            exit_price = sl_price  # SL hit
+        else:
+            continue
+        
+        entry_idx_arr[n_trades] = entry_index
+        exit_idx_arr[n_trades] = i
+        dir_arr[n_trades] = dir_code
+        entry_price_arr[n_trades] = entry_price
+        exit_price_arr[n_trades] = exit_price
+        sl_arr[n_trades] = sl_price
+        tp_arr[n_trades] = tp_price
+        risk_arr[n_trades] = risk_distance
+        n_trades += 1
+        in_trade = False
+    
+    return (
+        entry_idx_arr[:n_trades], exit_idx_arr[:n_trades], dir_arr[:n_trades],
+        entry_price_arr[:n_trades], exit_price_arr[:n_trades],
+        sl_arr[:n_trades], tp_arr[:n_trades], risk_arr[:n_trades], stage_counts
+    )
 
 
 class BacktestEngineV5:
@@ -68,12 +216,7 @@ class BacktestEngineV5:
         start_time = time.time()
         
         # Convert period to dates
-        period_days = {
-            '1mo': 30,
-            '2mo': 60,
-            '3mo': 90
-        }
-        days = period_days.get(test_period, 30)
+        days = PERIOD_DAYS.get(test_period, 30)
         end = datetime.now()
         start = end - timedelta(days=days)
         
@@ -151,7 +294,7 @@ class BacktestEngineV5:
         # This ensures htf_bias is set before modules potentially modify the dataframe
         htf_bias_series = htf_bias['direction'].fillna('NEUTRAL').astype(str)
         htf_bias_series = htf_bias_series.replace('nan', 'NEUTRAL')
-        entry_data['htf_bias'] = htf_bias_series
+        entry_data['htf_bias'] = htf_bias_series.astype(BIAS_DTYPE)
         
         entry_data['sweep_detected'] = sweeps['sweep_detected']
         entry_data['sweep_price'] = sweeps['sweep_price']
@@ -236,7 +379,7 @@ class BacktestEngineV5:
             htf_bias_series = htf_bias_series.replace('nan', 'NEUTRAL')
             # Reindex to match current entry_data index
             htf_bias_series = htf_bias_series.reindex(entry_data.index, method='ffill').fillna('NEUTRAL')
-            entry_data['htf_bias'] = htf_bias_series.astype(str).replace('nan', 'NEUTRAL')
+            entry_data['htf_bias'] = htf_bias_series.astype(str).replace('nan', 'NEUTRAL').astype(BIAS_DTYPE)
         
         # Simulate trades
         print(f"[V5] Simulating trades...")
@@ -376,58 +519,43 @@ class BacktestEngineV5:
         
         Returns DataFrame with 'sweep_detected' and 'sweep_price' columns.
         """
-        data = data.copy()
         sweep_type = config.get('sweepType', 'equal_highs')
         tolerance = config.get('tolerance', 0.1) / 100.0  # Convert % to decimal
         lookback = config.get('lookback', 20)
         
+        n = len(data)
+        sweep_detected = np.zeros(n, dtype=bool)
+        sweep_price = np.full(n, np.nan)
+        
+        if sweep_type in ('equal_highs', 'equal_lows') and n > lookback:
+            # Current high (low) within tolerance of any of the previous `lookback` highs (lows)
+            prices = data['high' if sweep_type == 'equal_highs' else 'low'].to_numpy(dtype=np.float64)
+            current = prices[lookback:]
+            previous = np.lib.stride_tricks.sliding_window_view(prices, lookback)[:-1]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                hit = (np.abs(current[:, None] - previous) / previous <= tolerance).any(axis=1)
+            sweep_detected[lookback:] = hit
+            sweep_price[lookback:][hit] = current[hit]
+        
+        elif sweep_type in ('session_high', 'session_low'):
+            # Previous session high/low - assume 24 candles per day for 1h, adjust for other timeframes
+            start = max(lookback, 24)
+            if n > start:
+                if sweep_type == 'session_high':
+                    prices = data['high']
+                    session_level = prices.rolling(24, min_periods=1).max().shift(1).to_numpy()
+                    hit = prices.to_numpy(dtype=np.float64) >= session_level
+                else:
+                    prices = data['low']
+                    session_level = prices.rolling(24, min_periods=1).min().shift(1).to_numpy()
+                    hit = prices.to_numpy(dtype=np.float64) <= session_level
+                hit[:start] = False
+                sweep_detected[hit] = True
+                sweep_price[hit] = session_level[hit]
+        
         result = pd.DataFrame(index=data.index)
-        result['sweep_detected'] = False
-        result['sweep_price'] = np.nan
-        
-        for i in range(lookback, len(data)):
-            if sweep_type == 'equal_highs':
-                # Check if current high is equal to previous highs
-                lookback_data = data.iloc[i-lookback:i]
-                prev_highs = lookback_data['high'].values
-                current_high = data.iloc[i]['high']
-                
-                # Check if current high is within tolerance of any previous high
-                for prev_high in prev_highs:
-                    if abs(current_high - prev_high) / prev_high <= tolerance:
-                        result.iloc[i, result.columns.get_loc('sweep_detected')] = True
-                        result.iloc[i, result.columns.get_loc('sweep_price')] = current_high
-                        break
-            
-            elif sweep_type == 'equal_lows':
-                # Check if current low is equal to previous lows
-                lookback_data = data.iloc[i-lookback:i]
-                prev_lows = lookback_data['low'].values
-                current_low = data.iloc[i]['low']
-                
-                for prev_low in prev_lows:
-                    if abs(current_low - prev_low) / prev_low <= tolerance:
-                        result.iloc[i, result.columns.get_loc('sweep_detected')] = True
-                        result.iloc[i, result.columns.get_loc('sweep_price')] = current_low
-                        break
-            
-            elif sweep_type == 'session_high':
-                # Previous session high
-                if i >= 24:  # Assume 24 candles per day for 1h, adjust for other timeframes
-                    session_data = data.iloc[i-24:i]
-                    session_high = session_data['high'].max()
-                    if data.iloc[i]['high'] >= session_high:
-                        result.iloc[i, result.columns.get_loc('sweep_detected')] = True
-                        result.iloc[i, result.columns.get_loc('sweep_price')] = session_high
-            
-            elif sweep_type == 'session_low':
-                # Previous session low
-                if i >= 24:
-                    session_data = data.iloc[i-24:i]
-                    session_low = session_data['low'].min()
-                    if data.iloc[i]['low'] <= session_low:
-                        result.iloc[i, result.columns.get_loc('sweep_detected')] = True
-                        result.iloc[i, result.columns.get_loc('sweep_price')] = session_low
+        result['sweep_detected'] = sweep_detected
+        result['sweep_price'] = sweep_price
         
         return result
     
@@ -529,54 +657,55 @@ class BacktestEngineV5:
         """
         # Try to infer vectorized condition from module_id and data columns
         # This works for simple modules that set boolean flags
+        columns = frozenset(data.columns)
         
         # Kill Zones - simple boolean check
-        if module_id == 'kill_zones' and 'in_kill_zone' in data.columns:
+        if module_id == 'kill_zones' and 'in_kill_zone' in columns:
             return data['in_kill_zone'] == True
         
         # Premium/Discount Zones - direction dependent, return all True (filter later)
         elif module_id == 'premium_discount_zones':
-            if 'in_discount' in data.columns and 'in_premium' in data.columns:
+            if 'in_discount' in columns and 'in_premium' in columns:
                 return pd.Series(True, index=data.index)
         
         # Order Blocks
         elif module_id == 'order_blocks':
-            if 'in_bullish_ob' in data.columns and 'in_bearish_ob' in data.columns:
+            if 'in_bullish_ob' in columns and 'in_bearish_ob' in columns:
                 return (data['in_bullish_ob'] == True) | (data['in_bearish_ob'] == True)
         
         # Breaker Blocks
         elif module_id == 'breaker_blocks':
-            if 'in_bullish_breaker' in data.columns and 'in_bearish_breaker' in data.columns:
+            if 'in_bullish_breaker' in columns and 'in_bearish_breaker' in columns:
                 return (data['in_bullish_breaker'] == True) | (data['in_bearish_breaker'] == True)
         
         # Imbalance Zones
         elif module_id == 'imbalance_zones':
-            if 'in_bullish_imbalance' in data.columns and 'in_bearish_imbalance' in data.columns:
+            if 'in_bullish_imbalance' in columns and 'in_bearish_imbalance' in columns:
                 return (data['in_bullish_imbalance'] == True) | (data['in_bearish_imbalance'] == True)
         
         # Fair Value Gaps
         elif module_id == 'fair_value_gaps':
-            if 'in_bullish_fvg' in data.columns and 'in_bearish_fvg' in data.columns:
+            if 'in_bullish_fvg' in columns and 'in_bearish_fvg' in columns:
                 return (data['in_bullish_fvg'] == True) | (data['in_bearish_fvg'] == True)
         
         # Market Structure Shift
         elif module_id == 'market_structure_shift':
-            if 'mss_active' in data.columns:
+            if 'mss_active' in columns:
                 return data['mss_active'] == True
         
         # Mitigation Blocks
         elif module_id == 'mitigation_blocks':
-            if 'mitigation_active' in data.columns:
+            if 'mitigation_active' in columns:
                 return data['mitigation_active'] == True
         
         # Displacement
         elif module_id == 'displacement':
-            if 'displacement_active' in data.columns:
+            if 'displacement_active' in columns:
                 return data['displacement_active'] == True
         
         # Inducement
         elif module_id == 'inducement':
-            if 'inducement_active' in data.columns:
+            if 'inducement_active' in columns:
                 return data['inducement_active'] == True
         
         # Fallback: row-by-row check (slower but works for all modules)
@@ -601,6 +730,54 @@ class BacktestEngineV5:
         
         return pd.Series(results, index=data.index, dtype=bool)
     
+    # Direction-specific zone columns checked on top of a block's condition
+    # series: module_id -> (LONG column, SHORT column)
+    _BLOCK_DIRECTION_COLUMNS = {
+        'premium_discount_zones': ('in_discount', 'in_premium'),
+        'order_blocks': ('in_bullish_ob', 'in_bearish_ob'),
+        'breaker_blocks': ('in_bullish_breaker', 'in_bearish_breaker'),
+        'imbalance_zones': ('in_bullish_imbalance', 'in_bearish_imbalance'),
+        'fair_value_gaps': ('in_bullish_fvg', 'in_bearish_fvg'),
+    }
+    
+    def _combine_block_conditions(
+        self,
+        data: pd.DataFrame,
+        additional_blocks: Optional[dict]
+    ) -> tuple:
+        """
+        AND-reduce the pre-computed block conditions into one array per direction.
+        
+        Returns:
+            (long_ok, short_ok, fallback_blocks) - boolean arrays over data rows,
+            plus (module_id, block_info) pairs without a condition series that
+            still need the row-by-row check.
+        """
+        n = len(data)
+        columns = frozenset(data.columns)
+        long_ok = np.ones(n, dtype=bool)
+        short_ok = np.ones(n, dtype=bool)
+        fallback_blocks = []
+        
+        for module_id, block_info in (additional_blocks or {}).items():
+            if 'condition_series' not in block_info:
+                fallback_blocks.append((module_id, block_info))
+                continue
+            
+            condition = np.asarray(block_info['condition_series'].to_numpy(), dtype=bool)
+            long_ok &= condition
+            short_ok &= condition
+            
+            direction_columns = self._BLOCK_DIRECTION_COLUMNS.get(module_id)
+            if direction_columns:
+                for ok, col in zip((long_ok, short_ok), direction_columns):
+                    if col in columns:
+                        ok &= np.asarray(data[col].to_numpy(), dtype=bool)
+                    else:
+                        ok[:] = False
+        
+        return long_ok, short_ok, fallback_blocks
+    
     def _simulate_trades(
         self, 
         data: pd.DataFrame, 
@@ -626,286 +803,94 @@ class BacktestEngineV5:
             # Remove rows with invalid timestamps
             data = data[data.index.notna()]
         
-        trades = []
-        in_trade = False
-        entry_price = None
-        entry_index = None
-        trade_direction = None
-        sl_price = None
-        tp_price = None
+        n = len(data)
+        timestamps = data.index.to_numpy()  # boxed to Timestamps only for actual trades
         
         tp_r = risk.get('takeProfit', 2.0)
         risk_per_trade = risk.get('riskPerTrade', 1.0)
-        
-        # Debug: Count potential entries at each stage
-        potential_entries = {
-            'htf_bias_ok': 0,
-            'displacement_ok': 0,
-            'sweep_ok': 0,
-            'direction_ok': 0,
-            'additional_blocks_ok': 0,
-            'final_entries': 0
-        }
         sl_method = risk.get('stopLoss', 'beyond_sweep')
         
-        for i in range(len(data)):
-            row = data.iloc[i]
-            
-            # Check entry conditions
-            if not in_trade:
-                # Must have HTF bias
-                if row['htf_bias'] == 'NEUTRAL':
-                    continue
-                potential_entries['htf_bias_ok'] += 1
-                
-                # Must have displacement detected
-                if not row['displacement_detected']:
+        # Per-candle inputs for the trade walk, extracted once as NumPy arrays
+        # HTF bias compared as a string-dtype column (missing values are NA, never a match)
+        htf_bias = data['htf_bias'].astype(BIAS_DTYPE)
+        not_neutral = (htf_bias != 'NEUTRAL').to_numpy(dtype=bool, na_value=True)
+        # HTF bias -> direction code: 0 = LONG (BULLISH), 1 = SHORT (BEARISH), -1 = no trade
+        htf_bias_value = htf_bias.str.strip().str.upper()
+        bias_dir = np.full(n, -1, dtype=np.int8)
+        bias_dir[(htf_bias_value == 'BULLISH').to_numpy(dtype=bool, na_value=False)] = 0
+        bias_dir[(htf_bias_value == 'BEARISH').to_numpy(dtype=bool, na_value=False)] = 1
+        
+        # Debug first few values
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in range(min(3, n)):
+                logger.debug(
+                    "[V5] Debug: Index %d, htf_bias_raw=%r, htf_bias_value='%s'",
+                    i, htf_bias.iloc[i], htf_bias_value.iloc[i]
+                )
+        
+        displacement_ok = np.asarray(data['displacement_detected'].to_numpy(), dtype=bool)
+        sweep_flag = np.asarray(data['sweep_detected'].to_numpy(), dtype=bool)
+        high = data['high'].to_numpy(dtype=np.float64)
+        low = data['low'].to_numpy(dtype=np.float64)
+        # Entry at displacement price (close of displacement candle)
+        entry_px = data['displacement_price'].to_numpy(dtype=np.float64)
+        sweep_px = data['sweep_price'].to_numpy(dtype=np.float64)
+        
+        # The set of additional blocks is fixed for the run, so reduce it once
+        # to one boolean array per direction instead of re-dispatching per candle
+        long_blocks_ok, short_blocks_ok, fallback_blocks = self._combine_block_conditions(
+            data, additional_blocks
+        )
+        
+        if fallback_blocks:
+            # Fallback: row-by-row check (slower - should not happen if precompute worked).
+            # Only evaluated on candles that can become an entry.
+            candidates = np.flatnonzero(not_neutral & displacement_ok & (bias_dir >= 0))
+            for i in candidates:
+                is_long = bias_dir[i] == 0
+                blocks_ok = long_blocks_ok if is_long else short_blocks_ok
+                if not blocks_ok[i]:
                     continue
-                potential_entries['displacement_ok'] += 1
-                
-                # Check if there was a sweep BEFORE this displacement
-                # Look back up to 20 candles for a recent sweep
-                sweep_found = False
-                sweep_idx = None
-                for j in range(max(0, i-20), i):
-                    if data.iloc[j]['sweep_detected']:
-                        sweep_found = True
-                        sweep_idx = j
+                trade_direction = 'LONG' if is_long else 'SHORT'
+                for module_id, block_info in fallback_blocks:
+                    module = block_info['module']
+                    config = block_info['config']
+                    try:
+                        passed = module.check_entry_condition(data, int(i), config, trade_direction)
+                    except Exception as e:
+                        passed = False
+                    if not passed:
+                        blocks_ok[i] = False
                         break
-                
-                if not sweep_found:
-                    continue  # No sweep before displacement
-                potential_entries['sweep_ok'] += 1
-                
-                # Determine trade direction based on HTF bias
-                # If HTF bias is BULLISH, trade LONG
-                # If HTF bias is BEARISH, trade SHORT
-                htf_bias_raw = row['htf_bias']
-                
-                # Handle NaN or None values
-                if pd.isna(htf_bias_raw) or htf_bias_raw is None:
-                    continue  # Skip NaN values
-                
-                # Convert to string and normalize
-                htf_bias_value = str(htf_bias_raw).strip().upper()
-                
-                # Handle 'nan' strings (from float NaN conversion)
-                if htf_bias_value == 'NAN' or htf_bias_value == '':
-                    continue
-                
-                # Debug first few values
-                if i < 3:
-                    print(f"[V5] Debug: Index {i}, htf_bias_raw={htf_bias_raw} (type: {type(htf_bias_raw)}), htf_bias_value='{htf_bias_value}'")
-                
-                if htf_bias_value == 'BULLISH':
-                    trade_direction = 'LONG'
-                    potential_entries['direction_ok'] += 1
-                elif htf_bias_value == 'BEARISH':
-                    trade_direction = 'SHORT'
-                    potential_entries['direction_ok'] += 1
-                else:
-                    # Should be NEUTRAL (already filtered above) or unexpected value
-                    if i < 3:
-                        print(f"[V5] Debug: Skipping - htf_bias_value='{htf_bias_value}' is not BULLISH or BEARISH")
-                    continue
-                
-                # Check additional ICT blocks (if any) - VECTORIZED (much faster)
-                if additional_blocks and len(additional_blocks) > 0:
-                    all_blocks_pass = True
-                    for module_id, block_info in additional_blocks.items():
-                        # Use pre-computed condition series (much faster than row-by-row)
-                        if 'condition_series' in block_info:
-                            condition_series = block_info['condition_series']
-                            if not condition_series.iloc[i]:
-                                all_blocks_pass = False
-                                break
-                            
-                            # For direction-specific modules, check direction
-                            row = data.iloc[i]
-                            if module_id == 'premium_discount_zones':
-                                if trade_direction == 'LONG' and not row.get('in_discount', False):
-                                    all_blocks_pass = False
-                                    break
-                                elif trade_direction == 'SHORT' and not row.get('in_premium', False):
-                                    all_blocks_pass = False
-                                    break
-                            elif module_id == 'order_blocks':
-                                if trade_direction == 'LONG' and not row.get('in_bullish_ob', False):
-                                    all_blocks_pass = False
-                                    break
-                                elif trade_direction == 'SHORT' and not row.get('in_bearish_ob', False):
-                                    all_blocks_pass = False
-                                    break
-                            elif module_id == 'breaker_blocks':
-                                if trade_direction == 'LONG' and not row.get('in_bullish_breaker', False):
-                                    all_blocks_pass = False
-                                    break
-                                elif trade_direction == 'SHORT' and not row.get('in_bearish_breaker', False):
-                                    all_blocks_pass = False
-                                    break
-                            elif module_id == 'imbalance_zones':
-                                if trade_direction == 'LONG' and not row.get('in_bullish_imbalance', False):
-                                    all_blocks_pass = False
-                                    break
-                                elif trade_direction == 'SHORT' and not row.get('in_bearish_imbalance', False):
-                                    all_blocks_pass = False
-                                    break
-                            elif module_id == 'fair_value_gaps':
-                                if trade_direction == 'LONG' and not row.get('in_bullish_fvg', False):
-                                    all_blocks_pass = False
-                                    break
-                                elif trade_direction == 'SHORT' and not row.get('in_bearish_fvg', False):
-                                    all_blocks_pass = False
-                                    break
-                        else:
-                            # Fallback: row-by-row check (slower - should not happen if precompute worked)
-                            module = block_info['module']
-                            config = block_info['config']
-                            try:
-                                if not module.check_entry_condition(data, i, config, trade_direction):
-                                    all_blocks_pass = False
-                                    break
-                            except Exception as e:
-                                all_blocks_pass = False
-                                break
-                    
-                    if not all_blocks_pass:
-                        continue  # Skip this entry if any additional block fails
-                
-                potential_entries['additional_blocks_ok'] += 1
-                potential_entries['final_entries'] += 1
-                
-                # Get sweep price from the sweep we found
-                sweep_price = data.iloc[sweep_idx]['sweep_price']
-                
-                # Entry: 50% retrace or at displacement price
-                # For simplicity, enter at displacement price (close of displacement candle)
-                # In real trading, you'd enter on next candle open or at 50% retrace
-                entry_price = row['displacement_price']  # Close of displacement candle
-                entry_index = i
-                
-                # Note: In production, you might want to enter on next candle open
-                # or wait for 50% retrace from displacement high/low
-                
-                # Calculate SL (beyond sweep)
-                if sl_method == 'beyond_sweep':
-                    if trade_direction == 'LONG':
-                        sl_price = sweep_price * 0.999  # Slightly below sweep
-                    else:
-                        sl_price = sweep_price * 1.001  # Slightly above sweep
-                else:
-                    # Default: 1% risk
-                    if trade_direction == 'LONG':
-                        sl_price = entry_price * 0.99
-                    else:
-                        sl_price = entry_price * 1.01
-                
-                # Calculate TP
-                risk_amount = abs(entry_price - sl_price) * risk_per_trade
-                if trade_direction == 'LONG':
-                    tp_price = entry_price + (risk_amount * tp_r)
-                else:
-                    tp_price = entry_price - (risk_amount * tp_r)
-                
-                in_trade = True
-            
-            # Check exit conditions
-            if in_trade:
-                if trade_direction == 'LONG':
-                    if row['high'] >= tp_price:
-                        # TP hit
-                        exit_price = tp_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'LONG', True,
-                            data.index[entry_index], data.index[i],
-                            sl_price, tp_price
-                        ))
-                        in_trade = False
-                    elif row['low'] <= sl_price:
-                        # SL hit
-                        exit_price = sl_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'LONG', False,
-                            data.index[entry_index], data.index[i],
-                            sl_price, tp_price
-                        ))
-                        in_trade = False
-                else:  # SHORT
-                    if row['low'] <= tp_price:
-                        # TP hit
-                        exit_price = tp_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'SHORT', True,
-                            data.index[entry_index], data.index[i],
-                            sl_price, tp_price
-                        ))
-                        in_trade = False
-                    elif row['high'] >= sl_price:
-                        # SL hit
-                        exit_price = sl_price
-                        trades.append(self._create_trade(
-                            entry_price, exit_price, 'SHORT', False,
-                            data.index[entry_index], data.index[i],
-                            sl_price, tp_price
-                        ))
-                        in_trade = False
-        
-        # Debug output
-        print(f"[V5] Entry filtering stats:")
-        print(f"[V5]   HTF bias OK: {potential_entries['htf_bias_ok']}")
-        print(f"[V5]   Displacement OK: {potential_entries['displacement_ok']}")
-        print(f"[V5]   Sweep OK: {potential_entries['sweep_ok']}")
-        print(f"[V5]   Direction OK: {potential_entries['direction_ok']}")
-        print(f"[V5]   Additional blocks OK: {potential_entries['additional_blocks_ok']}")
-        print(f"[V5]   Final entries: {potential_entries['final_entries']}")
         
-        return trades
-    
-    def _create_trade(
-        self,
-        entry_price: float,
-        exit_price: float,
-        direction: str,
-        is_winner: bool,
-        entry_time: datetime,
-        exit_time: datetime,
-        sl_price: float,
-        tp_price: float
-    ) -> QuantMetricsTrade:
-        """Create a QuantMetricsTrade object."""
-        # Calculate profit
-        if direction == 'LONG':
-            profit_usd = exit_price - entry_price
-        else:  # SHORT
-            profit_usd = entry_price - exit_price
-        
-        # Calculate R-multiple
-        risk = abs(entry_price - sl_price)
-        if risk > 0:
-            profit_r = profit_usd / risk
-        else:
-            profit_r = 0.0
-        
-        # Determine result based on actual profit_r, not is_winner flag
-        # (is_winner is based on TP/SL hit, but actual exit might differ)
-        if profit_r > 0:
-            result = 'WIN'
-        elif profit_r < 0:
-            result = 'LOSS'
-        else:
-            result = 'LOSS'  # Break-even counts as loss
-        
-        return QuantMetricsTrade(
-            timestamp_open=entry_time,
-            timestamp_close=exit_time,
-            symbol="",  # Will be set by analyzer
-            direction=direction,
-            entry_price=entry_price,
-            exit_price=exit_price,
-            sl=sl_price,
-            tp=tp_price,
-            profit_usd=profit_usd,
-            profit_r=profit_r,
-            result=result
+        (entry_idx_arr, exit_idx_arr, dir_arr, entry_price_arr, exit_price_arr,
+         sl_arr, tp_arr, risk_arr, stage_counts) = _walk_trades(
+            high, low, entry_px, sweep_px,
+            not_neutral, displacement_ok, sweep_flag, bias_dir,
+            long_blocks_ok, short_blocks_ok,
+            float(tp_r), float(risk_per_trade), sl_method == 'beyond_sweep',
+            SWEEP_LOOKBACK
+        )
+        
+        # Entry filtering stats (one log record; formatted only if INFO is enabled)
+        logger.info(
+            "[V5] Entry filtering stats:\n"
+            "[V5]   HTF bias OK: %d\n"
+            "[V5]   Displacement OK: %d\n"
+            "[V5]   Sweep OK: %d\n"
+            "[V5]   Direction OK: %d\n"
+            "[V5]   Additional blocks OK: %d\n"
+            "[V5]   Final entries: %d",
+            *stage_counts.tolist(), stage_counts[4]
+        )
+        
+        return build_trades(
+            timestamps[entry_idx_arr],
+            timestamps[exit_idx_arr],
+            dir_arr,
+            entry_price_arr,
+            exit_price_arr,
+            sl_arr,
+            tp_arr,
+            risk_distance=risk_arr
         )
-
@@ -15,10 +15,30 @@ Author: QuantMetrics Development Team
 Version: 1.0
 """
 
+import os
 import pandas as pd
-from typing import List
+from typing import Iterator, List
 from pathlib import Path
-from core.quantmetrics_schema import QuantMetricsTrade, detect_session, calculate_rr
+from core.quantmetrics_schema import QuantMetricsTrade, TradeBatch
+
+try:
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Files above this size are read with Polars when it is installed
+POLARS_MIN_BYTES = 1_000_000
+
+# Streaming chunk sizes (iter_batches): bytes per Arrow block / rows per pandas chunk
+STREAM_BLOCK_BYTES = 16 * 1024 * 1024
+STREAM_CHUNK_ROWS = 200_000
 
 
 class CSVParser:
@@ -34,6 +54,13 @@ class CSVParser:
     Converts all formats to EdgeLab standard (QuantMetricsTrade objects).
     """
     
+    # EdgeLab native header columns
+    _EDGELAB_SET = frozenset({
+        'timestamp_open', 'timestamp_close', 'symbol', 'direction',
+        'entry_price', 'exit_price', 'sl', 'tp',
+        'profit_usd', 'profit_r', 'result'
+    })
+    
     def __init__(self):
         """Initialize CSV parser."""
         self.supported_formats = ['edgelab', 'mt4', 'tradingview', 'generic']
@@ -57,21 +84,23 @@ class CSVParser:
         if not path.exists():
             raise FileNotFoundError(f"CSV file not found: {file_path}")
         
-        # Read header row
+        # Read header row (first line only - no CSV machinery needed)
         try:
-            df = pd.read_csv(file_path, nrows=0)
-            columns = [col.lower().strip() for col in df.columns]
-        except Exception as e:
+            with open(path, 'rb') as f:
+                header = f.readline()
+        except OSError as e:
             raise ValueError(f"Cannot read CSV file: {e}")
         
-        # Check for EdgeLab native format (11 exact columns)
-        edgelab_columns = [
-            'timestamp_open', 'timestamp_close', 'symbol', 'direction',
-            'entry_price', 'exit_price', 'sl', 'tp',
-            'profit_usd', 'profit_r', 'result'
-        ]
+        if not header.strip():
+            raise ValueError("Cannot read CSV file: no header row")
         
-        if all(col in columns for col in edgelab_columns):
+        columns = {
+            col.strip().strip('"').strip().lower()
+            for col in header.decode('utf-8-sig', 'ignore').split(',')
+        }
+        
+        # Check for EdgeLab native format (11 exact columns)
+        if self._EDGELAB_SET.issubset(columns):
             return 'edgelab'
         
         # Check for MT4 format (will implement later)
@@ -122,46 +151,63 @@ class CSVParser:
         Returns:
             List of QuantMetricsTrade objects
         """
-        # Read CSV
-        df = pd.read_csv(file_path)
-        
-        # Convert to QuantMetricsTrade objects
-        trades = []
-        for _, row in df.iterrows():
-            # Parse timestamps
-            timestamp_open = pd.to_datetime(row['timestamp_open'])
-            timestamp_close = pd.to_datetime(row['timestamp_close'])
-            
-            # Calculate RR
-            rr = calculate_rr(
-                entry=float(row['entry_price']),
-                exit=float(row['exit_price']),
-                sl=float(row['sl'])
+        return self._read_edgelab(file_path).to_trades()
+    
+    def parse_batch(self, file_path: str) -> TradeBatch:
+        """
+        Parse an EdgeLab native CSV into a columnar TradeBatch.
+        
+        Same data as parse(), without creating an object per trade.
+        
+        Raises:
+            ValueError: If the file is not in EdgeLab format
+            FileNotFoundError: If file doesn't exist
+        """
+        format_type = self.detect_format(file_path)
+        if format_type != 'edgelab':
+            raise ValueError(f"parse_batch supports EdgeLab format only, got '{format_type}'")
+        return self._read_edgelab(file_path)
+    
+    def iter_batches(self, file_path: str) -> Iterator[TradeBatch]:
+        """
+        Stream an EdgeLab native CSV as a sequence of TradeBatch chunks.
+        
+        Only one chunk is in memory at a time, for trade journals too large
+        to load at once.
+        
+        Raises:
+            ValueError: If the file is not in EdgeLab format
+            FileNotFoundError: If file doesn't exist
+        """
+        format_type = self.detect_format(file_path)
+        if format_type != 'edgelab':
+            raise ValueError(f"iter_batches supports EdgeLab format only, got '{format_type}'")
+        
+        if PYARROW_AVAILABLE:
+            reader = pacsv.open_csv(
+                file_path, read_options=pacsv.ReadOptions(block_size=STREAM_BLOCK_BYTES)
             )
-            
-            # Detect session
-            session = detect_session(timestamp_open)
-            
-            trade = QuantMetricsTrade(
-                timestamp_open=timestamp_open,
-                timestamp_close=timestamp_close,
-                symbol=row['symbol'],
-                direction=row['direction'],
-                entry_price=float(row['entry_price']),
-                exit_price=float(row['exit_price']),
-                sl=float(row['sl']),
-                tp=float(row['tp']),
-                profit_usd=float(row['profit_usd']),
-                profit_r=float(row['profit_r']),
-                result=row['result'],
-                rr=rr,
-                session=session,
-                source='csv_upload',
-                confidence=100  # Native format = full confidence
+            for record_batch in reader:
+                yield TradeBatch.from_frame(record_batch.to_pandas(types_mapper=pd.ArrowDtype))
+        else:
+            for chunk in pd.read_csv(file_path, chunksize=STREAM_CHUNK_ROWS):
+                yield TradeBatch.from_frame(chunk)
+    
+    def _read_edgelab(self, file_path: str) -> TradeBatch:
+        """Read an EdgeLab CSV into a TradeBatch."""
+        # Arrow-backed columns when pyarrow is installed; large files via
+        # Polars' multithreaded reader if available
+        if POLARS_AVAILABLE and PYARROW_AVAILABLE and os.path.getsize(file_path) > POLARS_MIN_BYTES:
+            df = pl.read_csv(file_path, try_parse_dates=True, low_memory=False).to_pandas(
+                use_pyarrow_extension_array=True
             )
-            trades.append(trade)
+        elif PYARROW_AVAILABLE:
+            df = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+        else:
+            df = pd.read_csv(file_path)
         
-        return trades
+        # Whole-column conversions, no per-row Series
+        return TradeBatch.from_frame(df)
     
     def _parse_mt4(self, file_path: str) -> List[QuantMetricsTrade]:
         """Parse MT4 export format (to be implemented)."""
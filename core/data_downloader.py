@@ -11,13 +11,22 @@ Author: QuantMetrics Development Team
 Version: 2.0
 """
 
+import logging
 import yfinance as yf
 import pandas as pd
+from types import MappingProxyType
 from typing import Optional
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
-# Symbol mapping: EdgeLab symbols to Yahoo Finance tickers
-SYMBOL_MAP = {
+
+logger = logging.getLogger('edgelab.data_downloader')
+
+# Symbol mapping: EdgeLab symbols to Yahoo Finance tickers (read-only)
+SYMBOL_MAP = MappingProxyType({
     'XAUUSD': 'GC=F',      # Gold Futures
     'EURUSD': 'EURUSD=X',  # EUR/USD Forex
     'GBPUSD': 'GBPUSD=X',  # GBP/USD Forex
@@ -27,7 +36,7 @@ SYMBOL_MAP = {
     'SPX': '^GSPC',        # S&P 500
     'NQ': 'NQ=F',          # Nasdaq Futures
     'US30': 'YM=F',        # Dow Jones Futures
-}
+})
 
 
 class DataDownloader:
@@ -75,7 +84,7 @@ class DataDownloader:
         if interval in intraday_intervals:
             long_periods = ['6mo', '1y', '2y', '5y', 'max']
             if period in long_periods:
-                print(f"[Warning] {interval} data limited to 60 days by Yahoo Finance")
+                logger.warning("%s data limited to 60 days by Yahoo Finance", interval)
                 period = "60d"
         
         # Get Yahoo Finance ticker
@@ -83,10 +92,10 @@ class DataDownloader:
         if ticker is None:
             # Try using symbol directly (might be valid Yahoo ticker)
             ticker = symbol
-            print(f"[Note] Symbol {symbol} not in map, trying as Yahoo ticker")
+            logger.info("Symbol %s not in map, trying as Yahoo ticker", symbol)
         
         # Download from Yahoo Finance
-        print(f"[Download] {symbol} ({ticker}) - {period} @ {interval}...")
+        logger.info("Download %s (%s) - %s @ %s", symbol, ticker, period, interval)
         
         try:
             data = yf.download(
@@ -118,12 +127,35 @@ class DataDownloader:
         if 'volume' not in data.columns:
             data['volume'] = 0
         
-        print(f"[Download] Got {len(data)} rows for {symbol}")
+        logger.info("Download got %d rows for %s", len(data), symbol)
         return data
     
-    def get_supported_symbols(self) -> list:
-        """Return list of supported symbols."""
-        return list(SYMBOL_MAP.keys())
+    def download_arrow(
+        self,
+        symbol: str,
+        period: str = "6mo",
+        interval: str = "15m"
+    ) -> "pa.Table":
+        """
+        Download historical data as a pyarrow Table.
+        
+        Same data as download(); the DatetimeIndex is kept as a column so
+        the table can be written to Parquet or converted back with
+        `table.to_pandas()` at the consumer edge.
+        
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If symbol not supported or download fails
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for download_arrow()")
+        
+        data = self.download(symbol, period=period, interval=interval)
+        return pa.Table.from_pandas(data, preserve_index=True)
+    
+    def get_supported_symbols(self) -> tuple:
+        """Return supported symbols."""
+        return tuple(SYMBOL_MAP)
     
     def is_symbol_supported(self, symbol: str) -> bool:
         """Check if symbol is in the supported list."""
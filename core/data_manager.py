@@ -28,7 +28,11 @@ Author: EdgeLab Development
 Version: 1.1 (timezone fix)
 """
 
+import logging
+import numpy as np
 import pandas as pd
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
@@ -38,6 +42,65 @@ from core.data_downloader import DataDownloader
 from core.metrics import track_performance
 
 
+logger = logging.getLogger('edgelab.data_manager')
+
+# Yahoo Finance period per request length: smallest period with
+# days_requested <= _PERIOD_DAYS[i], else the last entry
+_PERIOD_DAYS = (5, 7, 30, 90, 180, 365, 730, 1825)
+_PERIODS = ('5d', '7d', '1mo', '3mo', '6mo', '1y', '2y', '5y', 'max')
+
+# Intraday data is capped at 60 days by Yahoo
+_INTRADAY_TIMEFRAMES = frozenset({'1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h'})
+_INTRADAY_PERIOD_DAYS = (5, 7)
+_INTRADAY_PERIODS = ('5d', '7d', '60d')
+
+
+def _index_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """DatetimeIndex as int64 nanoseconds (independent of the index unit)."""
+    return index.values.astype('datetime64[ns]').view(np.int64)
+
+
+def _range_mask(index: pd.DatetimeIndex, start: datetime, end: datetime) -> np.ndarray:
+    """Boolean mask for start <= index <= end, compared as int64 ns."""
+    index_ns = _index_ns(index)
+    return (index_ns >= pd.Timestamp(start).value) & (index_ns <= pd.Timestamp(end).value)
+
+
+def _merge_newer_wins(older: pd.DataFrame, newer: pd.DataFrame) -> pd.DataFrame:
+    """
+    Union of two sorted frames, preferring `newer` on equal timestamps.
+    
+    Same result as concat + duplicated(keep='last') + sort_index, but only
+    the rows of `older` inside newer's time window are looked at: those
+    that newer does not replace are kept, everything before/after is
+    sliced off as-is.
+    """
+    if older.empty:
+        return newer
+    if newer.empty:
+        return older
+    if not (older.index.is_monotonic_increasing and newer.index.is_monotonic_increasing
+            and newer.index.is_unique):
+        combined = pd.concat([older, newer])
+        combined = combined[~combined.index.duplicated(keep='last')]
+        return combined.sort_index()
+    
+    older_ns = _index_ns(older.index)
+    newer_ns = _index_ns(newer.index)
+    lo = np.searchsorted(older_ns, newer_ns[0], side='left')
+    hi = np.searchsorted(older_ns, newer_ns[-1], side='right')
+    
+    # Older rows inside newer's window survive only if newer lacks them
+    overlap_ns = older_ns[lo:hi]
+    kept = newer_ns[np.searchsorted(newer_ns, overlap_ns)] != overlap_ns
+    
+    if kept.any():
+        middle = pd.concat([newer, older.iloc[lo:hi][kept]]).sort_index()
+    else:
+        middle = newer
+    return pd.concat([older.iloc[:lo], middle, older.iloc[hi:]])
+
+
 class DataManager:
     """
     Unified data access layer.
@@ -105,63 +168,63 @@ class DataManager:
             ValueError: If symbol not supported or download fails
         """
         symbol = symbol.upper()
+        now = datetime.now()
         
         # Check cache first (unless force refresh)
         if not force_refresh:
-            if self.storage.has_data(symbol, timeframe, start, end):
-                cached = self.storage.get_data(symbol, timeframe, start, end)
-                
+            cached = self.storage.try_get_data(symbol, timeframe, start, end)
+            if cached is not None:
                 # Check if we need to refresh recent data
-                if self._needs_refresh(end):
-                    cached = self._refresh_recent(symbol, timeframe, cached)
+                if self._needs_refresh(end, now):
+                    cached = self._refresh_recent(symbol, timeframe, cached, now)
                 
                 if not cached.empty:
-                    print(f"[Cache] Loaded {symbol} {timeframe}: {len(cached)} rows")
+                    logger.info("Cache loaded %s %s: %d rows", symbol, timeframe, len(cached))
                     return cached
         
         # Download from source
-        print(f"[Download] Fetching {symbol} {timeframe}...")
+        logger.info("Fetching %s %s", symbol, timeframe)
         
         data = self._download_data(symbol, timeframe, start, end)
         
         if data.empty:
-            print(f"[Warning] No data returned for {symbol} {timeframe}")
+            logger.warning("No data returned for %s %s", symbol, timeframe)
             return pd.DataFrame()
         
         # Save to cache
         self.storage.save_data(symbol, timeframe, data)
-        print(f"[Cache] Saved {symbol} {timeframe}: {len(data)} rows")
+        logger.info("Cache saved %s %s: %d rows", symbol, timeframe, len(data))
         
         return data
     
-    def _needs_refresh(self, end: datetime) -> bool:
+    def _needs_refresh(self, end: datetime, now: Optional[datetime] = None) -> bool:
         """Check if end date is recent enough to need refresh."""
-        return end > datetime.now() - self.cache_ttl
+        return end > (now or datetime.now()) - self.cache_ttl
     
     def _refresh_recent(
         self,
         symbol: str,
         timeframe: str,
-        cached: pd.DataFrame
+        cached: pd.DataFrame,
+        now: Optional[datetime] = None
     ) -> pd.DataFrame:
         """
         Update recent candles that might have changed.
         
         Downloads last 2 days and merges with cached data.
         """
-        recent_start = datetime.now() - timedelta(days=2)
+        now = now or datetime.now()
+        recent_start = now - timedelta(days=2)
         
         try:
             recent = self._download_data(
                 symbol, timeframe,
-                recent_start, datetime.now()
+                recent_start, now
             )
             
             if not recent.empty:
                 # Merge: prefer new data for overlapping timestamps
-                combined = pd.concat([cached, recent])
-                combined = combined[~combined.index.duplicated(keep='last')]
-                combined = combined.sort_index()
+                combined = _merge_newer_wins(cached, recent)
                 
                 # Update cache
                 self.storage.save_data(symbol, timeframe, combined)
@@ -169,7 +232,7 @@ class DataManager:
                 return combined
                 
         except Exception as e:
-            print(f"[Warning] Could not refresh recent data: {e}")
+            logger.warning("Could not refresh recent data: %s", e)
         
         return cached
     
@@ -218,11 +281,10 @@ class DataManager:
                 data.index = data.index.tz_localize(None)
             
             # Filter to requested range
-            mask = (data.index >= pd.Timestamp(start)) & (data.index <= pd.Timestamp(end))
-            return data[mask]
+            return data[_range_mask(data.index, start, end)]
             
         except Exception as e:
-            print(f"[Error] Download failed for {symbol}: {e}")
+            logger.error("Download failed for %s: %s", symbol, e)
             return pd.DataFrame()
     
     def _calculate_period(
@@ -239,37 +301,14 @@ class DataManager:
         days_requested = (end - start).days + 1
         
         # Intraday timeframes: Yahoo limits to 60 days
-        intraday_timeframes = ['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h']
-        if timeframe in intraday_timeframes:
+        if timeframe in _INTRADAY_TIMEFRAMES:
             if days_requested > 60:
-                print(f"[Warning] {timeframe} data limited to 60 days by Yahoo Finance")
+                logger.warning("%s data limited to 60 days by Yahoo Finance", timeframe)
             # Always cap intraday to 60d
-            if days_requested <= 5:
-                return "5d"
-            elif days_requested <= 7:
-                return "7d"
-            else:
-                return "60d"  # Max for intraday
+            return _INTRADAY_PERIODS[bisect_left(_INTRADAY_PERIOD_DAYS, days_requested)]
         
         # Daily and longer timeframes (no 60-day limit)
-        if days_requested <= 5:
-            return "5d"
-        elif days_requested <= 7:
-            return "7d"
-        elif days_requested <= 30:
-            return "1mo"
-        elif days_requested <= 90:
-            return "3mo"
-        elif days_requested <= 180:
-            return "6mo"
-        elif days_requested <= 365:
-            return "1y"
-        elif days_requested <= 730:
-            return "2y"
-        elif days_requested <= 1825:
-            return "5y"
-        else:
-            return "max"
+        return _PERIODS[bisect_left(_PERIOD_DAYS, days_requested)]
     
     def preload_symbol(
         self,
@@ -309,9 +348,9 @@ class DataManager:
             try:
                 data = self.get_data(symbol, tf, start, end)
                 results[tf] = len(data)
-                print(f"[Preload] {symbol} {tf}: {len(data)} rows")
+                logger.info("Preload %s %s: %d rows", symbol, tf, len(data))
             except Exception as e:
-                print(f"[Preload] Failed {symbol} {tf}: {e}")
+                logger.warning("Preload failed %s %s: %s", symbol, tf, e)
                 results[tf] = 0
         
         return results
@@ -321,14 +360,17 @@ class DataManager:
         Preload commonly used symbols.
         
         Call on server startup to warm cache.
+        Symbols are downloaded concurrently (network bound).
         """
         popular = ['XAUUSD', 'EURUSD', 'GBPUSD', 'USDJPY', 'BTCUSD']
         
-        for symbol in popular:
-            try:
-                self.preload_symbol(symbol)
-            except Exception as e:
-                print(f"[Preload] Skipped {symbol}: {e}")
+        with ThreadPoolExecutor(max_workers=len(popular)) as pool:
+            futures = {pool.submit(self.preload_symbol, symbol): symbol for symbol in popular}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning("Preload skipped %s: %s", futures[future], e)
     
     def get_cache_summary(self) -> Dict[str, Any]:
         """
@@ -8,6 +8,11 @@ from jinja2 import Environment, FileSystemLoader
 from datetime import datetime
 import os
 
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
 
 class HTMLReportGenerator:
     """Generate professional PDFs from HTML templates with EdgeLab branding"""
@@ -26,7 +31,13 @@ class HTMLReportGenerator:
             'templates', 
             'reports'
         )
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        # Templates are compiled once per generator: no reload checks
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            auto_reload=False,
+            cache_size=50
+        )
+        self._template = None
         
         # PDF generation options
         self.pdf_options = {
@@ -39,21 +50,17 @@ class HTMLReportGenerator:
             'no-outline': None,
             'enable-local-file-access': None,
             'print-media-type': None,
+            'quiet': None,
         }
     
-    def generate_report(self, results, trades, strategy=None):
-        """
-        Generate PDF report from analysis results
-        
-        Args:
-            results (dict): Analysis results with metrics and insights
-            trades (DataFrame): Trading data
-            strategy (dict): Optional strategy definition for backtests
-        
-        Returns:
-            bytes: PDF file content
-        """
-        # Prepare template context
+    def _get_template(self):
+        """Report template, loaded and compiled on first use."""
+        if self._template is None:
+            self._template = self.env.get_template('report_edgelab.html')
+        return self._template
+    
+    def _render_html(self, results, trades, strategy=None):
+        """Render the report template for one set of results."""
         context = {
             # Basic info
             'generated_date': datetime.now().strftime('%B %d, %Y'),
@@ -69,10 +76,22 @@ class HTMLReportGenerator:
             'execution': results.get('execution_analysis', {}),
             'insights': results.get('insights', {}),
         }
+        return self._get_template().render(**context)
+    
+    def generate_report(self, results, trades, strategy=None):
+        """
+        Generate PDF report from analysis results
         
+        Args:
+            results (dict): Analysis results with metrics and insights
+            trades (DataFrame): Trading data
+            strategy (dict): Optional strategy definition for backtests
+        
+        Returns:
+            bytes: PDF file content
+        """
         # Render HTML from template
-        template = self.env.get_template('report_edgelab.html')
-        html_content = template.render(**context)
+        html_content = self._render_html(results, trades, strategy)
         
         # Convert HTML to PDF
         pdf_bytes = pdfkit.from_string(
@@ -83,3 +102,51 @@ class HTMLReportGenerator:
         )
         
         return pdf_bytes
+    
+    def generate_reports_batch(self, results_list, trades_list, strategies=None):
+        """
+        Generate several PDF reports in one go
+        
+        With Playwright installed, one headless Chromium is started for the
+        whole batch and reused for every page, instead of one wkhtmltopdf
+        process per report. Without it, falls back to generate_report.
+        
+        Args:
+            results_list (list): Analysis results, one dict per report
+            trades_list (list): Trading data, one per report
+            strategies (list): Optional strategy definitions, one per report
+        
+        Returns:
+            list: PDF bytes per report, in input order
+        """
+        if strategies is None:
+            strategies = [None] * len(results_list)
+        
+        if sync_playwright is None:
+            return [
+                self.generate_report(results, trades, strategy)
+                for results, trades, strategy in zip(results_list, trades_list, strategies)
+            ]
+        
+        html_pages = [
+            self._render_html(results, trades, strategy)
+            for results, trades, strategy in zip(results_list, trades_list, strategies)
+        ]
+        
+        pdfs = []
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            try:
+                page = browser.new_page()
+                page.emulate_media(media='print')
+                for html_content in html_pages:
+                    page.set_content(html_content, wait_until='load')
+                    pdfs.append(page.pdf(
+                        format='A4',
+                        margin={'top': '0mm', 'right': '0mm', 'bottom': '0mm', 'left': '0mm'},
+                        print_background=True
+                    ))
+            finally:
+                browser.close()
+        
+        return pdfs
@@ -3,15 +3,27 @@ indicators.py
 =============
 
 Technical indicator calculations for EdgeLab.
-Uses 'ta' library for reliable indicator implementations.
+RSI, EMA, MACD, ATR and ADX run as compiled loops from
+core.indicators_numba that reproduce the 'ta' library results;
+calculate_all also takes its SMAs and Bollinger Bands from one fused pass
+over close. The standalone SMA still uses 'ta'.
 
 Author: QuantMetrics Development Team
 Version: 1.0
 """
 
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
 import pandas as pd
 import ta
 
+from core.indicators_numba import (
+    _adx_loop, _atr_loop, _ema_loop, _indicators_batch, _macd_loop, _rsi_loop
+)
+
 
 class IndicatorEngine:
     """
@@ -27,51 +39,127 @@ class IndicatorEngine:
     - ADX (Average Directional Index)
     """
     
+    # Number of calculate_all results kept per engine
+    CACHE_SIZE = 8
+    
+    def __init__(self):
+        self._cache: OrderedDict = OrderedDict()
+    
     def calculate_all(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate all common indicators.
         
+        Results are cached per engine on a fingerprint of the OHLC data,
+        so repeated calls on the same candles skip the recomputation.
+        
         Args:
             data: DataFrame with columns: open, high, low, close, volume
             
         Returns:
             DataFrame with added indicator columns
         """
-        df = data.copy()
+        return self.calculate_all_batch([data])[0]
+    
+    def calculate_all_batch(self, frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        """
+        Calculate all common indicators for several symbols.
         
-        # RSI
-        df['rsi'] = ta.momentum.rsi(df['close'], window=14)
+        The compiled indicators of every uncached frame run in one kernel
+        call that spreads the symbols over threads.
         
-        # Moving Averages
-        df['sma_20'] = ta.trend.sma_indicator(df['close'], window=20)
-        df['sma_50'] = ta.trend.sma_indicator(df['close'], window=50)
-        df['ema_20'] = ta.trend.ema_indicator(df['close'], window=20)
+        Args:
+            frames: OHLCV DataFrames, one per symbol
+            
+        Returns:
+            DataFrames with added indicator columns, in input order
+        """
+        results: List[Optional[pd.DataFrame]] = [None] * len(frames)
+        keys = [self._fingerprint(data) for data in frames]
+        pending = []
+        for i, key in enumerate(keys):
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                results[i] = cached.copy(deep=False)
+            else:
+                pending.append(i)
         
-        # MACD
-        macd = ta.trend.MACD(df['close'])
-        df['macd'] = macd.macd()
-        df['macd_signal'] = macd.macd_signal()
-        df['macd_histogram'] = macd.macd_diff()
+        if not pending:
+            return results
         
-        # Bollinger Bands
-        bollinger = ta.volatility.BollingerBands(df['close'])
-        df['bb_upper'] = bollinger.bollinger_hband()
-        df['bb_middle'] = bollinger.bollinger_mavg()
-        df['bb_lower'] = bollinger.bollinger_lband()
+        # Stack the series into (n_symbols, n_bars) buffers padded to the longest
+        lengths = np.array([len(frames[i]) for i in pending], dtype=np.int64)
+        width = int(lengths.max())
+        highs = np.full((len(pending), width), np.nan)
+        lows = np.full((len(pending), width), np.nan)
+        closes = np.full((len(pending), width), np.nan)
+        for row, i in enumerate(pending):
+            n = lengths[row]
+            highs[row, :n] = self._values(frames[i], 'high')
+            lows[row, :n] = self._values(frames[i], 'low')
+            closes[row, :n] = self._values(frames[i], 'close')
         
-        # ATR (Average True Range)
-        df['atr'] = ta.volatility.average_true_range(
-            df['high'], df['low'], df['close'], window=14
-        )
+        out = _indicators_batch(highs, lows, closes, lengths)
         
-        # ADX (Average Directional Index)
-        df['adx'] = ta.trend.adx(df['high'], df['low'], df['close'], window=14)
+        for row, i in enumerate(pending):
+            data = frames[i]
+            n = lengths[row]
+            (rsi, ema_20, sma_20, sma_50, bb_upper, bb_lower, atr, adx,
+             macd, macd_signal, macd_histogram) = out[:, row, :n]
+            cols = {}
+            
+            # RSI and moving averages (one fused pass over close)
+            cols['rsi'] = rsi
+            cols['sma_20'] = sma_20
+            cols['sma_50'] = sma_50
+            cols['ema_20'] = ema_20
+            
+            # MACD
+            cols['macd'] = macd
+            cols['macd_signal'] = macd_signal
+            cols['macd_histogram'] = macd_histogram
+            
+            # Bollinger Bands (20, 2) around the 20-bar SMA
+            cols['bb_upper'] = bb_upper
+            cols['bb_middle'] = sma_20
+            cols['bb_lower'] = bb_lower
+            
+            # ATR (Average True Range)
+            cols['atr'] = atr
+            
+            # ADX (Average Directional Index)
+            cols['adx'] = adx
+            
+            # One concat instead of growing the frame column by column;
+            # indicator names replace same-named input columns
+            base = data.drop(columns=[c for c in cols if c in data.columns])
+            df = pd.concat([base, pd.DataFrame(cols, index=data.index)], axis=1)
+            
+            self._cache[keys[i]] = df
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+            results[i] = df.copy(deep=False)
         
-        return df
+        return results
+    
+    @staticmethod
+    def _fingerprint(data: pd.DataFrame) -> tuple:
+        """Cache key: shape, column names and a hash of the index and high/low/close."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pd.util.hash_pandas_object(data.index).to_numpy().tobytes())
+        for column in ('high', 'low', 'close'):
+            digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=np.float64)).tobytes())
+        return (data.shape, tuple(data.columns), digest.hexdigest())
+    
+    @staticmethod
+    def _values(data: pd.DataFrame, column: str) -> np.ndarray:
+        """Column as a contiguous float64 array for the compiled kernels."""
+        return np.ascontiguousarray(data[column].to_numpy(dtype=np.float64, na_value=np.nan))
     
     def calculate_rsi(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate RSI indicator."""
-        return ta.momentum.rsi(data['close'], window=period)
+        values = _rsi_loop(self._values(data, 'close'), period)
+        return pd.Series(values, index=data.index, name='rsi')
     
     def calculate_sma(self, data: pd.DataFrame, period: int = 50) -> pd.Series:
         """Calculate Simple Moving Average."""
@@ -79,23 +167,30 @@ class IndicatorEngine:
     
     def calculate_ema(self, data: pd.DataFrame, period: int = 20) -> pd.Series:
         """Calculate Exponential Moving Average."""
-        return ta.trend.ema_indicator(data['close'], window=period)
+        values = _ema_loop(self._values(data, 'close'), 2.0 / (period + 1), period)
+        return pd.Series(values, index=data.index, name=f'ema_{period}')
     
     def calculate_macd(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate MACD indicator with signal and histogram."""
-        macd = ta.trend.MACD(data['close'])
+        macd, signal, histogram = _macd_loop(self._values(data, 'close'), 12, 26, 9)
         return pd.DataFrame({
-            'macd': macd.macd(),
-            'signal': macd.macd_signal(),
-            'histogram': macd.macd_diff()
-        })
+            'macd': macd,
+            'signal': signal,
+            'histogram': histogram
+        }, index=data.index)
     
     def calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range."""
-        return ta.volatility.average_true_range(
-            data['high'], data['low'], data['close'], window=period
+        values = _atr_loop(
+            self._values(data, 'high'), self._values(data, 'low'),
+            self._values(data, 'close'), period
         )
+        return pd.Series(values, index=data.index, name='atr')
     
     def calculate_adx(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average Directional Index."""
-        return ta.trend.adx(data['high'], data['low'], data['close'], window=period)
\ No newline at end of file
+        values = _adx_loop(
+            self._values(data, 'high'), self._values(data, 'low'),
+            self._values(data, 'close'), period
+        )
+        return pd.Series(values, index=data.index, name='adx')
\ No newline at end of file
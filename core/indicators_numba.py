@@ -0,0 +1,369 @@
+"""
+indicators_numba.py
+===================
+
+Compiled inner loops for the recursive indicators in IndicatorEngine.
+
+RSI, EMA, MACD, ATR and ADX are recursive (each value depends on the previous
+one), so they cannot be vectorised with NumPy; the `ta` implementations
+run them through pandas `ewm` or per-element Python loops. These kernels
+reproduce the `ta` results (warm-up values, NaN handling and seeding
+included) as plain loops over float64 arrays, compiled with Numba when
+it is installed.
+
+Author: QuantMetrics Development Team
+Version: 1.0
+"""
+
+import numpy as np
+
+from core._njit import njit, prange
+
+
+@njit(cache=True)
+def _ewm_step(weighted, old_wt, cur, alpha):
+    """
+    One adjust=False update of an exponentially weighted mean.
+
+    Returns the new (weighted, old_wt) state. A NaN observation keeps the
+    previous value while still decaying its weight, like pandas with
+    ignore_na=False; leading NaNs are skipped.
+    """
+    if not np.isnan(weighted):
+        old_wt *= 1.0 - alpha
+        if not np.isnan(cur):
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif not np.isnan(cur):
+        weighted = cur
+    return weighted, old_wt
+
+
+@njit(cache=True)
+def _ema_loop(values, alpha, min_periods):
+    """Exponentially weighted mean with adjust=False, as pandas `ewm().mean()`."""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    minp = max(min_periods, 1)
+    weighted = np.nan
+    old_wt = 1.0
+    nobs = 0
+
+    for i in range(n):
+        cur = values[i]
+        if not np.isnan(cur):
+            nobs += 1
+        weighted, old_wt = _ewm_step(weighted, old_wt, cur, alpha)
+        out[i] = weighted if nobs >= minp else np.nan
+    return out
+
+
+@njit(cache=True)
+def _macd_loop(close, fast, slow, signal):
+    """
+    MACD line, signal and histogram, as `ta.trend.MACD` (EMAs with
+    min_periods equal to their span).
+    """
+    macd = _ema_loop(close, 2.0 / (fast + 1), fast) - _ema_loop(close, 2.0 / (slow + 1), slow)
+    macd_signal = _ema_loop(macd, 2.0 / (signal + 1), signal)
+    return macd, macd_signal, macd - macd_signal
+
+
+@njit(cache=True)
+def _rsi_value(ema_up, ema_down):
+    """RSI from the smoothed gains and losses (100 when there are no losses)."""
+    if ema_down == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + ema_up / ema_down)
+
+
+@njit(cache=True)
+def _rsi_loop(close, period):
+    """Wilder RSI: smoothed gains over smoothed losses, NaN during warm-up."""
+    n = close.shape[0]
+    up = np.zeros(n, dtype=np.float64)
+    down = np.zeros(n, dtype=np.float64)
+    for i in range(1, n):
+        diff = close[i] - close[i - 1]
+        if diff > 0:
+            up[i] = diff
+        elif diff < 0:
+            down[i] = -diff
+
+    alpha = 1.0 / period
+    ema_up = _ema_loop(up, alpha, period)
+    ema_down = _ema_loop(down, alpha, period)
+
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        out[i] = _rsi_value(ema_up[i], ema_down[i])
+    return out
+
+
+@njit(cache=True)
+def _kahan_add(total, compensation, value):
+    """Compensated running sum step, as pandas rolling sums use."""
+    y = value - compensation
+    t = total + y
+    compensation = (t - total) - y
+    return t, compensation
+
+
+@njit(cache=True)
+def _close_indicators(close, rsi_period, ema_period, short_window, long_window, bb_dev):
+    """
+    RSI, EMA, short/long SMA and Bollinger Bands in one pass over close.
+
+    Rolling means keep a compensated running sum (add the entering bar,
+    subtract the leaving one) and the band width a running Welford
+    variance over the short window, so close is streamed once instead
+    of once per indicator. Windows need that many non-NaN values, like
+    pandas `rolling(window, min_periods=window)`.
+
+    Returns:
+        (rsi, ema, sma_short, sma_long, bb_upper, bb_lower); the short SMA
+        is also the Bollinger middle band.
+    """
+    n = close.shape[0]
+    rsi = np.empty(n, dtype=np.float64)
+    ema = np.empty(n, dtype=np.float64)
+    sma_short = np.empty(n, dtype=np.float64)
+    sma_long = np.empty(n, dtype=np.float64)
+    bb_upper = np.empty(n, dtype=np.float64)
+    bb_lower = np.empty(n, dtype=np.float64)
+
+    rsi_alpha = 1.0 / rsi_period
+    ema_alpha = 2.0 / (ema_period + 1)
+    up_weighted, up_wt = np.nan, 1.0
+    down_weighted, down_wt = np.nan, 1.0
+    ema_weighted, ema_wt = np.nan, 1.0
+    ema_nobs = 0
+
+    short_sum, short_comp, short_nobs = 0.0, 0.0, 0
+    long_sum, long_comp, long_nobs = 0.0, 0.0, 0
+    var_mean, var_ssq = 0.0, 0.0
+
+    for i in range(n):
+        cur = close[i]
+
+        # RSI: smoothed gains/losses; the first bar counts as no change
+        up = 0.0
+        down = 0.0
+        if i > 0:
+            diff = cur - close[i - 1]
+            if diff > 0:
+                up = diff
+            elif diff < 0:
+                down = -diff
+        up_weighted, up_wt = _ewm_step(up_weighted, up_wt, up, rsi_alpha)
+        down_weighted, down_wt = _ewm_step(down_weighted, down_wt, down, rsi_alpha)
+        rsi[i] = _rsi_value(up_weighted, down_weighted) if i + 1 >= rsi_period else np.nan
+
+        # EMA
+        if not np.isnan(cur):
+            ema_nobs += 1
+        ema_weighted, ema_wt = _ewm_step(ema_weighted, ema_wt, cur, ema_alpha)
+        ema[i] = ema_weighted if ema_nobs >= max(ema_period, 1) else np.nan
+
+        # Short window: running sum for the mean, Welford for the variance
+        if not np.isnan(cur):
+            short_sum, short_comp = _kahan_add(short_sum, short_comp, cur)
+            short_nobs += 1
+            delta = cur - var_mean
+            var_mean += delta / short_nobs
+            var_ssq += delta * (cur - var_mean)
+        if i >= short_window:
+            leaving = close[i - short_window]
+            if not np.isnan(leaving):
+                short_sum, short_comp = _kahan_add(short_sum, short_comp, -leaving)
+                short_nobs -= 1
+                if short_nobs > 0:
+                    delta = leaving - var_mean
+                    var_mean -= delta / short_nobs
+                    var_ssq -= delta * (leaving - var_mean)
+                else:
+                    var_mean, var_ssq = 0.0, 0.0
+        if short_nobs >= short_window:
+            mean = short_sum / short_nobs
+            std = np.sqrt(max(var_ssq, 0.0) / short_nobs)
+            sma_short[i] = mean
+            bb_upper[i] = mean + bb_dev * std
+            bb_lower[i] = mean - bb_dev * std
+        else:
+            sma_short[i] = np.nan
+            bb_upper[i] = np.nan
+            bb_lower[i] = np.nan
+
+        # Long window
+        if not np.isnan(cur):
+            long_sum, long_comp = _kahan_add(long_sum, long_comp, cur)
+            long_nobs += 1
+        if i >= long_window:
+            leaving = close[i - long_window]
+            if not np.isnan(leaving):
+                long_sum, long_comp = _kahan_add(long_sum, long_comp, -leaving)
+                long_nobs -= 1
+        sma_long[i] = long_sum / long_nobs if long_nobs >= long_window else np.nan
+
+    return rsi, ema, sma_short, sma_long, bb_upper, bb_lower
+
+
+@njit(cache=True)
+def _atr_loop(high, low, close, period):
+    """Wilder ATR; zero before the first full window, like `ta`."""
+    n = close.shape[0]
+    out = np.zeros(n, dtype=np.float64)
+    if n < period:
+        return out
+
+    true_range = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        # Max over the three ranges, skipping NaN (no previous close on row 0)
+        best = np.nan
+        tr1 = high[i] - low[i]
+        if not np.isnan(tr1):
+            best = tr1
+        if i > 0:
+            tr2 = abs(high[i] - close[i - 1])
+            tr3 = abs(low[i] - close[i - 1])
+            if not np.isnan(tr2) and (np.isnan(best) or tr2 > best):
+                best = tr2
+            if not np.isnan(tr3) and (np.isnan(best) or tr3 > best):
+                best = tr3
+        true_range[i] = best
+
+    total = 0.0
+    count = 0
+    for i in range(period):
+        if not np.isnan(true_range[i]):
+            total += true_range[i]
+            count += 1
+    out[period - 1] = total / count if count > 0 else np.nan
+
+    for i in range(period, n):
+        out[i] = (out[i - 1] * (period - 1) + true_range[i]) / period
+    return out
+
+
+@njit(cache=True)
+def _first_valid_sum(values, count):
+    """Sum of the first `count` non-NaN values (`dropna().iloc[:count].sum()`)."""
+    total = 0.0
+    seen = 0
+    for i in range(values.shape[0]):
+        if seen == count:
+            break
+        if not np.isnan(values[i]):
+            total += values[i]
+            seen += 1
+    return total
+
+
+@njit(cache=True)
+def _adx_loop(high, low, close, period):
+    """
+    ADX with the `ta` seeding: zero until 2*period - 1 bars are available.
+
+    The smoothed true range and directional movement series start one
+    window in and their last element stays zero, exactly as in `ta`.
+    """
+    n = close.shape[0]
+    out = np.zeros(n, dtype=np.float64)
+    m = n - (period - 1)
+    if m <= period:
+        return out
+
+    range_dm = np.empty(n, dtype=np.float64)
+    pos = np.empty(n, dtype=np.float64)
+    neg = np.empty(n, dtype=np.float64)
+    range_dm[0] = np.nan
+    pos[0] = np.nan
+    neg[0] = np.nan
+    for i in range(1, n):
+        prev_close = close[i - 1]
+        if np.isnan(high[i]) or np.isnan(prev_close):
+            pdm = np.nan
+        else:
+            pdm = max(high[i], prev_close)
+        if np.isnan(low[i]) or np.isnan(prev_close):
+            pdn = np.nan
+        else:
+            pdn = min(low[i], prev_close)
+        range_dm[i] = pdm - pdn
+
+        diff_up = high[i] - high[i - 1]
+        diff_down = low[i - 1] - low[i]
+        if np.isnan(diff_up):
+            pos[i] = np.nan
+        else:
+            pos[i] = abs(diff_up) if (diff_up > diff_down and diff_up > 0) else 0.0
+        if np.isnan(diff_down):
+            neg[i] = np.nan
+        else:
+            neg[i] = abs(diff_down) if (diff_down > diff_up and diff_down > 0) else 0.0
+
+    trs = np.zeros(m, dtype=np.float64)
+    dip = np.zeros(m, dtype=np.float64)
+    din = np.zeros(m, dtype=np.float64)
+    trs[0] = _first_valid_sum(range_dm, period)
+    dip[0] = _first_valid_sum(pos, period)
+    din[0] = _first_valid_sum(neg, period)
+    for i in range(1, m - 1):
+        trs[i] = trs[i - 1] - trs[i - 1] / period + range_dm[period + i]
+        dip[i] = dip[i - 1] - dip[i - 1] / period + pos[period + i]
+        din[i] = din[i - 1] - din[i - 1] / period + neg[period + i]
+
+    dx = np.zeros(m, dtype=np.float64)
+    for i in range(m):
+        di_pos = 100.0 * (dip[i] / trs[i]) if trs[i] != 0 else 0.0
+        di_neg = 100.0 * (din[i] / trs[i]) if trs[i] != 0 else 0.0
+        if di_pos + di_neg != 0:
+            dx[i] = 100.0 * abs((di_pos - di_neg) / (di_pos + di_neg))
+
+    adx = np.zeros(m, dtype=np.float64)
+    adx[period] = dx[:period].mean()
+    for i in range(period + 1, m):
+        adx[i] = (adx[i - 1] * (period - 1) + dx[i - 1]) / period
+
+    out[period - 1:] = adx
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _indicators_batch(highs, lows, closes, lengths):
+    """
+    calculate_all's compiled indicators for several symbols at once.
+    
+    Inputs are (n_symbols, n_bars) arrays padded to the longest series;
+    lengths holds each symbol's real bar count. Symbols are independent,
+    so they are spread over threads with prange.
+    
+    Returns:
+        float64[11, n_symbols, n_bars] with rows rsi, ema_20, sma_20,
+        sma_50, bb_upper, bb_lower, atr, adx, macd, macd_signal,
+        macd_histogram (NaN past each length).
+    """
+    n_symbols, width = closes.shape
+    out = np.full((11, n_symbols, width), np.nan)
+    for s in prange(n_symbols):
+        n = lengths[s]
+        high = highs[s, :n]
+        low = lows[s, :n]
+        close = closes[s, :n]
+        rsi, ema, sma_short, sma_long, bb_upper, bb_lower = _close_indicators(
+            close, 14, 20, 20, 50, 2.0
+        )
+        out[0, s, :n] = rsi
+        out[1, s, :n] = ema
+        out[2, s, :n] = sma_short
+        out[3, s, :n] = sma_long
+        out[4, s, :n] = bb_upper
+        out[5, s, :n] = bb_lower
+        out[6, s, :n] = _atr_loop(high, low, close, 14)
+        out[7, s, :n] = _adx_loop(high, low, close, 14)
+        macd, macd_signal, macd_histogram = _macd_loop(close, 12, 26, 9)
+        out[8, s, :n] = macd
+        out[9, s, :n] = macd_signal
+        out[10, s, :n] = macd_histogram
+    return out
@@ -11,18 +11,28 @@ Directory Structure:
     data/
     └── market_cache/
         ├── XAUUSD/
-        │   ├── 15m.parquet
-        │   ├── 1h.parquet
-        │   └── 1d.parquet
+        │   ├── 15m/
+        │   │   └── year=2024/
+        │   │       ├── month=1/
+        │   │       │   ├── part-000001.parquet
+        │   │       │   └── part-000002.parquet
+        │   │       └── month=2/
+        │   │           └── ...
+        │   └── 1h/
+        │       └── ...
         ├── EURUSD/
         │   └── ...
-        └── metadata.json
+        └── metadata.db
 
 Features:
-- Parquet compression (snappy) - 5-10x smaller than CSV
-- Automatic merge with existing data
-- Metadata tracking for fast has_data() checks
-- Thread-safe file operations
+- Parquet compression (zstd, dictionary-encoded) - 5-10x smaller than CSV
+- Append-only writes: new or changed candles go to a new part file,
+  newest part wins on read; partitions are compacted once they
+  accumulate COMPACT_MAX_PARTS files
+- SQLite metadata (metadata.db, WAL) for fast has_data() checks and
+  single-row updates
+- Thread-safe file operations: one lock per symbol stripe for data
+  files, a separate short-held lock for metadata
 
 Usage:
     from core.local_storage import LocalStorage
@@ -36,15 +46,85 @@ Version: 1.0
 """
 
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import json
-from datetime import datetime
-from typing import Dict, Any, Optional
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
 import threading
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
 from core.storage_interface import DataStorage
 from core.metrics import track_performance
 
+logger = logging.getLogger('edgelab.local_storage')
+
+# Parquet write settings (pyarrow path)
+PARQUET_ZSTD_LEVEL = 3
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+# A month partition is rewritten as one file once it holds more parts
+COMPACT_MAX_PARTS = 8
+
+# Number of data locks; symbols are spread over them by hash (power of two)
+LOCK_STRIPES = 16
+
+_METADATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    start_ns INTEGER NOT NULL,
+    end_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    last_updated_ns INTEGER NOT NULL,
+    file_size_mb REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, timeframe)
+);
+CREATE INDEX IF NOT EXISTS datasets_last_updated ON datasets (last_updated_ns);
+"""
+
+_PARTITION_RE = re.compile(r'^(year|month)=(\d+)$')
+_PART_RE = re.compile(r'^part-(\d+)\.parquet$')
+
+
+def _ensure_datetime_index(data: pd.DataFrame) -> pd.DataFrame:
+    """Use the 'timestamp' column (or the existing index) as a DatetimeIndex."""
+    if not isinstance(data.index, pd.DatetimeIndex):
+        if 'timestamp' in data.columns:
+            data = data.set_index('timestamp')
+        data.index = pd.to_datetime(data.index)
+    return data
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_ns(value) -> int:
+    """Nanoseconds since the epoch; naive datetimes skip the pd.Timestamp round trip."""
+    if isinstance(value, pd.Timestamp):
+        return value.value
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return (value - _EPOCH) // _MICROSECOND * 1000
+    return pd.Timestamp(value).value
+
+
+def _partition_number(path: Path) -> int:
+    """Value of a 'year=2024' / 'month=1' directory name, -1 if it is not one."""
+    match = _PARTITION_RE.match(path.name)
+    return int(match.group(2)) if match else -1
+
 
 class LocalStorage(DataStorage):
     """
@@ -70,37 +150,130 @@ class LocalStorage(DataStorage):
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
-        self.metadata_file = self.base_path / "metadata.json"
-        self._lock = threading.RLock()
-        self._load_metadata()
+        self.metadata_db = self.base_path / "metadata.db"
+        # Data files are guarded per symbol stripe, so saves of independent
+        # symbols run in parallel; _meta_lock only covers metadata.db and the
+        # in-memory caches and is always taken after a data lock
+        self._locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+        self._meta_lock = threading.RLock()
+        self._db = sqlite3.connect(
+            str(self.metadata_db), isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_METADATA_SCHEMA)
+        self._import_json_metadata()
+        
+        # Dataset directory -> size in bytes; filled by one scan on first use
+        self._dataset_sizes: Optional[Dict[str, int]] = None
+        
+        # (SYMBOL, timeframe) -> (start_ns, end_ns), mirrors metadata.db
+        self._ranges: Dict[tuple, tuple] = {
+            (symbol, timeframe): (start_ns, end_ns)
+            for symbol, timeframe, start_ns, end_ns in self._db.execute(
+                "SELECT symbol, timeframe, start_ns, end_ns FROM datasets"
+            )
+        }
     
-    def _load_metadata(self) -> None:
-        """Load metadata from JSON file."""
-        if self.metadata_file.exists():
-            try:
-                with open(self.metadata_file, 'r') as f:
-                    self.metadata = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load metadata: {e}")
-                self.metadata = {}
-        else:
-            self.metadata = {}
+    def _import_json_metadata(self) -> None:
+        """One-time import of a metadata.json written by older versions."""
+        json_file = self.base_path / "metadata.json"
+        if not json_file.exists():
+            return
+        try:
+            with open(json_file, 'r') as f:
+                entries = json.load(f)
+            with self._meta_lock:
+                for meta in entries.values():
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            meta['symbol'], meta['timeframe'],
+                            pd.Timestamp(meta['start']).value, pd.Timestamp(meta['end']).value,
+                            int(meta.get('rows', 0)),
+                            int(datetime.fromisoformat(meta['last_updated']).timestamp() * 1e9),
+                            float(meta.get('file_size_mb', 0.0))
+                        )
+                    )
+            json_file.unlink()
+        except (json.JSONDecodeError, IOError, KeyError, ValueError) as e:
+            logger.warning("Could not import metadata.json: %s", e)
+    
+    @property
+    def metadata(self) -> Dict[str, Dict[str, Any]]:
+        """
+        All dataset entries keyed by '<SYMBOL>_<timeframe>'.
+        
+        Built from metadata.db on each access; timestamps are ISO strings
+        for display.
+        """
+        with self._meta_lock:
+            rows = self._db.execute(
+                "SELECT symbol, timeframe, start_ns, end_ns, rows, last_updated_ns, file_size_mb "
+                "FROM datasets ORDER BY symbol, timeframe"
+            ).fetchall()
+        return {
+            self._get_metadata_key(symbol, timeframe): {
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'start': pd.Timestamp(start_ns).isoformat(),
+                'end': pd.Timestamp(end_ns).isoformat(),
+                'rows': n_rows,
+                'last_updated': datetime.fromtimestamp(updated_ns / 1e9).isoformat(),
+                'file_size_mb': size_mb
+            }
+            for symbol, timeframe, start_ns, end_ns, n_rows, updated_ns, size_mb in rows
+        }
+    
+    def _lock_for(self, symbol: str) -> threading.RLock:
+        """Data lock of the stripe a symbol hashes to."""
+        return self._locks[hash(symbol.upper()) & (LOCK_STRIPES - 1)]
     
-    def _save_metadata(self) -> None:
-        """Persist metadata to JSON file."""
-        with self._lock:
-            with open(self.metadata_file, 'w') as f:
-                json.dump(self.metadata, f, indent=2, default=str)
+    def _get_dataset_dir(self, symbol: str, timeframe: str) -> Path:
+        """Directory holding the month partitions for symbol/timeframe."""
+        return self.base_path / symbol.upper() / timeframe
     
-    def _get_file_path(self, symbol: str, timeframe: str) -> Path:
+    def _partition_dirs(
+        self,
+        dataset_dir: Path,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Path]:
         """
-        Get path for symbol/timeframe Parquet file.
+        Month partitions of a dataset in time order.
         
-        Creates symbol directory if it doesn't exist.
+        With start/end, partitions for months outside the range are skipped
+        without opening any file.
         """
-        symbol_dir = self.base_path / symbol.upper()
-        symbol_dir.mkdir(exist_ok=True)
-        return symbol_dir / f"{timeframe}.parquet"
+        first = (start.year, start.month) if start is not None else None
+        last = (end.year, end.month) if end is not None else None
+        partitions = []
+        if not dataset_dir.is_dir():
+            return partitions
+        for year_dir in dataset_dir.iterdir():
+            year = _partition_number(year_dir)
+            if year < 0:
+                continue
+            for month_dir in year_dir.iterdir():
+                month = _partition_number(month_dir)
+                if month < 0:
+                    continue
+                if first is not None and (year, month) < first:
+                    continue
+                if last is not None and (year, month) > last:
+                    continue
+                partitions.append(((year, month), month_dir))
+        return [path for _, path in sorted(partitions)]
+    
+    @staticmethod
+    def _part_files(partition_dir: Path) -> List[Path]:
+        """Part files of a partition, oldest first."""
+        parts = []
+        for path in partition_dir.iterdir():
+            match = _PART_RE.match(path.name)
+            if match:
+                parts.append((int(match.group(1)), path))
+        return [path for _, path in sorted(parts)]
     
     def _get_metadata_key(self, symbol: str, timeframe: str) -> str:
         """Generate metadata key for symbol/timeframe."""
@@ -116,23 +289,30 @@ class LocalStorage(DataStorage):
         """
         Check if storage has complete data for requested range.
         
-        Uses metadata for fast check - does not load file.
+        Two integer comparisons against the in-memory range of the dataset.
+        A miss is confirmed against metadata.db, so ranges extended by
+        another process are picked up. Does not load file.
         """
-        key = self._get_metadata_key(symbol, timeframe)
-        
-        if key not in self.metadata:
-            return False
+        key = (symbol.upper(), timeframe)
+        start_ns = _to_ns(start)
+        end_ns = _to_ns(end)
         
-        meta = self.metadata[key]
+        cached = self._ranges.get(key)
+        if cached is not None and cached[0] <= start_ns and cached[1] >= end_ns:
+            return True
         
-        try:
-            cached_start = datetime.fromisoformat(meta['start'])
-            cached_end = datetime.fromisoformat(meta['end'])
-        except (KeyError, ValueError):
-            return False
+        with self._meta_lock:
+            row = self._db.execute(
+                "SELECT start_ns, end_ns FROM datasets WHERE symbol = ? AND timeframe = ?",
+                key
+            ).fetchone()
+            if row is None:
+                self._ranges.pop(key, None)
+                return False
+            self._ranges[key] = row
         
         # Check if cached range covers requested range
-        return cached_start <= start and cached_end >= end
+        return row[0] <= start_ns and row[1] >= end_ns
     
     @track_performance("storage_read", slow_threshold_seconds=5.0)
     def get_data(
@@ -140,35 +320,192 @@ class LocalStorage(DataStorage):
         symbol: str, 
         timeframe: str,
         start: datetime, 
-        end: datetime
+        end: datetime,
+        columns: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
-        Retrieve market data from local Parquet file.
+        Retrieve market data from the local Parquet dataset.
         
+        Only the month partitions overlapping [start, end] are read, and
+        with `columns` only those columns (plus the index) are decoded.
         Returns empty DataFrame if no data available.
         """
-        file_path = self._get_file_path(symbol, timeframe)
-        
-        if not file_path.exists():
-            return pd.DataFrame()
+        dataset_dir = self._get_dataset_dir(symbol, timeframe)
         
         try:
-            df = pd.read_parquet(file_path)
-            
-            # Ensure index is datetime
-            if not isinstance(df.index, pd.DatetimeIndex):
-                if 'timestamp' in df.columns:
-                    df = df.set_index('timestamp')
-                df.index = pd.to_datetime(df.index)
-            
-            # Filter to requested range
-            mask = (df.index >= pd.Timestamp(start)) & (df.index <= pd.Timestamp(end))
-            return df[mask]
-            
+            self._migrate_legacy_file(dataset_dir)
+            return self._read_parts(dataset_dir, start, end, columns)
         except Exception as e:
-            print(f"Error reading {file_path}: {e}")
+            logger.error("Error reading %s: %s", dataset_dir, e)
             return pd.DataFrame()
     
+    def _read_parts(
+        self,
+        dataset_dir: Path,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read and deduplicate the part files of a dataset.
+        
+        Parts are concatenated oldest first, so for a timestamp stored more
+        than once the most recently written row wins.
+        """
+        frames = []
+        for partition_dir in self._partition_dirs(dataset_dir, start, end):
+            for part in self._part_files(partition_dir):
+                frame = self._read_file(part, start, end, columns)
+                if not frame.empty:
+                    frames.append(frame)
+        
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        
+        df = pd.concat(frames)
+        df = df[~df.index.duplicated(keep='last')]
+        return df.sort_index(kind='stable')
+    
+    def _read_file(
+        self,
+        file_path: Path,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Read the rows of one Parquet file in [start, end] (all rows without bounds)."""
+        if pa is not None:
+            df = self._read_range(file_path, start, end, columns)
+            if df is not None:
+                return df
+        
+        df = _ensure_datetime_index(pd.read_parquet(file_path, columns=columns))
+        if start is None and end is None:
+            return df
+        
+        if df.index.is_monotonic_increasing:
+            # Part files are written sorted: binary search instead of a full mask
+            lo = df.index.searchsorted(pd.Timestamp(start), side='left') if start is not None else 0
+            hi = df.index.searchsorted(pd.Timestamp(end), side='right') if end is not None else len(df)
+            return df.iloc[lo:hi]
+        
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index <= pd.Timestamp(end)]
+        return df
+    
+    def _read_range(
+        self,
+        file_path: Path,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Read only the rows in [start, end] via pyarrow.
+        
+        The file is memory-mapped and the range filter is pushed down into
+        the Parquet read, so only matching rows are converted to pandas.
+        Column projection is pushed down as well; the index column is
+        always loaded.
+        The Arrow buffers are released column by column during conversion,
+        so the read never holds both copies of the range in full.
+        Returns None if the file has no single tz-naive timestamp index
+        column (caller falls back to the pandas path).
+        """
+        schema = pq.read_schema(file_path, memory_map=True)
+        index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+        if len(index_columns) != 1 or not isinstance(index_columns[0], str):
+            return None
+        index_type = schema.field(index_columns[0]).type
+        if not pa.types.is_timestamp(index_type) or index_type.tz is not None:
+            return None
+        
+        # Pushdown filter: row groups outside [start, end] are skipped via
+        # their min/max statistics, the rest is filtered row-wise
+        index_col = index_columns[0]
+        filters = []
+        if start is not None:
+            filters.append((index_col, '>=', pd.Timestamp(start).to_pydatetime()))
+        if end is not None:
+            filters.append((index_col, '<=', pd.Timestamp(end).to_pydatetime()))
+        table = pq.read_table(
+            file_path,
+            columns=columns,
+            memory_map=True,
+            filters=filters or None,
+            use_pandas_metadata=True
+        )
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    
+    def _write_part(self, partition_dir: Path, data: pd.DataFrame) -> Path:
+        """
+        Write a frame as the next part file of a partition.
+        
+        The file is written under a temp name and renamed into place, so
+        readers never see a partial part.
+        """
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        parts = self._part_files(partition_dir)
+        number = int(_PART_RE.match(parts[-1].name).group(1)) + 1 if parts else 1
+        part_path = partition_dir / f"part-{number:06d}.parquet"
+        tmp_path = partition_dir / f"part-{number:06d}.parquet.tmp"
+        
+        if pa is not None:
+            pq.write_table(
+                pa.Table.from_pandas(data, preserve_index=True),
+                tmp_path,
+                compression='zstd',
+                compression_level=PARQUET_ZSTD_LEVEL,
+                use_dictionary=True,
+                row_group_size=PARQUET_ROW_GROUP_SIZE
+            )
+        else:
+            data.to_parquet(tmp_path, compression='snappy')
+        os.replace(tmp_path, part_path)
+        return part_path
+    
+    def _compact_partition(self, partition_dir: Path) -> None:
+        """Rewrite a partition with too many parts as a single deduplicated part."""
+        parts = self._part_files(partition_dir)
+        if len(parts) <= COMPACT_MAX_PARTS:
+            return
+        
+        frames = [self._read_file(part) for part in parts]
+        merged = pd.concat(frames)
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index(kind='stable')
+        self._write_part(partition_dir, merged)
+        for part in parts:
+            part.unlink()
+    
+    def _migrate_legacy_file(self, dataset_dir: Path) -> None:
+        """Move a single-file cache (<symbol>/<timeframe>.parquet) into the partitioned layout."""
+        legacy_file = dataset_dir.with_suffix('.parquet')
+        if not legacy_file.exists():
+            return
+        with self._lock_for(dataset_dir.parent.name):
+            if not legacy_file.exists():
+                return
+            data = _ensure_datetime_index(pd.read_parquet(legacy_file))
+            if not data.empty and not dataset_dir.exists():
+                self._append_partitions(dataset_dir, data.sort_index(kind='stable'))
+            legacy_file.unlink()
+            logger.info("Migrated %s to partitioned layout", legacy_file)
+    
+    def _append_partitions(self, dataset_dir: Path, data: pd.DataFrame) -> None:
+        """Append a time-sorted frame as one new part per month it spans."""
+        month_keys = data.index.year * 100 + data.index.month
+        _, starts = np.unique(month_keys, return_index=True)
+        bounds = list(starts) + [len(data)]
+        for begin, stop in zip(bounds[:-1], bounds[1:]):
+            stamp = data.index[begin]
+            partition_dir = dataset_dir / f"year={stamp.year}" / f"month={stamp.month}"
+            self._write_part(partition_dir, data.iloc[begin:stop])
+            self._compact_partition(partition_dir)
+    
     @track_performance("storage_write", slow_threshold_seconds=5.0)
     def save_data(
         self, 
@@ -177,79 +514,163 @@ class LocalStorage(DataStorage):
         data: pd.DataFrame
     ) -> None:
         """
-        Store market data to local Parquet file.
+        Store market data in the local Parquet dataset.
         
-        Merges with existing data - no duplicates.
+        Append-only: the stored rows in the new frame's time range are read
+        back, and only candles that are new or whose values changed are
+        written, as a new part file per month. Candles after the stored end
+        are split off with searchsorted and written without being compared,
+        so the usual append of fresh candles reads nothing back. Existing
+        files are never rewritten (except by compaction); readers let the
+        newest part win. Accepts a DataFrame or a pyarrow Table (e.g. from
+        DataDownloader.download_arrow).
         """
+        if pa is not None and isinstance(data, pa.Table):
+            data = data.to_pandas()
+        
         if data.empty:
             return
         
-        file_path = self._get_file_path(symbol, timeframe)
-        
-        # Ensure data has proper index
-        if not isinstance(data.index, pd.DatetimeIndex):
-            if 'timestamp' in data.columns:
-                data = data.set_index('timestamp')
-            data.index = pd.to_datetime(data.index)
+        data = _ensure_datetime_index(data)
+        if not (data.index.is_monotonic_increasing and data.index.is_unique):
+            data = data[~data.index.duplicated(keep='last')].sort_index(kind='stable')
+        dataset_dir = self._get_dataset_dir(symbol, timeframe)
+        key = (symbol.upper(), timeframe)
         
-        with self._lock:
-            # Merge with existing data if present
-            if file_path.exists():
+        with self._lock_for(symbol):
+            self._migrate_legacy_file(dataset_dir)
+            
+            with self._meta_lock:
+                stored_range = self._db.execute(
+                    "SELECT start_ns, end_ns FROM datasets WHERE symbol = ? AND timeframe = ?",
+                    key
+                ).fetchone()
+            
+            # data[:overlap] may already be stored; everything after is new
+            overlap = 0
+            if stored_range is not None and stored_range[0] <= data.index[-1].value:
+                overlap = int(data.index.searchsorted(pd.Timestamp(stored_range[1]), side='right'))
+            elif stored_range is None and dataset_dir.exists():
+                overlap = len(data)  # files without metadata row: compare everything
+            
+            # Compare with what is stored for the same candles
+            stored = pd.DataFrame()
+            if overlap:
                 try:
-                    existing = pd.read_parquet(file_path)
-                    
-                    # Ensure existing has proper index
-                    if not isinstance(existing.index, pd.DatetimeIndex):
-                        if 'timestamp' in existing.columns:
-                            existing = existing.set_index('timestamp')
-                        existing.index = pd.to_datetime(existing.index)
-                    
-                    # Combine and remove duplicates
-                    data = pd.concat([existing, data])
-                    data = data[~data.index.duplicated(keep='last')]
-                    data = data.sort_index()
-                    
+                    stored = self._read_parts(dataset_dir, data.index[0], data.index[overlap - 1])
                 except Exception as e:
-                    print(f"Warning: Could not merge with existing data: {e}")
+                    logger.warning("Could not read stored range, appending all rows: %s", e)
             
-            # Save with compression
-            data.to_parquet(file_path, compression='snappy')
+            positions = np.full(len(data), -1)
+            if not stored.empty:
+                positions[:overlap] = stored.index.get_indexer(data.index[:overlap])
+            is_new = positions < 0
+            write_mask = is_new.copy()
+            if not is_new.all():
+                head = data.iloc[:overlap]
+                new_hashes = pd.util.hash_pandas_object(head, index=False).to_numpy()
+                stored_hashes = pd.util.hash_pandas_object(stored, index=False).to_numpy()
+                known = ~is_new[:overlap]
+                write_mask[:overlap][known] = new_hashes[known] != stored_hashes[positions[:overlap][known]]
             
-            # Update metadata
-            key = self._get_metadata_key(symbol, timeframe)
-            self.metadata[key] = {
-                'symbol': symbol.upper(),
-                'timeframe': timeframe,
-                'start': data.index.min().isoformat(),
-                'end': data.index.max().isoformat(),
-                'rows': len(data),
-                'last_updated': datetime.now().isoformat(),
-                'file_size_mb': round(file_path.stat().st_size / (1024 * 1024), 3)
-            }
-            self._save_metadata()
+            if write_mask.any():
+                self._append_partitions(dataset_dir, data[write_mask])
+            
+            # Update metadata: widen the range, add the new candles
+            size_bytes = self._dataset_size(dataset_dir)
+            with self._meta_lock:
+                if self._dataset_sizes is not None:
+                    self._dataset_sizes[str(dataset_dir)] = size_bytes
+                self._db.execute(
+                    """
+                    INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (symbol, timeframe) DO UPDATE SET
+                        start_ns = MIN(start_ns, excluded.start_ns),
+                        end_ns = MAX(end_ns, excluded.end_ns),
+                        rows = rows + excluded.rows,
+                        last_updated_ns = excluded.last_updated_ns,
+                        file_size_mb = excluded.file_size_mb
+                    """,
+                    (
+                        *key,
+                        data.index[0].value, data.index[-1].value,
+                        int(is_new.sum()), time.time_ns(),
+                        round(size_bytes / (1024 * 1024), 3)
+                    )
+                )
+                self._ranges[key] = self._db.execute(
+                    "SELECT start_ns, end_ns FROM datasets WHERE symbol = ? AND timeframe = ?",
+                    key
+                ).fetchone()
+    
+    @staticmethod
+    def _dataset_size(dataset_dir: Path) -> int:
+        """Total size in bytes of the part files under a dataset directory."""
+        total = 0
+        stack = [str(dataset_dir)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.parquet'):
+                        total += entry.stat().st_size
+        return total
+    
+    def _scan_parquet_sizes(self) -> Dict[str, int]:
+        """
+        Size in bytes of every cached dataset, keyed by dataset directory.
+        
+        One os.scandir pass over base_path/<symbol>/<timeframe>/ and its
+        month partitions, using the DirEntry stat instead of Path.stat.
+        """
+        sizes = {}
+        with os.scandir(self.base_path) as symbol_dirs:
+            for symbol_dir in symbol_dirs:
+                if not symbol_dir.is_dir():
+                    continue
+                with os.scandir(symbol_dir.path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            sizes[entry.path] = self._dataset_size(Path(entry.path))
+        return sizes
+    
+    def _cached_sizes(self, rescan: bool = False) -> Dict[str, int]:
+        """
+        Per-dataset sizes, scanned once and then kept up to date by
+        save_data, clear_cache and delete_symbol.
+        """
+        with self._meta_lock:
+            if self._dataset_sizes is None or rescan:
+                self._dataset_sizes = self._scan_parquet_sizes()
+            return self._dataset_sizes
+    
+    def _forget_size(self, dataset_dir: Path) -> None:
+        """Drop a deleted dataset from the cached sizes."""
+        if self._dataset_sizes is not None:
+            self._dataset_sizes.pop(str(dataset_dir), None)
     
     def get_metadata(self) -> Dict[str, Any]:
         """
         Get storage statistics and dataset information.
         """
         # Calculate total size
-        total_size = 0
-        for file in self.base_path.rglob("*.parquet"):
-            total_size += file.stat().st_size
+        total_size = sum(self._cached_sizes().values())
         
-        # Count unique symbols
-        symbols = set()
-        for key in self.metadata.keys():
-            symbol = key.split('_')[0]
-            symbols.add(symbol)
+        datasets = self.metadata
+        symbols = {meta['symbol'] for meta in datasets.values()}
         
         return {
             'storage_type': 'local',
             'base_path': str(self.base_path),
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'symbols': len(symbols),
-            'datasets': len(self.metadata),
-            'datasets_detail': self.metadata
+            'datasets': len(datasets),
+            'datasets_detail': datasets
         }
     
     def clear_cache(self, older_than_days: int = 30) -> int:
@@ -258,33 +679,33 @@ class LocalStorage(DataStorage):
         
         Returns number of datasets deleted.
         """
-        cutoff = datetime.now().timestamp() - (older_than_days * 86400)
+        cutoff_ns = time.time_ns() - older_than_days * 86400 * 10**9
         deleted = 0
         
-        with self._lock:
-            keys_to_delete = []
-            
-            for key, meta in self.metadata.items():
-                try:
-                    last_updated = datetime.fromisoformat(meta['last_updated'])
-                    if last_updated.timestamp() < cutoff:
-                        # Delete file
-                        symbol, timeframe = key.split('_', 1)
-                        file_path = self._get_file_path(symbol, timeframe)
-                        if file_path.exists():
-                            file_path.unlink()
-                            print(f"Deleted old cache: {key}")
-                            deleted += 1
-                        keys_to_delete.append(key)
-                except Exception as e:
-                    print(f"Error processing {key}: {e}")
-            
-            # Remove from metadata
-            for key in keys_to_delete:
-                del self.metadata[key]
-            
-            if keys_to_delete:
-                self._save_metadata()
+        with self._meta_lock:
+            stale = self._db.execute(
+                "SELECT symbol, timeframe FROM datasets WHERE last_updated_ns < ?",
+                (cutoff_ns,)
+            ).fetchall()
+        
+        for symbol, timeframe in stale:
+            try:
+                with self._lock_for(symbol):
+                    # Delete dataset
+                    dataset_dir = self._get_dataset_dir(symbol, timeframe)
+                    if dataset_dir.exists():
+                        shutil.rmtree(dataset_dir)
+                        logger.info("Deleted old cache: %s_%s", symbol, timeframe)
+                        deleted += 1
+                    with self._meta_lock:
+                        self._forget_size(dataset_dir)
+                        self._db.execute(
+                            "DELETE FROM datasets WHERE symbol = ? AND timeframe = ?",
+                            (symbol, timeframe)
+                        )
+                        self._ranges.pop((symbol, timeframe), None)
+            except Exception as e:
+                logger.error("Error processing %s_%s: %s", symbol, timeframe, e)
         
         return deleted
     
@@ -297,30 +718,30 @@ class LocalStorage(DataStorage):
         symbol = symbol.upper()
         deleted = 0
         
-        with self._lock:
-            keys_to_delete = []
+        with self._lock_for(symbol):
+            with self._meta_lock:
+                timeframes = self._db.execute(
+                    "SELECT timeframe FROM datasets WHERE symbol = ?", (symbol,)
+                ).fetchall()
             
-            for key in list(self.metadata.keys()):
-                if key.startswith(f"{symbol}_"):
-                    # Delete file
-                    _, timeframe = key.split('_', 1)
-                    file_path = self._get_file_path(symbol, timeframe)
-                    if file_path.exists():
-                        file_path.unlink()
-                        deleted += 1
-                    keys_to_delete.append(key)
+            for (timeframe,) in timeframes:
+                # Delete dataset
+                dataset_dir = self._get_dataset_dir(symbol, timeframe)
+                if dataset_dir.exists():
+                    shutil.rmtree(dataset_dir)
+                    deleted += 1
             
             # Remove from metadata
-            for key in keys_to_delete:
-                del self.metadata[key]
+            with self._meta_lock:
+                self._db.execute("DELETE FROM datasets WHERE symbol = ?", (symbol,))
+                for (timeframe,) in timeframes:
+                    self._forget_size(self._get_dataset_dir(symbol, timeframe))
+                    self._ranges.pop((symbol, timeframe), None)
             
             # Remove symbol directory if empty
             symbol_dir = self.base_path / symbol
             if symbol_dir.exists() and not any(symbol_dir.iterdir()):
                 symbol_dir.rmdir()
-            
-            if keys_to_delete:
-                self._save_metadata()
         
         return deleted
     
@@ -351,13 +772,17 @@ class LocalStorage(DataStorage):
                 health['issues'].append(f'Cannot write to storage: {e}')
         
         # Check metadata consistency
-        metadata_count = len(self.metadata)
-        file_count = len(list(self.base_path.rglob("*.parquet")))
+        with self._meta_lock:
+            metadata_count = self._db.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+        dataset_count = len(self._cached_sizes())
+        if metadata_count != dataset_count:
+            # Cached counts disagree: confirm against the disk before warning
+            dataset_count = len(self._cached_sizes(rescan=True))
         
-        if metadata_count != file_count:
+        if metadata_count != dataset_count:
             health['status'] = 'warning'
             health['issues'].append(
-                f'Metadata mismatch: {metadata_count} entries, {file_count} files'
+                f'Metadata mismatch: {metadata_count} entries, {dataset_count} datasets'
             )
         
         # Get stats
@@ -22,16 +22,28 @@ Output:
     INFO: data_download took 2.34s
     WARNING: SLOW: data_download took 15.23s (threshold: 10s)
 
+Persistence:
+    Set METRICS_PATH (or call enable_persistent_metrics) to also keep
+    timings in fixed-size ring-buffer files (<operation>.ring, mmap'ed),
+    so summaries survive restarts at constant memory.
+
 Author: EdgeLab Development
 Version: 1.0
 """
 
+import mmap
+import os
+import re
+import threading
 import time
 import logging
 from functools import wraps
+from pathlib import Path
 from typing import Callable, Optional, Dict, Any
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+
+import numpy as np
 
 # Configure logging
 logging.basicConfig(
@@ -41,9 +53,107 @@ logging.basicConfig(
 logger = logging.getLogger('edgelab.metrics')
 
 
+# Entries kept per operation
+MAX_ENTRIES = 1000
+
 # In-memory metrics storage (for MVP)
-# In production, this would go to a metrics service
-_metrics_store: Dict[str, list] = defaultdict(list)
+# In production, this would go to a metrics service.
+# One record per call: (timestamp_ns, duration_ns, success, error, metadata)
+_metrics_store: Dict[str, deque] = defaultdict(lambda: deque(maxlen=MAX_ENTRIES))
+
+# Ring-buffer file layout: uint64 write count, then MAX_ENTRIES records
+_RING_HEADER_BYTES = 8
+_RING_RECORD = np.dtype([
+    ('timestamp_ns', '<u8'),
+    ('duration_ns', '<u8'),
+    ('success', 'u1'),
+    ('pad', 'V7'),
+])
+
+
+class _RingBuffer:
+    """Fixed-size record ring in a memory-mapped file; the oldest record is overwritten."""
+    
+    def __init__(self, path: Path, capacity: Optional[int] = None):
+        self.capacity = capacity or MAX_ENTRIES
+        size = _RING_HEADER_BYTES + self.capacity * _RING_RECORD.itemsize
+        with open(path, 'a+b') as f:
+            if os.fstat(f.fileno()).st_size != size:
+                f.truncate(0)
+                f.truncate(size)
+            self._mmap = mmap.mmap(f.fileno(), size)
+        self._head = np.ndarray((1,), dtype='<u8', buffer=self._mmap)
+        self._records = np.ndarray(
+            (self.capacity,), dtype=_RING_RECORD, buffer=self._mmap, offset=_RING_HEADER_BYTES
+        )
+    
+    def append(self, timestamp_ns: int, duration_ns: int, success: bool) -> None:
+        record = self._records[int(self._head[0]) % self.capacity]
+        record['timestamp_ns'] = timestamp_ns
+        record['duration_ns'] = duration_ns
+        record['success'] = success
+        self._head[0] += 1
+    
+    def snapshot(self) -> np.ndarray:
+        """Stored records, oldest first (a copy)."""
+        head = int(self._head[0])
+        if head <= self.capacity:
+            return self._records[:head].copy()
+        split = head % self.capacity
+        return np.concatenate((self._records[split:], self._records[:split]))
+    
+    def clear(self) -> None:
+        self._head[0] = 0
+
+
+_ring_dir: Optional[Path] = None
+_rings: Dict[str, _RingBuffer] = {}  # by _ring_name(operation)
+_ring_lock = threading.Lock()
+
+
+def _ring_name(operation: str) -> str:
+    """File-safe operation name; the ring file stem and the _rings key."""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', operation)
+
+
+def _ring_path(operation: str) -> Path:
+    return _ring_dir / (_ring_name(operation) + '.ring')
+
+
+def enable_persistent_metrics(directory: str) -> None:
+    """
+    Keep timings in ring-buffer files under `directory` as well.
+    
+    Rings left by earlier runs are reopened, so get_metrics_summary
+    includes them.
+    """
+    global _ring_dir
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    with _ring_lock:
+        _ring_dir = path
+        _rings.clear()
+        for ring_file in path.glob('*.ring'):
+            _rings[ring_file.stem] = _RingBuffer(ring_file)
+
+
+def _record(
+    operation: str,
+    duration_ns: int,
+    success: bool,
+    error: Optional[str],
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """Store one call in memory and, if enabled, in the operation's ring file."""
+    timestamp_ns = time.time_ns()
+    _metrics_store[operation].append((timestamp_ns, duration_ns, success, error, metadata))
+    if _ring_dir is not None:
+        with _ring_lock:
+            name = _ring_name(operation)
+            ring = _rings.get(name)
+            if ring is None:
+                ring = _rings[name] = _RingBuffer(_ring_path(operation))
+            ring.append(timestamp_ns, duration_ns, success)
 
 
 def track_performance(
@@ -67,39 +177,31 @@ def track_performance(
     def decorator(func: Callable):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
+            success = False
+            error_msg = None
             
             try:
                 result = func(*args, **kwargs)
                 success = True
-                error_msg = None
             except Exception as e:
-                success = False
                 error_msg = str(e)
                 raise
             finally:
-                duration = time.time() - start_time
+                duration_ns = time.perf_counter_ns() - start_ns
                 
-                # Store metric
-                _metrics_store[operation].append({
-                    'timestamp': datetime.now().isoformat(),
-                    'duration': duration,
-                    'success': success,
-                    'error': error_msg
-                })
-                
-                # Keep only last 1000 entries per operation
-                if len(_metrics_store[operation]) > 1000:
-                    _metrics_store[operation] = _metrics_store[operation][-1000:]
+                # Store metric (the deque drops the oldest entry when full)
+                _record(operation, duration_ns, success, error_msg)
                 
                 # Log performance
+                duration = duration_ns / 1e9
                 if duration > slow_threshold_seconds:
                     logger.warning(
-                        f"SLOW: {operation} took {duration:.2f}s "
-                        f"(threshold: {slow_threshold_seconds}s)"
+                        "SLOW: %s took %.2fs (threshold: %ss)",
+                        operation, duration, slow_threshold_seconds
                     )
-                elif log_all:
-                    logger.info(f"{operation} took {duration:.2f}s")
+                elif log_all and logger.isEnabledFor(logging.INFO):
+                    logger.info("%s took %.2fs", operation, duration)
             
             return result
         return wrapper
@@ -117,27 +219,41 @@ def get_metrics_summary(operation: Optional[str] = None) -> Dict[str, Any]:
         Dictionary with performance statistics
     """
     if operation:
-        operations = {operation: _metrics_store.get(operation, [])}
+        names = [operation]
     else:
-        operations = dict(_metrics_store)
+        # Rings reopened after a restart are only known by their file name
+        names = list(_metrics_store)
+        covered = set(map(_ring_name, names))
+        names += [name for name in _rings if name not in covered]
     
     summary = {}
     
-    for op_name, metrics in operations.items():
-        if not metrics:
-            continue
+    for op_name in names:
+        ring = _rings.get(_ring_name(op_name))
+        if ring is not None:
+            # Ring files also cover calls from earlier runs
+            records = ring.snapshot()
+            timestamps = records['timestamp_ns']
+            durations = records['duration_ns'] / 1e9
+            successes = records['success'].astype(np.bool_)
+        else:
+            metrics = _metrics_store.get(op_name, ())
+            count = len(metrics)
+            timestamps = np.fromiter((m[0] for m in metrics), dtype=np.int64, count=count)
+            durations = np.fromiter((m[1] for m in metrics), dtype=np.int64, count=count) / 1e9
+            successes = np.fromiter((m[2] for m in metrics), dtype=np.bool_, count=count)
         
-        durations = [m['duration'] for m in metrics]
-        successes = [m['success'] for m in metrics]
+        if len(durations) == 0:
+            continue
         
         summary[op_name] = {
-            'count': len(metrics),
-            'success_rate': sum(successes) / len(successes) * 100,
-            'avg_duration': sum(durations) / len(durations),
-            'min_duration': min(durations),
-            'max_duration': max(durations),
-            'slow_count': sum(1 for d in durations if d > 10),
-            'last_run': metrics[-1]['timestamp'] if metrics else None
+            'count': len(durations),
+            'success_rate': float(successes.mean()) * 100,
+            'avg_duration': float(durations.mean()),
+            'min_duration': float(durations.min()),
+            'max_duration': float(durations.max()),
+            'slow_count': int(np.count_nonzero(durations > 10)),
+            'last_run': datetime.fromtimestamp(int(timestamps[-1]) / 1e9).isoformat()
         }
     
     return summary
@@ -151,9 +267,16 @@ def clear_metrics(operation: Optional[str] = None) -> None:
         operation: Specific operation to clear, or None for all
     """
     if operation:
-        _metrics_store[operation] = []
+        _metrics_store[operation].clear()
+        name = _ring_name(operation)
+        rings = [_rings[name]] if name in _rings else []
     else:
         _metrics_store.clear()
+        rings = list(_rings.values())
+    
+    with _ring_lock:
+        for ring in rings:
+            ring.clear()
 
 
 def log_scaling_recommendations() -> None:
@@ -204,32 +327,37 @@ class MetricsContext:
     
     def __init__(self, operation: str):
         self.operation = operation
-        self.start_time = None
+        self.start_ns = None
         self.metadata = {}
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
+        duration_ns = time.perf_counter_ns() - self.start_ns
         success = exc_type is None
         
-        _metrics_store[self.operation].append({
-            'timestamp': datetime.now().isoformat(),
-            'duration': duration,
-            'success': success,
-            'error': str(exc_val) if exc_val else None,
-            'metadata': self.metadata
-        })
+        _record(
+            self.operation,
+            duration_ns,
+            success,
+            str(exc_val) if exc_val else None,
+            self.metadata
+        )
         
+        duration = duration_ns / 1e9
         if duration > 10:
-            logger.warning(f"SLOW: {self.operation} took {duration:.2f}s")
+            logger.warning("SLOW: %s took %.2fs", self.operation, duration)
         else:
-            logger.info(f"{self.operation} took {duration:.2f}s")
+            logger.info("%s took %.2fs", self.operation, duration)
         
         return False  # Don't suppress exceptions
     
     def add_metadata(self, **kwargs):
         """Add metadata to this operation's metrics."""
-        self.metadata.update(kwargs)
\ No newline at end of file
+        self.metadata.update(kwargs)
+
+
+if os.getenv('METRICS_PATH'):
+    enable_persistent_metrics(os.getenv('METRICS_PATH'))
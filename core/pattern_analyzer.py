@@ -9,198 +9,521 @@ Author: QuantMetrics Development Team
 Version: 1.4
 """
 
-from typing import List, Dict
+import copy
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from itertools import compress, repeat
+from operator import attrgetter
+from threading import Lock
+from typing import List, Dict, NamedTuple, Optional
 from core.quantmetrics_schema import QuantMetricsTrade
+from core._pattern_kernels import timing_tallies, tp_tallies
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 
+# Session windows in UTC hours: [start, end) and display range
+_SESSION_WINDOWS = {
+    'Tokyo': (0, 8, '00:00-08:00 UTC'),
+    'London': (8, 16, '08:00-16:00 UTC'),
+    'NY': (14, 22, '14:00-22:00 UTC'),
+}
+# Verdict tables indexed by [expectancy band][winrate band]. Expectancy
+# bands: <= 0, <= 0.5, > 0.5 R; winrate bands split at the two thresholds
+_EXPECTANCY_BANDS = (0.0, 0.5)
+_SESSION_WINRATE_BANDS = (45, 55)
+_SESSION_VERDICT = (
+    ('AVOID', 'AVOID', 'AVOID'),
+    ('AVOID', 'NEUTRAL', 'NEUTRAL'),
+    ('AVOID', 'NEUTRAL', 'FOCUS'),
+)
+_DIRECTION_WINRATE_BANDS = (45, 50)
+_DIRECTION_EDGE = (
+    ('NONE', 'NONE', 'NONE'),
+    ('NONE', 'WEAK', 'WEAK'),
+    ('NONE', 'WEAK', 'STRONG'),
+)
+
+
+def _grade(expectancy: float, winrate: float, winrate_bands: tuple, table: tuple) -> str:
+    """Look up a verdict by expectancy and winrate band."""
+    return table[bisect_left(_EXPECTANCY_BANDS, expectancy)][bisect_right(winrate_bands, winrate)]
+
+
+def _best_key(breakdown: Dict, min_trades: int = 1, lowest: bool = False):
+    """
+    Key of the breakdown entry with the highest (or lowest) expectancy
+    among those with at least min_trades trades; ties go to the first
+    entry. None if no entry qualifies.
+    """
+    if not breakdown:
+        return None
+    keys = list(breakdown)
+    stats = breakdown.values()
+    expectancy = np.fromiter((s['expectancy'] for s in stats), dtype=np.float64, count=len(keys))
+    counts = np.fromiter((s['total_trades'] for s in stats), dtype=np.int64, count=len(keys))
+    eligible = counts >= min_trades
+    if not eligible.any():
+        return None
+    if lowest:
+        return keys[int(np.argmin(np.where(eligible, expectancy, np.inf)))]
+    return keys[int(np.argmax(np.where(eligible, expectancy, -np.inf)))]
+
+
+# Windows overlap (London/NY), so each hour maps to a bitmask of sessions
+# (bit i = i-th session of _SESSION_WINDOWS)
+_HOUR_SESSION_MASK = np.zeros(24, dtype=np.uint8)
+for _bit, (_start, _end, _) in enumerate(_SESSION_WINDOWS.values()):
+    _HOUR_SESSION_MASK[_start:_end] |= 1 << _bit
+# London/NY overlap hours (14-15 UTC), read straight off the hour tallies
+_OVERLAP_HOURS = slice(_SESSION_WINDOWS['NY'][0], _SESSION_WINDOWS['London'][1])
+
+
+# Result as a small int, so results are compared and counted as int8
+_RESULT_CODE = {'WIN': 1, 'LOSS': -1}
+
+
+def _trade_hour(timestamp, default: int = 12) -> int:
+    """UTC hour of a trade timestamp (datetime, pandas Timestamp or Unix int)."""
+    if hasattr(timestamp, 'hour'):
+        return timestamp.hour
+    if isinstance(timestamp, (int, float)):
+        # Unix timestamp - convert using pandas
+        try:
+            return pd.Timestamp(timestamp, unit='s').hour
+        except (ValueError, TypeError):
+            pass
+    # Try to convert to pandas Timestamp
+    try:
+        return pd.Timestamp(timestamp).hour
+    except Exception:
+        return default  # Default to London session if parsing fails
+
+
+@dataclass(slots=True, frozen=True)
+class TradeArrays:
+    """
+    The trade fields the analyzers aggregate over, one array per field.
+    
+    Built once per trade list (see _get_soa) so the analyses work on masks
+    instead of re-reading attributes from every trade object.
+    """
+    
+    hour: np.ndarray     # int8, UTC hour of timestamp_open
+    profit_r: np.ndarray  # float64
+    result_code: np.ndarray  # int8, _RESULT_CODE of result (1 WIN, -1 LOSS, 0 other)
+    is_win: np.ndarray   # bool, result == 'WIN'
+    is_loss: np.ndarray  # bool, result == 'LOSS'
+    is_long: np.ndarray  # bool, direction == 'LONG'
+    
+    def __len__(self) -> int:
+        return len(self.profit_r)
+
+
+def _trades_fingerprint(trades: List[QuantMetricsTrade]) -> tuple:
+    """
+    Cheap check that a trade list is unchanged, for memoizing analyses.
+    
+    Length plus the first and last trade (object and key fields), so an
+    append, truncation or replaced endpoint gets a new key without hashing
+    every trade. It does not tell lists apart: caches also hold the list
+    and check it is the one passed in.
+    """
+    if not trades:
+        return (0,)
+    first, last = trades[0], trades[-1]
+    return (
+        len(trades), id(first), id(last),
+        first.timestamp_open, last.timestamp_open, last.profit_r, last.result
+    )
+
+
+class TimingTallies(NamedTuple):
+    """Per-hour (length 24) and per-session (_SESSION_WINDOWS order) tallies."""
+    hour_counts: np.ndarray
+    hour_wins: np.ndarray
+    hour_profit: np.ndarray
+    hour_first: np.ndarray  # index of the first trade in each hour, -1 if none
+    session_counts: np.ndarray
+    session_wins: np.ndarray
+    session_losses: np.ndarray
+    session_profit: np.ndarray
+    session_win_profit: np.ndarray
+    session_loss_profit: np.ndarray
+
+
+def _trades_to_soa(trades: List[QuantMetricsTrade]) -> TradeArrays:
+    """
+    Convert trades to TradeArrays.
+    
+    Each field is read with map(attrgetter(...)), so the per-trade loop
+    runs in C rather than as Python bytecode.
+    """
+    n = len(trades)
+    opens = list(map(attrgetter('timestamp_open'), trades))
+    try:
+        hour = np.fromiter(map(attrgetter('hour'), opens), dtype=np.int8, count=n)
+    except AttributeError:
+        # Some timestamps are Unix ints or strings
+        hour = np.fromiter(map(_trade_hour, opens), dtype=np.int8, count=n)
+    profit_r = np.fromiter(map(attrgetter('profit_r'), trades), dtype=np.float64, count=n)
+    result_code = np.fromiter(
+        map(_RESULT_CODE.get, map(attrgetter('result'), trades), repeat(0, n)),
+        dtype=np.int8, count=n
+    )
+    direction = np.array(list(map(attrgetter('direction'), trades)), dtype=object)
+    return TradeArrays(
+        hour=hour,
+        profit_r=profit_r,
+        result_code=result_code,
+        is_win=result_code == 1,
+        is_loss=result_code == -1,
+        is_long=direction == 'LONG'
+    )
+
+
+class _SoaEntry(NamedTuple):
+    """Cached conversion, with the list it was made from."""
+    trades: List[QuantMetricsTrade]  # held, so its id is not reused while cached
+    fingerprint: tuple
+    arrays: TradeArrays
+
+
+# Recent conversions by list id: the analyzers run back to back on the
+# same list, and a dashboard switches between a few lists
+SOA_CACHE_SIZE = 4
+_soa_cache: OrderedDict = OrderedDict()
+_soa_cache_lock = Lock()
+
+
+def _get_soa(trades: List[QuantMetricsTrade]) -> TradeArrays:
+    """
+    TradeArrays for trades, shared between the analyzers.
+    
+    Reuses a cached conversion only for the same list object with an
+    unchanged fingerprint; a copy, or another list with the same
+    endpoints, is converted again (least recently used of SOA_CACHE_SIZE
+    lists dropped first). Every caller gets the same arrays, so they must
+    not be modified.
+    """
+    key = id(trades)
+    fingerprint = _trades_fingerprint(trades)
+    with _soa_cache_lock:
+        entry = _soa_cache.get(key)
+        if entry is not None and entry.trades is trades and entry.fingerprint == fingerprint:
+            _soa_cache.move_to_end(key)
+            return entry.arrays
+    
+    arrays = _trades_to_soa(trades)
+    with _soa_cache_lock:
+        _soa_cache[key] = _SoaEntry(trades, fingerprint, arrays)
+        _soa_cache.move_to_end(key)
+        if len(_soa_cache) > SOA_CACHE_SIZE:
+            _soa_cache.popitem(last=False)
+    return arrays
+
+
+@dataclass(slots=True, frozen=True)
+class HourStats:
+    """Entry of TimingAnalyzer.analyze()['hourly_breakdown'] (rounded, winrate in %)."""
+    
+    total_trades: int
+    wins: int
+    winrate: float
+    expectancy: float
+    
+    def __getitem__(self, key: str):
+        """Read a field by name, as from the dict rows this replaced."""
+        return getattr(self, key)
+
+
+@dataclass(slots=True)
+class SessionPerformance:
+    """Performance of one trading session (winrate as a 0-1 fraction)."""
+    
+    session: str
+    time_range: str
+    total_trades: int
+    wins: int
+    losses: int
+    winrate: float
+    avg_win_r: float
+    avg_loss_r: float
+    expectancy: float
+    total_profit_r: float
+    verdict: str
+    
+    @classmethod
+    def from_tallies(cls, session: str, time_range: str, total: int, wins: int, losses: int,
+                     total_profit_r: float, win_profit_r: float,
+                     loss_profit_r: float) -> 'SessionPerformance':
+        """Build from a session's counts and R sums."""
+        if total == 0:
+            return cls(session, time_range, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 'NO_DATA')
+        winrate = wins / total
+        expectancy = total_profit_r / total
+        return cls(
+            session=session,
+            time_range=time_range,
+            total_trades=total,
+            wins=wins,
+            losses=losses,
+            winrate=winrate,
+            avg_win_r=win_profit_r / wins if wins else 0.0,
+            avg_loss_r=loss_profit_r / losses if losses else 0.0,
+            expectancy=expectancy,
+            total_profit_r=total_profit_r,
+            verdict=_grade(expectancy, (wins / total) * 100, _SESSION_WINRATE_BANDS, _SESSION_VERDICT)
+        )
+    
+    def to_dict(self) -> Dict:
+        """Entry of TimingAnalyzer.analyze()['session_breakdown'] (rounded, winrate in %)."""
+        if self.total_trades == 0:
+            winrate, expectancy = 0.0, 0.0
+        else:
+            winrate = round((self.wins / self.total_trades) * 100, 1)
+            expectancy = round(self.expectancy, 2)
+        return {
+            'total_trades': self.total_trades,
+            'wins': self.wins,
+            'losses': self.losses,
+            'winrate': winrate,
+            'expectancy': expectancy,
+            'verdict': self.verdict,
+            'time_range': self.time_range
+        }
+
+
+@dataclass(slots=True)
+class TimingIntelligence:
+    """Typed view of a timing analysis."""
+    
+    sessions: Dict[str, SessionPerformance]
+    best_session: Optional[str]
+    worst_session: Optional[str]
+    best_hour: Optional[int]
+    overlap_performance: Dict[str, float]  # winrate (0-1) in London/NY overlap hours
+
+
 class TimingAnalyzer:
     """
     Analyze performance by time (session, hour, day)
     Detect when strategy works best
+    
+    The per-hour and per-session tallies are kept on the analyzer, so
+    trades appended to an analyzed list (or passed to add_trade) are
+    folded in without revisiting the earlier ones.
     """
     
-    def analyze(self, trades: List[QuantMetricsTrade]) -> Dict:
+    def __init__(self, trades: Optional[List[QuantMetricsTrade]] = None):
+        """
+        Args:
+            trades: Optional initial trades; analyze() and intelligence()
+                without arguments then report on them
+        """
+        self._reset()
+        # Trade list the tallies were last brought up to date with (held,
+        # so its id is not reused) and its fingerprint at the time
+        self._cached_trades = None
+        self._cached_key = None
+        if trades:
+            self._add_trades(trades)
+    
+    def _reset(self) -> None:
+        """Empty tallies."""
+        n_sessions = len(_SESSION_WINDOWS)
+        self._tallies = TimingTallies(
+            hour_counts=np.zeros(24, dtype=np.int64),
+            hour_wins=np.zeros(24, dtype=np.int64),
+            hour_profit=np.zeros(24, dtype=np.float64),
+            hour_first=np.full(24, -1, dtype=np.int64),
+            session_counts=np.zeros(n_sessions, dtype=np.int64),
+            session_wins=np.zeros(n_sessions, dtype=np.int64),
+            session_losses=np.zeros(n_sessions, dtype=np.int64),
+            session_profit=np.zeros(n_sessions, dtype=np.float64),
+            session_win_profit=np.zeros(n_sessions, dtype=np.float64),
+            session_loss_profit=np.zeros(n_sessions, dtype=np.float64)
+        )
+        self._n_trades = 0
+        self._first_trade = None
+        self._last_trade = None
+        self._cached_result = None
+    
+    def add_trade(self, trade: QuantMetricsTrade) -> None:
+        """Fold one more trade into the tallies (O(1))."""
+        tallies = self._tallies
+        hour = _trade_hour(trade.timestamp_open)
+        win = trade.result == 'WIN'
+        loss = trade.result == 'LOSS'
+        
+        if tallies.hour_first[hour] < 0:
+            tallies.hour_first[hour] = self._n_trades
+        tallies.hour_counts[hour] += 1
+        tallies.hour_wins[hour] += win
+        tallies.hour_profit[hour] += trade.profit_r
+        
+        bits = int(_HOUR_SESSION_MASK[hour])
+        for i in range(len(_SESSION_WINDOWS)):
+            if (bits >> i) & 1:
+                tallies.session_counts[i] += 1
+                tallies.session_wins[i] += win
+                tallies.session_losses[i] += loss
+                tallies.session_profit[i] += trade.profit_r
+                if win:
+                    tallies.session_win_profit[i] += trade.profit_r
+                elif loss:
+                    tallies.session_loss_profit[i] += trade.profit_r
+        
+        if self._first_trade is None:
+            self._first_trade = trade
+        self._last_trade = trade
+        self._n_trades += 1
+        self._cached_key = None
+        self._cached_result = None
+    
+    def _add_trades(self, trades: List[QuantMetricsTrade]) -> None:
+        """Fold a batch of trades into the tallies with one kernel pass."""
+        if not trades:
+            return
+        arrays = _get_soa(trades)
+        batch = TimingTallies(*timing_tallies(
+            arrays.hour, arrays.profit_r, arrays.is_win, arrays.is_loss,
+            _HOUR_SESSION_MASK, len(_SESSION_WINDOWS)
+        ))
+        tallies = self._tallies
+        new_hours = (tallies.hour_first < 0) & (batch.hour_first >= 0)
+        tallies.hour_first[new_hours] = batch.hour_first[new_hours] + self._n_trades
+        for field in ('hour_counts', 'hour_wins', 'hour_profit', 'session_counts',
+                      'session_wins', 'session_losses', 'session_profit',
+                      'session_win_profit', 'session_loss_profit'):
+            getattr(tallies, field)[:] += getattr(batch, field)
+        
+        if self._first_trade is None:
+            self._first_trade = trades[0]
+        self._last_trade = trades[-1]
+        self._n_trades += len(trades)
+        self._cached_result = None
+    
+    def _extends(self, trades: List[QuantMetricsTrade]) -> bool:
+        """True if trades is the tallied list with more trades appended."""
+        n = self._n_trades
+        return (
+            trades is self._cached_trades
+            and 0 < n < len(trades)
+            and trades[0] is self._first_trade
+            and trades[n - 1] is self._last_trade
+        )
+    
+    def analyze(self, trades: Optional[List[QuantMetricsTrade]] = None) -> Dict:
         """
         Analyze timing patterns in trades
         
+        Repeated calls with the same list object, unchanged, reuse the
+        previous analysis; if only new trades were appended to it, just
+        those are tallied.
+        
         Args:
-            trades: List of QuantMetricsTrade objects
+            trades: List of QuantMetricsTrade objects, or None to report
+                the trades added with add_trade
             
         Returns:
             Dict with session_breakdown, hourly_breakdown, best_hour
         """
+        if trades is not None:
+            key = _trades_fingerprint(trades)
+            if trades is not self._cached_trades or key != self._cached_key:
+                if self._extends(trades):
+                    self._add_trades(trades[self._n_trades:])
+                else:
+                    self._reset()
+                    self._add_trades(trades)
+                self._cached_trades = trades
+                self._cached_key = key
+        
+        if self._cached_result is None:
+            session_breakdown = self._analyze_sessions(self._tallies)
+            hourly_breakdown = self._analyze_hours(self._tallies)
+            self._cached_result = {
+                'session_breakdown': session_breakdown,
+                'hourly_breakdown': hourly_breakdown,
+                'best_hour': self._find_best_hour(hourly_breakdown)
+            }
+        return copy.deepcopy(self._cached_result)
+    
+    def intelligence(self, trades: Optional[List[QuantMetricsTrade]] = None) -> TimingIntelligence:
+        """
+        Timing analysis as a TimingIntelligence object
         
-        session_breakdown = self._analyze_sessions(trades)
-        hourly_breakdown = self._analyze_hours(trades)
-        best_hour = self._find_best_hour(hourly_breakdown)
-        
+        Same tallies (and caching) as analyze(); session stats are not
+        rounded and winrates are 0-1 fractions.
+        """
+        results = self.analyze(trades)
+        tallies = self._tallies
+        overlap_trades = int(tallies.hour_counts[_OVERLAP_HOURS].sum())
+        overlap_wins = int(tallies.hour_wins[_OVERLAP_HOURS].sum())
+        return TimingIntelligence(
+            sessions=self._session_performance(tallies),
+            best_session=_best_key(results['session_breakdown']),
+            worst_session=_best_key(results['session_breakdown'], lowest=True),
+            best_hour=results['best_hour']['hour'],
+            overlap_performance={
+                'London-NY': overlap_wins / overlap_trades if overlap_trades else 0.0
+            }
+        )
+    
+    @staticmethod
+    def _session_performance(tallies: TimingTallies) -> Dict[str, SessionPerformance]:
+        """SessionPerformance per session from the tallies"""
         return {
-            'session_breakdown': session_breakdown,
-            'hourly_breakdown': hourly_breakdown,
-            'best_hour': best_hour
+            session_name: SessionPerformance.from_tallies(
+                session_name, time_range,
+                int(tallies.session_counts[i]), int(tallies.session_wins[i]),
+                int(tallies.session_losses[i]), float(tallies.session_profit[i]),
+                float(tallies.session_win_profit[i]), float(tallies.session_loss_profit[i])
+            )
+            for i, (session_name, (_, _, time_range)) in enumerate(_SESSION_WINDOWS.items())
         }
     
-    def _analyze_sessions(self, trades: List[QuantMetricsTrade]) -> Dict:
+    def _analyze_sessions(self, tallies: TimingTallies) -> Dict:
         """Analyze performance by trading session"""
-        
-        sessions = {
-            'Tokyo': {'trades': [], 'range': '00:00-08:00 UTC'},
-            'London': {'trades': [], 'range': '08:00-16:00 UTC'},
-            'NY': {'trades': [], 'range': '14:00-22:00 UTC'}
+        return {
+            session_name: perf.to_dict()
+            for session_name, perf in self._session_performance(tallies).items()
         }
-        
-        # Group trades by session
-        for trade in trades:
-            # Handle different timestamp types (datetime, pandas Timestamp, or int)
-            timestamp = trade.timestamp_open
-            if hasattr(timestamp, 'hour'):
-                hour = timestamp.hour
-            elif isinstance(timestamp, (int, float)):
-                # Unix timestamp - convert using pandas
-                try:
-                    ts = pd.Timestamp(timestamp, unit='s')
-                    hour = ts.hour
-                except (ValueError, TypeError):
-                    try:
-                        ts = pd.Timestamp(timestamp)
-                        hour = ts.hour
-                    except Exception:
-                        hour = 12  # Default to London session if parsing fails
-            else:
-                # Try to convert to pandas Timestamp
-                try:
-                    ts = pd.Timestamp(timestamp)
-                    hour = ts.hour
-                except Exception:
-                    hour = 12  # Default to London session if parsing fails
-            
-            if 0 <= hour < 8:
-                sessions['Tokyo']['trades'].append(trade)
-            if 8 <= hour < 16:
-                sessions['London']['trades'].append(trade)
-            if 14 <= hour < 22:
-                sessions['NY']['trades'].append(trade)
-        
-        # Calculate metrics per session
-        results = {}
-        for session_name, data in sessions.items():
-            session_trades = data['trades']
-            
-            if not session_trades:
-                results[session_name] = {
-                    'total_trades': 0,
-                    'wins': 0,
-                    'losses': 0,
-                    'winrate': 0.0,
-                    'expectancy': 0.0,
-                    'verdict': 'NO_DATA',
-                    'time_range': data['range']
-                }
-                continue
-            
-            wins = len([t for t in session_trades if t.result == 'WIN'])
-            losses = len([t for t in session_trades if t.result == 'LOSS'])
-            winrate = (wins / len(session_trades)) * 100
-            
-            total_profit_r = sum(t.profit_r for t in session_trades)
-            expectancy = total_profit_r / len(session_trades)
-            
-            # Determine verdict
-            if expectancy > 0.5 and winrate >= 55:
-                verdict = 'FOCUS'
-            elif expectancy > 0 and winrate >= 45:
-                verdict = 'NEUTRAL'
-            else:
-                verdict = 'AVOID'
-            
-            results[session_name] = {
-                'total_trades': len(session_trades),
-                'wins': wins,
-                'losses': losses,
-                'winrate': round(winrate, 1),
-                'expectancy': round(expectancy, 2),
-                'verdict': verdict,
-                'time_range': data['range']
-            }
-        
-        return results
     
-    def _analyze_hours(self, trades: List[QuantMetricsTrade]) -> Dict:
+    def _analyze_hours(self, tallies: TimingTallies) -> Dict[int, HourStats]:
         """Analyze performance by hour of day"""
         
-        hourly_stats = {}
-        
-        for trade in trades:
-            # Handle different timestamp types (datetime, pandas Timestamp, or int)
-            timestamp = trade.timestamp_open
-            if hasattr(timestamp, 'hour'):
-                hour = timestamp.hour
-            elif isinstance(timestamp, (int, float)):
-                # Unix timestamp - convert using pandas
-                try:
-                    ts = pd.Timestamp(timestamp, unit='s')
-                    hour = ts.hour
-                except (ValueError, TypeError):
-                    try:
-                        ts = pd.Timestamp(timestamp)
-                        hour = ts.hour
-                    except Exception:
-                        hour = 12  # Default to noon if parsing fails
-            else:
-                # Try to convert to pandas Timestamp
-                try:
-                    ts = pd.Timestamp(timestamp)
-                    hour = ts.hour
-                except Exception:
-                    hour = 12  # Default to noon if parsing fails
-            
-            if hour not in hourly_stats:
-                hourly_stats[hour] = []
-            
-            hourly_stats[hour].append(trade)
-        
-        # Calculate metrics per hour
+        # Hours in order of first appearance
+        seen = np.flatnonzero(tallies.hour_first >= 0)
         results = {}
-        for hour, hour_trades in hourly_stats.items():
-            wins = len([t for t in hour_trades if t.result == 'WIN'])
-            winrate = (wins / len(hour_trades)) * 100
-            
-            total_profit_r = sum(t.profit_r for t in hour_trades)
-            expectancy = total_profit_r / len(hour_trades)
-            
-            results[hour] = {
-                'total_trades': len(hour_trades),
-                'wins': wins,
-                'winrate': round(winrate, 1),
-                'expectancy': round(expectancy, 2)
-            }
+        for hour in seen[np.argsort(tallies.hour_first[seen])].tolist():
+            total = int(tallies.hour_counts[hour])
+            wins = int(tallies.hour_wins[hour])
+            results[hour] = HourStats(
+                total_trades=total,
+                wins=wins,
+                winrate=round((wins / total) * 100, 1),
+                expectancy=round(float(tallies.hour_profit[hour]) / total, 2)
+            )
         
         return results
     
-    def _find_best_hour(self, hourly_breakdown: Dict) -> Dict:
+    def _find_best_hour(self, hourly_breakdown: Dict[int, HourStats]) -> Dict:
         """Find hour with best performance"""
         
-        if not hourly_breakdown:
-            return {'hour': None, 'winrate': 0.0, 'expectancy': 0.0}
-        
-        best_hour = None
-        best_expectancy = -999
-        
-        for hour, stats in hourly_breakdown.items():
-            if stats['expectancy'] > best_expectancy and stats['total_trades'] >= 2:
-                best_expectancy = stats['expectancy']
-                best_hour = hour
-        
+        best_hour = _best_key(hourly_breakdown, min_trades=2)
         if best_hour is None:
             return {'hour': None, 'winrate': 0.0, 'expectancy': 0.0}
         
+        stats = hourly_breakdown[best_hour]
         return {
             'hour': best_hour,
-            'winrate': hourly_breakdown[best_hour]['winrate'],
-            'expectancy': hourly_breakdown[best_hour]['expectancy'],
-            'total_trades': hourly_breakdown[best_hour]['total_trades']
+            'winrate': stats.winrate,
+            'expectancy': stats.expectancy,
+            'total_trades': stats.total_trades
         }
 
 
@@ -210,10 +533,20 @@ class DirectionalAnalyzer:
     Detect directional bias and edge
     """
     
+    def __init__(self):
+        # Last analysis, returned again while the same trade list (held, so
+        # its id is not reused) is unchanged
+        self._cached_trades = None
+        self._cached_key = None
+        self._cached_result = None
+    
     def analyze(self, trades: List[QuantMetricsTrade]) -> Dict:
         """
         Compare LONG vs SHORT performance
         
+        Repeated calls with the same list object, unchanged, reuse the
+        previous analysis.
+        
         Returns:
             {
                 'long_stats': {...},
@@ -223,14 +556,27 @@ class DirectionalAnalyzer:
                 'expected_improvement': float
             }
         """
+        key = _trades_fingerprint(trades)
+        if trades is not self._cached_trades or key != self._cached_key:
+            self._cached_result = self._analyze(trades)
+            self._cached_trades = trades
+            self._cached_key = key
+        return copy.deepcopy(self._cached_result)
+    
+    def _analyze(self, trades: List[QuantMetricsTrade]) -> Dict:
+        """Uncached directional analysis"""
+        arrays = _get_soa(trades)
         
-        # Separate by direction
-        longs = [t for t in trades if t.direction == 'LONG']
-        shorts = [t for t in trades if t.direction == 'SHORT']
+        # (direction, outcome) contingency table in one bincount: rows
+        # SHORT/LONG, columns WIN/LOSS/other (TIMEOUT)
+        outcome = np.where(arrays.is_win, 0, np.where(arrays.is_loss, 1, 2))
+        cell = arrays.is_long * 3 + outcome
+        counts = np.bincount(cell, minlength=6).reshape(2, 3)
+        profit = np.bincount(cell, weights=arrays.profit_r, minlength=6).reshape(2, 3)
         
         # Calculate metrics for each
-        long_stats = self._calculate_direction_metrics(longs, 'LONG')
-        short_stats = self._calculate_direction_metrics(shorts, 'SHORT')
+        long_stats = self._calculate_direction_metrics(counts[1], profit[1], 'LONG')
+        short_stats = self._calculate_direction_metrics(counts[0], profit[0], 'SHORT')
         
         # Determine bias
         bias = self._determine_bias(long_stats, short_stats)
@@ -239,9 +585,7 @@ class DirectionalAnalyzer:
         recommendation = self._generate_recommendation(long_stats, short_stats, bias)
         
         # Calculate expected improvement
-        expected_improvement = self._calculate_improvement(
-            trades, longs, shorts, bias
-        )
+        expected_improvement = self._calculate_improvement(long_stats, short_stats, bias)
         
         return {
             'long_stats': long_stats,
@@ -251,9 +595,17 @@ class DirectionalAnalyzer:
             'expected_improvement': expected_improvement
         }
     
-    def _calculate_direction_metrics(self, trades: List[QuantMetricsTrade], direction: str) -> Dict:
-        """Calculate metrics for one direction"""
-        if not trades:
+    def _calculate_direction_metrics(self, counts: np.ndarray, profit: np.ndarray,
+                                     direction: str) -> Dict:
+        """
+        Calculate metrics for one direction
+        
+        Args:
+            counts, profit: The direction's row of the contingency table
+                (trade count and R sum for WIN, LOSS, other)
+        """
+        total = int(counts.sum())
+        if total == 0:
             return {
                 'direction': direction,
                 'total_trades': 0,
@@ -267,30 +619,25 @@ class DirectionalAnalyzer:
                 'edge': 'NONE'
             }
         
-        wins = [t for t in trades if t.result == 'WIN']
-        losses = [t for t in trades if t.result == 'LOSS']
+        wins = int(counts[0])
+        losses = int(counts[1])
         
-        winrate = (len(wins) / len(trades)) * 100 if trades else 0
+        winrate = (wins / total) * 100
         
-        total_profit_r = sum(t.profit_r for t in trades)
-        expectancy = total_profit_r / len(trades) if trades else 0
+        total_profit_r = float(profit.sum())
+        expectancy = total_profit_r / total
         
-        avg_win = sum(t.profit_r for t in wins) / len(wins) if wins else 0
-        avg_loss = sum(t.profit_r for t in losses) / len(losses) if losses else 0
+        avg_win = float(profit[0]) / wins if wins else 0
+        avg_loss = float(profit[1]) / losses if losses else 0
         
         # Determine edge strength
-        if expectancy > 0.5 and winrate >= 50:
-            edge = 'STRONG'
-        elif expectancy > 0 and winrate >= 45:
-            edge = 'WEAK'
-        else:
-            edge = 'NONE'
+        edge = _grade(expectancy, winrate, _DIRECTION_WINRATE_BANDS, _DIRECTION_EDGE)
         
         return {
             'direction': direction,
-            'total_trades': len(trades),
-            'wins': len(wins),
-            'losses': len(losses),
+            'total_trades': total,
+            'wins': wins,
+            'losses': losses,
             'winrate': round(winrate, 1),
             'expectancy': round(expectancy, 2),
             'total_profit_r': round(total_profit_r, 2),
@@ -338,26 +685,20 @@ class DirectionalAnalyzer:
                    f"Both LONG ({long_stats['expectancy']}R) and "
                    f"SHORT ({short_stats['expectancy']}R) show similar edge.")
     
-    def _calculate_improvement(self, all_trades: List[QuantMetricsTrade], 
-                               longs: List[QuantMetricsTrade], 
-                               shorts: List[QuantMetricsTrade],
-                               bias: str) -> float:
-        """Calculate expected WR improvement if following bias"""
+    def _calculate_improvement(self, long_stats: Dict, short_stats: Dict, bias: str) -> float:
+        """Calculate expected WR improvement if following bias (from the per-direction counts)"""
         
-        if bias == 'NEUTRAL' or not all_trades:
+        total = long_stats['total_trades'] + short_stats['total_trades']
+        if bias == 'NEUTRAL' or not total:
             return 0.0
         
         # Current WR
-        current_wins = len([t for t in all_trades if t.result == 'WIN'])
-        current_wr = (current_wins / len(all_trades)) * 100
+        current_wr = ((long_stats['wins'] + short_stats['wins']) / total) * 100
         
         # WR if following bias
-        if bias == 'LONG':
-            focused_wins = len([t for t in longs if t.result == 'WIN'])
-            focused_wr = (focused_wins / len(longs)) * 100 if longs else 0
-        else:
-            focused_wins = len([t for t in shorts if t.result == 'WIN'])
-            focused_wr = (focused_wins / len(shorts)) * 100 if shorts else 0
+        focused = long_stats if bias == 'LONG' else short_stats
+        n_focused = focused['total_trades']
+        focused_wr = (focused['wins'] / n_focused) * 100 if n_focused else 0
         
         improvement = focused_wr - current_wr
         return round(improvement, 1)
@@ -369,10 +710,20 @@ class ExecutionAnalyzer:
     Detect discipline issues and exit timing problems
     """
     
+    def __init__(self):
+        # Last analysis, returned again while the same trade list (held, so
+        # its id is not reused) is unchanged
+        self._cached_trades = None
+        self._cached_key = None
+        self._cached_result = None
+    
     def analyze(self, trades: List[QuantMetricsTrade]) -> Dict:
         """
         Analyze execution quality
         
+        Repeated calls with the same list object, unchanged, reuse the
+        previous analysis.
+        
         Returns:
             {
                 'tp_behavior': {...},
@@ -383,7 +734,15 @@ class ExecutionAnalyzer:
                 'recommendations': List[str]
             }
         """
-        
+        key = _trades_fingerprint(trades)
+        if trades is not self._cached_trades or key != self._cached_key:
+            self._cached_result = self._analyze(trades)
+            self._cached_trades = trades
+            self._cached_key = key
+        return copy.deepcopy(self._cached_result)
+    
+    def _analyze(self, trades: List[QuantMetricsTrade]) -> Dict:
+        """Uncached execution analysis"""
         tp_behavior = self._analyze_tp_behavior(trades)
         sl_behavior = self._analyze_sl_behavior(trades)
         duration_analysis = self._analyze_duration(trades)
@@ -413,9 +772,10 @@ class ExecutionAnalyzer:
     def _analyze_tp_behavior(self, trades: List[QuantMetricsTrade]) -> Dict:
         """Analyze take profit behavior"""
         
-        winning_trades = [t for t in trades if t.result == 'WIN']
+        arrays = _get_soa(trades)
+        n_wins = int(arrays.is_win.sum())
         
-        if not winning_trades:
+        if not n_wins:
             return {
                 'total_wins': 0,
                 'full_tp_hits': 0,
@@ -424,56 +784,33 @@ class ExecutionAnalyzer:
                 'estimated_missed_profit': 0.0
             }
         
-        # Detect full TP vs early exits
-        full_tp_hits = []
-        early_exits = []
-        
-        for trade in winning_trades:
-            # Calculate theoretical max R (if hit TP)
-            if trade.direction == 'LONG':
-                risk = trade.entry_price - trade.sl
-                reward = trade.tp - trade.entry_price
-            else:
-                risk = trade.sl - trade.entry_price
-                reward = trade.entry_price - trade.tp
-            
-            theoretical_r = reward / risk if risk > 0 else 0
-            
-            # If achieved R is close to theoretical, it's a full TP
-            if abs(trade.profit_r - theoretical_r) < 0.2:
-                full_tp_hits.append(trade)
-            else:
-                early_exits.append(trade)
-        
-        # Estimate missed profit from early exits
-        missed_profit = 0.0
-        for trade in early_exits:
-            # Calculate how much more could have been made
-            if trade.direction == 'LONG':
-                risk = trade.entry_price - trade.sl
-                reward = trade.tp - trade.entry_price
-            else:
-                risk = trade.sl - trade.entry_price
-                reward = trade.entry_price - trade.tp
-            
-            theoretical_r = reward / risk if risk > 0 else 0
-            missed_r = theoretical_r - trade.profit_r
-            missed_profit += missed_r
+        # Full TP vs early exit per winner, and the R the early exits left
+        # on the table, in one compiled pass over the winners' prices
+        winning_trades = list(compress(trades, arrays.is_win))
+        full_tp_hits, missed_profit = tp_tallies(
+            arrays.is_long[arrays.is_win],
+            np.fromiter(map(attrgetter('entry_price'), winning_trades), dtype=np.float64, count=n_wins),
+            np.fromiter(map(attrgetter('sl'), winning_trades), dtype=np.float64, count=n_wins),
+            np.fromiter(map(attrgetter('tp'), winning_trades), dtype=np.float64, count=n_wins),
+            arrays.profit_r[arrays.is_win]
+        )
         
         return {
-            'total_wins': len(winning_trades),
-            'full_tp_hits': len(full_tp_hits),
-            'early_exits': len(early_exits),
-            'full_tp_pct': round((len(full_tp_hits) / len(winning_trades)) * 100, 1),
+            'total_wins': n_wins,
+            'full_tp_hits': full_tp_hits,
+            'early_exits': n_wins - full_tp_hits,
+            'full_tp_pct': round((full_tp_hits / n_wins) * 100, 1),
             'estimated_missed_profit': round(missed_profit, 2)
         }
     
     def _analyze_sl_behavior(self, trades: List[QuantMetricsTrade]) -> Dict:
         """Analyze stop loss behavior"""
         
-        losing_trades = [t for t in trades if t.result == 'LOSS']
+        arrays = _get_soa(trades)
+        loss_r = arrays.profit_r[arrays.is_loss]
+        n_losses = len(loss_r)
         
-        if not losing_trades:
+        if not n_losses:
             return {
                 'total_losses': 0,
                 'proper_sl_hits': 0,
@@ -482,56 +819,44 @@ class ExecutionAnalyzer:
                 'extra_loss_cost': 0.0
             }
         
-        # Detect proper SL vs held past SL
-        proper_sl = []
-        held_past_sl = []
+        # Expected loss = -1R (if SL respected); beyond -1.2R the stop was
+        # likely held past
+        proper_sl = loss_r >= -1.2
+        held_past_sl = ~proper_sl
+        n_proper = int(proper_sl.sum())
         
-        for trade in losing_trades:
-            # Expected loss = -1R (if SL respected)
-            # If loss > -1.5R, likely held past SL
-            if trade.profit_r >= -1.2:
-                proper_sl.append(trade)
-            else:
-                held_past_sl.append(trade)
-        
-        # Calculate extra cost from holding past SL
-        extra_cost = 0.0
-        for trade in held_past_sl:
-            # Extra loss = actual loss - expected (-1R)
-            extra_loss = abs(trade.profit_r) - 1.0
-            extra_cost += extra_loss
+        # Extra cost from holding past SL: actual loss - expected (-1R)
+        extra_cost = float((np.abs(loss_r[held_past_sl]) - 1.0).sum())
         
         return {
-            'total_losses': len(losing_trades),
-            'proper_sl_hits': len(proper_sl),
-            'held_past_sl': len(held_past_sl),
-            'proper_sl_pct': round((len(proper_sl) / len(losing_trades)) * 100, 1),
+            'total_losses': n_losses,
+            'proper_sl_hits': n_proper,
+            'held_past_sl': n_losses - n_proper,
+            'proper_sl_pct': round((n_proper / n_losses) * 100, 1),
             'extra_loss_cost': round(extra_cost, 2)
         }
     
     def _analyze_duration(self, trades: List[QuantMetricsTrade]) -> Dict:
         """Analyze trade duration patterns"""
         
-        duration_groups = {
-            'quick': [],      # < 1 hour
-            'medium': [],     # 1-4 hours
-            'long': []        # > 4 hours
-        }
+        arrays = _get_soa(trades)
+        opens = pd.DatetimeIndex(list(map(attrgetter('timestamp_open'), trades)))
+        closes = pd.DatetimeIndex(list(map(attrgetter('timestamp_close'), trades)))
+        duration = (closes - opens).total_seconds().to_numpy() / 3600
         
-        for trade in trades:
-            duration = (trade.timestamp_close - trade.timestamp_open).total_seconds() / 3600
-            
-            if duration < 1:
-                duration_groups['quick'].append(trade)
-            elif duration <= 4:
-                duration_groups['medium'].append(trade)
-            else:
-                duration_groups['long'].append(trade)
+        # Group per trade: 0 quick (< 1 hour), 1 medium (1-4 hours),
+        # 2 long (> 4 hours or unknown)
+        group = 2 - (duration <= 4) - (duration < 1)
+        totals = np.bincount(group, minlength=3).tolist()
+        win_counts = np.bincount(group, weights=arrays.is_win, minlength=3).astype(np.int64).tolist()
+        profit_sums = np.bincount(group, weights=arrays.profit_r, minlength=3).tolist()
         
         # Calculate metrics per group
         results = {}
-        for group_name, group_trades in duration_groups.items():
-            if not group_trades:
+        for group_name, total, wins, total_profit_r in zip(
+            ('quick', 'medium', 'long'), totals, win_counts, profit_sums
+        ):
+            if not total:
                 results[group_name] = {
                     'total_trades': 0,
                     'wins': 0,
@@ -540,24 +865,22 @@ class ExecutionAnalyzer:
                 }
                 continue
             
-            wins = len([t for t in group_trades if t.result == 'WIN'])
-            winrate = (wins / len(group_trades)) * 100
-            expectancy = sum(t.profit_r for t in group_trades) / len(group_trades)
+            winrate = (wins / total) * 100
+            expectancy = total_profit_r / total
             
             results[group_name] = {
-                'total_trades': len(group_trades),
+                'total_trades': total,
                 'wins': wins,
                 'winrate': round(winrate, 1),
                 'expectancy': round(expectancy, 2)
             }
         
         # Determine optimal duration
-        best_group = max(results.items(), 
-                        key=lambda x: x[1]['expectancy'] if x[1]['total_trades'] > 0 else -999)
+        best_group = _best_key(results) or 'quick'
         
         return {
             'breakdown': results,
-            'optimal_duration': best_group[0]
+            'optimal_duration': best_group
         }
     
     def _calculate_execution_score(self, tp_behavior: Dict, sl_behavior: Dict, 
@@ -667,7 +990,8 @@ class LossForensics:
             }
         """
         
-        losses = [t for t in trades if t.result == 'LOSS']
+        # Selected with the shared is_loss mask (no string compare per trade)
+        losses = list(compress(trades, _get_soa(trades).is_loss))
         
         if not losses:
             return {
@@ -706,52 +1030,42 @@ class LossForensics:
     def _categorize_losses(self, losses: List[QuantMetricsTrade]) -> Dict:
         """Categorize losses by type"""
         
-        proper_losses = []      # Expected losses (SL hit correctly)
-        early_exits = []        # Exited before SL (panic)
-        held_past_sl = []       # Held past SL (hope)
-        
-        for trade in losses:
-            # Expected loss = -1R
-            if -1.2 <= trade.profit_r <= -0.8:
-                proper_losses.append(trade)
-            elif trade.profit_r > -0.8:
-                # Less than -1R = early exit (panic)
-                early_exits.append(trade)
-            else:
-                # More than -1R = held past SL
-                held_past_sl.append(trade)
+        loss_r = np.fromiter(map(attrgetter('profit_r'), losses), dtype=np.float64, count=len(losses))
         
-        # Calculate costs
-        proper_cost = sum(abs(t.profit_r) for t in proper_losses)
-        early_cost = sum(abs(t.profit_r) for t in early_exits)
-        held_cost = sum(abs(t.profit_r) for t in held_past_sl)
+        # Expected loss = -1R; less than that = early exit (panic),
+        # more = held past SL (hope)
+        proper = (loss_r >= -1.2) & (loss_r <= -0.8)
+        early = loss_r > -0.8
+        held = ~(proper | early)
+        n_proper, n_early, n_held = int(proper.sum()), int(early.sum()), int(held.sum())
         
-        # Calculate what SHOULD have been if rules followed
-        early_should_have = len(early_exits) * 1.0  # Should be -1R each
-        early_actual = sum(abs(t.profit_r) for t in early_exits)
-        early_difference = early_actual - early_should_have
+        # Calculate costs
+        cost_r = np.abs(loss_r)
+        proper_cost = float(cost_r[proper].sum())
+        early_cost = float(cost_r[early].sum())
+        held_cost = float(cost_r[held].sum())
         
-        held_should_have = len(held_past_sl) * 1.0
-        held_actual = sum(abs(t.profit_r) for t in held_past_sl)
-        held_extra_cost = held_actual - held_should_have
+        # Calculate what SHOULD have been if rules followed (-1R each)
+        early_difference = early_cost - n_early * 1.0
+        held_extra_cost = held_cost - n_held * 1.0
         
         return {
             'proper': {
-                'count': len(proper_losses),
-                'avg_loss': round(proper_cost / len(proper_losses), 2) if proper_losses else 0,
+                'count': n_proper,
+                'avg_loss': round(proper_cost / n_proper, 2) if n_proper else 0,
                 'total_cost': round(proper_cost, 2),
                 'verdict': 'EXPECTED'
             },
             'early_exits': {
-                'count': len(early_exits),
-                'avg_loss': round(early_cost / len(early_exits), 2) if early_exits else 0,
+                'count': n_early,
+                'avg_loss': round(early_cost / n_early, 2) if n_early else 0,
                 'total_cost': round(early_cost, 2),
                 'extra_cost': round(early_difference, 2),
                 'verdict': 'PANIC'
             },
             'held_past_sl': {
-                'count': len(held_past_sl),
-                'avg_loss': round(held_cost / len(held_past_sl), 2) if held_past_sl else 0,
+                'count': n_held,
+                'avg_loss': round(held_cost / n_held, 2) if n_held else 0,
                 'total_cost': round(held_cost, 2),
                 'extra_cost': round(held_extra_cost, 2),
                 'verdict': 'HOPE'
@@ -768,77 +1082,36 @@ class LossForensics:
             'other': 0
         }
         
+        # Direction and hour partition of the shared trade arrays, counted
+        # once rather than re-filtered for every loss
+        arrays = _get_soa(all_trades)
+        loss_is_long = arrays.is_long[arrays.is_loss]
+        loss_hour = arrays.hour[arrays.is_loss]
+        direction_losses = np.bincount(loss_is_long, minlength=2).tolist()  # [SHORT, LONG]
+        direction_wins = np.bincount(arrays.is_long[arrays.is_win], minlength=2).tolist()
+        hour_losses = np.bincount(loss_hour, minlength=24).tolist()
+        session_losses = session_wins = None
+        
         # Analyze each loss
-        for loss in losses:
+        for loss, is_long, hour in zip(losses, loss_is_long.tolist(), loss_hour.tolist()):
             # Check if direction was the problem
-            direction_losses = [t for t in losses if t.direction == loss.direction]
-            direction_wins = [t for t in all_trades 
-                            if t.direction == loss.direction and t.result == 'WIN']
-            
-            if len(direction_losses) > len(direction_wins):
+            if direction_losses[is_long] > direction_wins[is_long]:
                 causes['wrong_direction'] += 1
                 continue
             
             # Check if session was the problem (if trades have session data)
-            if hasattr(loss, 'session') and loss.session:
-                session_losses = [t for t in losses if hasattr(t, 'session') and t.session == loss.session]
-                session_wins = [t for t in all_trades 
-                              if hasattr(t, 'session') and t.session == loss.session and t.result == 'WIN']
-                
-                if len(session_losses) > len(session_wins) * 1.5:
+            session = getattr(loss, 'session', None)
+            if session:
+                if session_losses is None:
+                    session_losses = Counter(getattr(t, 'session', None) for t in losses)
+                    session_wins = Counter(getattr(t, 'session', None) for t in all_trades
+                                           if t.result == 'WIN')
+                if session_losses[session] > session_wins[session] * 1.5:
                     causes['wrong_session'] += 1
                     continue
             
-            # Check if timing within session
-            # Handle different timestamp types
-            timestamp = loss.timestamp_open
-            if hasattr(timestamp, 'hour'):
-                hour = timestamp.hour
-            elif isinstance(timestamp, (int, float)):
-                try:
-                    ts = pd.Timestamp(timestamp, unit='s')
-                    hour = ts.hour
-                except (ValueError, TypeError):
-                    try:
-                        ts = pd.Timestamp(timestamp)
-                        hour = ts.hour
-                    except Exception:
-                        hour = 12
-            else:
-                try:
-                    ts = pd.Timestamp(timestamp)
-                    hour = ts.hour
-                except Exception:
-                    hour = 12
-            
-            # Filter losses by same hour
-            hour_losses = []
-            for t in losses:
-                t_timestamp = t.timestamp_open
-                t_hour = None
-                if hasattr(t_timestamp, 'hour'):
-                    t_hour = t_timestamp.hour
-                elif isinstance(t_timestamp, (int, float)):
-                    try:
-                        t_ts = pd.Timestamp(t_timestamp, unit='s')
-                        t_hour = t_ts.hour
-                    except (ValueError, TypeError):
-                        try:
-                            t_ts = pd.Timestamp(t_timestamp)
-                            t_hour = t_ts.hour
-                        except Exception:
-                            continue
-                else:
-                    try:
-                        t_ts = pd.Timestamp(t_timestamp)
-                        t_hour = t_ts.hour
-                    except Exception:
-                        continue
-                
-                if t_hour == hour:
-                    hour_losses.append(t)
-            
-            if len(hour_losses) >= 2:
+            # Check if timing within session (other losses in the same hour)
+            if hour_losses[hour] >= 2:
                 causes['poor_timing'] += 1
                 continue
             
@@ -899,12 +1172,17 @@ class LossForensics:
                 'verdict': 'NONE'
             }
         
-        wins = len([t for t in emotional_trades if t['result'] == 'WIN'])
-        losses = len([t for t in emotional_trades if t['result'] == 'LOSS'])
+        wins = 0
+        losses = 0
+        cost = 0
+        for t in emotional_trades:
+            if t['result'] == 'WIN':
+                wins += 1
+            elif t['result'] == 'LOSS':
+                losses += 1
+                cost += abs(t['trade'].profit_r)
         winrate = (wins / len(emotional_trades)) * 100
         
-        cost = sum(abs(t['trade'].profit_r) for t in emotional_trades if t['result'] == 'LOSS')
-        
         return {
             'count': len(emotional_trades),
             'win_count': wins,
@@ -1046,18 +1324,13 @@ class InsightGenerator:
         sessions = timing_results.get('session_breakdown', {})
         
         # Find session with worst performance
-        worst_session = None
-        worst_expectancy = 999
-        
-        for session_name, stats in sessions.items():
-            if stats['total_trades'] > 0 and stats['expectancy'] < worst_expectancy:
-                worst_expectancy = stats['expectancy']
-                worst_session = session_name
+        worst_session = _best_key(sessions, lowest=True)
         
         # Check if there's a significant session difference
         if worst_session:
-            best_session = max(sessions.items(), 
-                             key=lambda x: x[1]['expectancy'] if x[1]['total_trades'] > 0 else -999)
+            worst_expectancy = sessions[worst_session]['expectancy']
+            best_name = _best_key(sessions)
+            best_session = (best_name, sessions[best_name])
             
             if best_session[1]['expectancy'] - worst_expectancy > 0.5:
                 findings.append({
@@ -1342,8 +1615,9 @@ class InsightGenerator:
     def _generate_statistical_summary(self, findings: List[Dict], basic_metrics: Dict) -> Dict:
         """Generate statistical summary of all findings"""
         
-        critical_count = len([f for f in findings if f['priority'] == 'CRITICAL'])
-        notable_count = len([f for f in findings if f['priority'] == 'NOTABLE'])
+        priorities = Counter(f['priority'] for f in findings)
+        critical_count = priorities['CRITICAL']
+        notable_count = priorities['NOTABLE']
         
         return {
             'total_findings': len(findings),
@@ -4,14 +4,25 @@ EdgeLab Data Models
 Modern data structures for trading analysis platform.
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Literal, Optional
+from itertools import starmap
+from operator import attrgetter
+from typing import List, Literal, Optional
 
+import numpy as np
+import pandas as pd
 
-@dataclass
+
+@dataclass(slots=True, eq=False)
 class QuantMetricsTrade:
-    """Single trade record - universal format."""
+    """
+    Single trade record - universal format.
+    
+    Slotted (no per-instance __dict__) since backtests create one per trade;
+    trades compare by identity.
+    """
     
     timestamp_open: datetime
     timestamp_close: datetime
@@ -26,7 +37,140 @@ class QuantMetricsTrade:
     result: Literal['WIN', 'LOSS', 'TIMEOUT']
 
 
-@dataclass
+def _to_datetime64(column: pd.Series) -> np.ndarray:
+    """
+    Parse a timestamp column to datetime64[ns].
+    
+    Tries the ISO 8601 fast path (with the unique-value cache) first and
+    falls back to format inference for other layouts.
+    """
+    try:
+        parsed = pd.to_datetime(column, format='ISO8601', cache=True)
+    except (ValueError, TypeError):
+        parsed = pd.to_datetime(column, cache=True)
+    return parsed.to_numpy(dtype='datetime64[ns]')
+
+
+# Fixed category order, so Categorical codes are stable (direction 0 = LONG)
+DIRECTIONS = ('LONG', 'SHORT')
+RESULTS = ('WIN', 'LOSS', 'TIMEOUT')
+
+
+def _to_categorical(column, categories: tuple = ()) -> pd.Categorical:
+    """
+    Categorical with `categories` first; unexpected values are appended
+    as extra categories rather than dropped to NaN.
+    """
+    values = np.asarray(column, dtype=object)
+    extra = sorted(set(pd.unique(values[pd.notna(values)])) - set(categories))
+    return pd.Categorical(values, categories=[*categories, *extra])
+
+
+def _interned_values(values: pd.Categorical) -> list:
+    """
+    Per-row values of a Categorical as a list, with every string interned.
+    
+    Each row shares one str object per category, so comparisons such as
+    trade.result == 'WIN' against the (interned) literal hit the identity
+    shortcut instead of comparing characters. Missing values stay NaN.
+    """
+    lut = np.array(
+        [*(sys.intern(c) if isinstance(c, str) else c for c in values.categories), np.nan],
+        dtype=object
+    )
+    return lut[values.codes].tolist()  # code -1 (missing) -> trailing NaN
+
+
+@dataclass(slots=True)
+class TradeBatch:
+    """
+    Columnar set of trades - one NumPy array per QuantMetricsTrade field.
+    
+    Holds parsed trades without a Python object per row; call to_trades()
+    where the list-of-objects API is needed. The low-cardinality string
+    fields are Categoricals (int8 codes + a few category strings).
+    """
+    
+    timestamp_open: np.ndarray   # datetime64[ns]
+    timestamp_close: np.ndarray  # datetime64[ns]
+    symbol: pd.Categorical
+    direction: pd.Categorical    # codes: 0 = LONG, 1 = SHORT
+    entry_price: np.ndarray      # float64
+    exit_price: np.ndarray
+    sl: np.ndarray
+    tp: np.ndarray
+    profit_usd: np.ndarray
+    profit_r: np.ndarray
+    result: pd.Categorical       # codes: 0 = WIN, 1 = LOSS, 2 = TIMEOUT
+    
+    FLOAT_FIELDS = ('entry_price', 'exit_price', 'sl', 'tp', 'profit_usd', 'profit_r')
+    
+    def __len__(self) -> int:
+        return len(self.entry_price)
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'TradeBatch':
+        """Build from a DataFrame with the 11 EdgeLab columns (whole-column conversions)."""
+        return cls(
+            timestamp_open=_to_datetime64(df['timestamp_open']),
+            timestamp_close=_to_datetime64(df['timestamp_close']),
+            symbol=_to_categorical(df['symbol']),
+            direction=_to_categorical(df['direction'], DIRECTIONS),
+            result=_to_categorical(df['result'], RESULTS),
+            **{
+                name: df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+                for name in cls.FLOAT_FIELDS
+            }
+        )
+    
+    @classmethod
+    def from_trades(cls, trades: List[QuantMetricsTrade]) -> 'TradeBatch':
+        """Build from QuantMetricsTrade objects (one pass per field, preallocated arrays)."""
+        n = len(trades)
+        return cls(
+            timestamp_open=pd.DatetimeIndex(
+                list(map(attrgetter('timestamp_open'), trades))
+            ).to_numpy(dtype='datetime64[ns]'),
+            timestamp_close=pd.DatetimeIndex(
+                list(map(attrgetter('timestamp_close'), trades))
+            ).to_numpy(dtype='datetime64[ns]'),
+            symbol=_to_categorical(list(map(attrgetter('symbol'), trades))),
+            direction=_to_categorical(list(map(attrgetter('direction'), trades)), DIRECTIONS),
+            result=_to_categorical(list(map(attrgetter('result'), trades)), RESULTS),
+            **{
+                name: np.fromiter(map(attrgetter(name), trades), dtype=np.float64, count=n)
+                for name in cls.FLOAT_FIELDS
+            }
+        )
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Trades as a DataFrame, one row per trade.
+        
+        Low-cardinality columns (symbol, direction, result and the derived
+        session of the entry time) are categorical, so group-bys and masks
+        run on int8 codes.
+        """
+        hours = pd.DatetimeIndex(self.timestamp_open).hour.to_numpy()
+        return pd.DataFrame({
+            **{f.name: getattr(self, f.name) for f in fields(self)},
+            'session': pd.Categorical.from_codes(_SESSION_CODE_LUT[hours], categories=SESSIONS),
+        })
+    
+    def to_trades(self) -> List[QuantMetricsTrade]:
+        """Materialize QuantMetricsTrade objects (timestamps boxed to pd.Timestamp)."""
+        # Columns in QuantMetricsTrade field order -> positional construction,
+        # no keyword mapping per row
+        columns = [
+            pd.DatetimeIndex(values) if values.dtype.kind == 'M'
+            else _interned_values(values) if isinstance(values, pd.Categorical)
+            else values.tolist()
+            for values in (getattr(self, f.name) for f in fields(QuantMetricsTrade))
+        ]
+        return list(starmap(QuantMetricsTrade, zip(*columns)))
+
+
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     """Complete analysis output with all insights."""
     
@@ -53,6 +197,17 @@ class AnalysisResult:
 
 # Helper functions
 
+SESSIONS = ('Tokyo', 'London', 'NY')
+
+# Session code per UTC hour (index 0-23): Tokyo 0-7, London 8-13, NY 14-23
+_SESSION_CODE_LUT = np.array([0] * 8 + [1] * 6 + [2] * 10, dtype=np.int8)
+_SESSION_LUT = np.array(SESSIONS, dtype=object)[_SESSION_CODE_LUT]
+
+# Direction code -> 'LONG'/'SHORT' and profit_r <= 0 -> 'WIN'/'LOSS'
+_DIRECTION_LUT = np.array(DIRECTIONS, dtype=object)
+_RESULT_LUT = np.array(RESULTS[:2], dtype=object)
+
+
 def detect_session(timestamp) -> str:
     """
     Detect trading session based on UTC hour.
@@ -96,12 +251,7 @@ def detect_session(timestamp) -> str:
             print(f"[WARNING] Could not parse timestamp: {timestamp}, type: {type(timestamp)}, error: {e}")
             return 'NY'  # Default fallback
     
-    if 0 <= hour < 8:
-        return 'Tokyo'
-    elif 8 <= hour < 14:
-        return 'London'
-    else:  # 14-23
-        return 'NY'
+    return _SESSION_LUT[hour]
 
 
 def calculate_rr(
@@ -136,4 +286,131 @@ def calculate_rr(
     if risk == 0:
         return 0.0
     
-    return profit / risk
\ No newline at end of file
+    return profit / risk
+
+
+# Vectorized helpers (one call per batch of trades)
+
+def session_hours(timestamps) -> np.ndarray:
+    """UTC hour (0-23) per timestamp; integer arrays are taken as hours already."""
+    values = np.asarray(timestamps)
+    if values.dtype.kind in 'iu':
+        return values
+    return pd.DatetimeIndex(timestamps).hour.to_numpy()
+
+
+def detect_session_vec(timestamps) -> np.ndarray:
+    """
+    Vectorized detect_session.
+    
+    Args:
+        timestamps: Sequence/array of trade timestamps (UTC), or an
+            integer array of hours (e.g. DatetimeIndex.hour)
+        
+    Returns:
+        Object array of session names ('Tokyo', 'London', 'NY')
+    """
+    return _SESSION_LUT[session_hours(timestamps)]
+
+
+def calculate_rr_vec(entry, exit, sl, direction) -> np.ndarray:
+    """
+    Vectorized calculate_rr.
+    
+    Args:
+        entry: Entry prices
+        exit: Exit prices
+        sl: Stop loss prices
+        direction: 'LONG'/'SHORT' strings, or booleans (True = LONG)
+        
+    Returns:
+        float64 array of R-multiples
+    """
+    direction = np.asarray(direction)
+    is_long = direction if direction.dtype == np.bool_ else direction == 'LONG'
+    entry = np.asarray(entry, dtype=np.float64)
+    
+    profit = np.where(is_long, 1.0, -1.0) * (np.asarray(exit, dtype=np.float64) - entry)
+    risk = np.abs(entry - np.asarray(sl, dtype=np.float64))
+    # Zero risk -> 0R, like calculate_rr (NaN inputs stay NaN)
+    return np.divide(profit, risk, out=np.zeros_like(profit), where=risk != 0)
+
+
+def build_trades(
+    timestamps_open,
+    timestamps_close,
+    direction_code: np.ndarray,
+    entry_price: np.ndarray,
+    exit_price: np.ndarray,
+    sl: np.ndarray,
+    tp: np.ndarray,
+    risk_distance: Optional[np.ndarray] = None
+) -> List[QuantMetricsTrade]:
+    """
+    Build QuantMetricsTrade objects from parallel trade arrays.
+    
+    Used by the backtest engines, which record simulated trades as arrays
+    and only create the dataclass instances once the simulation is done.
+    Profit, R-multiple and result are computed for all trades at once.
+    
+    Args:
+        timestamps_open: Entry timestamps (datetime64 array or sequence of datetimes)
+        timestamps_close: Exit timestamps (datetime64 array or sequence of datetimes)
+        direction_code: 0 = LONG, 1 = SHORT
+        entry_price: Entry prices
+        exit_price: Exit prices
+        sl: Stop loss prices
+        tp: Take profit prices
+        risk_distance: |entry - SL| per trade, if the caller already has it
+        
+    Returns:
+        List of QuantMetricsTrade objects (symbol is left empty)
+    """
+    # Box to pd.Timestamp only here, for the trades actually taken
+    timestamps_open = pd.DatetimeIndex(timestamps_open)
+    timestamps_close = pd.DatetimeIndex(timestamps_close)
+    direction_code = np.asarray(direction_code)
+    sign = 1.0 - 2.0 * direction_code  # +1 = LONG, -1 = SHORT
+    entry_price = np.asarray(entry_price, dtype=np.float64)
+    exit_price = np.asarray(exit_price, dtype=np.float64)
+    sl = np.asarray(sl, dtype=np.float64)
+    tp = np.asarray(tp, dtype=np.float64)
+    
+    profit_usd = sign * (exit_price - entry_price)
+    
+    # Zero-risk trades get 0R (same rule as calculate_rr)
+    if risk_distance is None:
+        risk = np.abs(entry_price - sl)
+    else:
+        risk = np.asarray(risk_distance, dtype=np.float64)
+    profit_r = np.divide(profit_usd, risk, out=np.zeros_like(profit_usd), where=risk > 0)
+    
+    # Result follows the actual R-multiple; break-even counts as loss.
+    # Looked up in object arrays of the literals, so every trade shares the
+    # interned 'WIN'/'LONG'/... strings
+    result = _RESULT_LUT[(profit_r <= 0).astype(np.intp)]
+    direction = _DIRECTION_LUT[direction_code]
+    
+    return [
+        QuantMetricsTrade(
+            timestamp_open=ts_open,
+            timestamp_close=ts_close,
+            symbol="",  # Will be set by analyzer
+            direction=dir_str,
+            entry_price=entry,
+            exit_price=exit_,
+            sl=sl_,
+            tp=tp_,
+            profit_usd=pnl,
+            profit_r=r,
+            result=res
+        )
+        for ts_open, ts_close, dir_str, entry, exit_, sl_, tp_, pnl, r, res in zip(
+            timestamps_open, timestamps_close,
+            direction.tolist(),
+            entry_price.tolist(), exit_price.tolist(),
+            sl.tolist(), tp.tolist(),
+            profit_usd.tolist(), profit_r.tolist(),
+            result.tolist()
+        )
+    ]
@@ -26,7 +26,7 @@ Version: 1.0
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import pandas as pd
 from datetime import datetime
 
@@ -78,7 +78,8 @@ class DataStorage(ABC):
         symbol: str, 
         timeframe: str,
         start: datetime, 
-        end: datetime
+        end: datetime,
+        columns: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
         Retrieve market data from storage.
@@ -88,6 +89,7 @@ class DataStorage(ABC):
             timeframe: Candle interval
             start: Start of requested date range
             end: End of requested date range
+            columns: Only load these columns (all if None)
         
         Returns:
             DataFrame with columns: open, high, low, close, volume
@@ -178,6 +180,34 @@ class DataStorage(ABC):
     
     # Optional methods with default implementations
     
+    def try_get_data(
+        self, 
+        symbol: str, 
+        timeframe: str,
+        start: datetime, 
+        end: datetime,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get market data if storage covers the full range, else None.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle interval
+            start: Start of requested date range
+            end: End of requested date range
+            columns: Only load these columns (all if None)
+        
+        Returns:
+            DataFrame as from get_data(), or None if has_data() is False
+        
+        Default implementation calls has_data() then get_data().
+        Override to answer both in one storage round trip.
+        """
+        if not self.has_data(symbol, timeframe, start, end):
+            return None
+        return self.get_data(symbol, timeframe, start, end, columns=columns)
+    
     def get_available_symbols(self) -> list:
         """
         List all symbols with cached data.
@@ -0,0 +1,78 @@
+# tests/test_backtest_engine.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.backtest_engine import BacktestEngine, _HOUR_SESSION_MASK, _SESSION_BITS, _SESSION_HOURS
+from core.strategy import EntryCondition, StrategyDefinition
+
+
+def _strategy(*conditions):
+    return StrategyDefinition(name="test", symbol="XAUUSD", entry_conditions=list(conditions))
+
+
+def test_hour_session_mask_matches_windows():
+    """Every hour is flagged for exactly the sessions whose window contains it"""
+    for hour in range(24):
+        for name, hours in _SESSION_HOURS.items():
+            in_session = bool(_HOUR_SESSION_MASK[hour] & _SESSION_BITS[name])
+            assert in_session == (hour in hours), (hour, name)
+
+
+def test_hour_session_mask_overlap():
+    """London/NY overlap hours belong to both sessions"""
+    assert _HOUR_SESSION_MASK[13] == _SESSION_BITS['london'] | _SESSION_BITS['ny']
+    assert _HOUR_SESSION_MASK[23] == 0
+
+
+def test_compile_strategy_mask_and_logic():
+    """All conditions must hold; NaN never matches"""
+    data = pd.DataFrame({
+        'rsi': [20.0, 25.0, np.nan, 40.0],
+        'close': [100.0, 99.0, 98.0, 97.0],
+    })
+    engine = BacktestEngine.__new__(BacktestEngine)
+
+    mask = engine._compile_strategy_mask(data, _strategy(
+        EntryCondition('rsi', '<', 30),
+        EntryCondition('close', '<=', 99.0),
+    ))
+
+    assert mask.tolist() == [False, True, False, False]
+
+
+def test_compile_strategy_mask_missing_column():
+    """A condition on an unknown indicator never matches"""
+    data = pd.DataFrame({'close': [1.0, 2.0]})
+    engine = BacktestEngine.__new__(BacktestEngine)
+
+    mask = engine._compile_strategy_mask(data, _strategy(EntryCondition('rsi', '>', 0)))
+
+    assert not mask.any()
+
+
+def test_simulate_signals_short_sl():
+    """SHORT entry at close, stopped out when high crosses SL; open trades are dropped"""
+    index = pd.date_range('2024-01-01', periods=4, freq='15min')
+    data = pd.DataFrame({
+        'close': [100.0, 100.0, 100.5, 101.0],
+        'high': [100.2, 100.5, 101.5, 101.2],
+        'low': [99.8, 99.5, 100.0, 100.5],
+    }, index=index)
+    engine = BacktestEngine.__new__(BacktestEngine)
+
+    trades = engine._simulate_signals(
+        data, np.array([False, True, False, True]), 'SHORT', tp_pct=0.02, sl_pct=0.01
+    )
+
+    assert len(trades) == 1  # second entry never reaches TP/SL
+    first = trades[0]
+    assert first.direction == 'SHORT'
+    assert first.timestamp_open == index[1]
+    assert first.timestamp_close == index[2]
+    assert first.exit_price == first.sl == 101.0
+    assert first.result == 'LOSS'
@@ -0,0 +1,163 @@
+# tests/test_backtest_engine_v5.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.quantmetrics_schema import build_trades
+from core.backtest_engine_v5 import BacktestEngineV5, _walk_trades
+
+
+def test_build_trades_empty():
+    """No recorded trades -> empty list"""
+    empty_ts = pd.DatetimeIndex([])
+    empty = np.empty(0, dtype=np.float64)
+
+    trades = build_trades(
+        empty_ts, empty_ts, np.empty(0, dtype=np.int8),
+        empty, empty, empty, empty
+    )
+
+    assert trades == []
+
+
+def test_build_trades_long_tp_win():
+    """LONG trade closed at TP (2R) -> profit_r 2.0, WIN"""
+    ts = pd.date_range('2024-01-01', periods=2, freq='15min')
+
+    trades = build_trades(
+        ts[:1], ts[1:], np.array([0], dtype=np.int8),
+        np.array([100.0]), np.array([104.0]),
+        np.array([98.0]), np.array([104.0])
+    )
+
+    assert len(trades) == 1
+    trade = trades[0]
+    assert trade.direction == 'LONG'
+    assert trade.profit_usd == 4.0
+    assert trade.profit_r == 2.0
+    assert trade.result == 'WIN'
+    assert trade.timestamp_open == ts[0]
+    assert trade.timestamp_close == ts[1]
+    assert trade.result is sys.intern('WIN')
+    assert trade.direction is sys.intern('LONG')
+
+
+def test_build_trades_short_zero_risk():
+    """SHORT trade with SL at entry (zero risk) -> profit_r 0.0, LOSS"""
+    ts = pd.date_range('2024-01-01', periods=2, freq='15min')
+
+    trades = build_trades(
+        ts[:1], ts[1:], np.array([1], dtype=np.int8),
+        np.array([100.0]), np.array([99.0]),
+        np.array([100.0]), np.array([98.0])
+    )
+
+    trade = trades[0]
+    assert trade.direction == 'SHORT'
+    assert trade.profit_r == 0.0
+    assert trade.result == 'LOSS'
+
+
+def test_simulate_trades_no_signals():
+    """A run without any entry signal returns no trades"""
+    dates = pd.date_range('2024-01-01', periods=10, freq='15min')
+    close = np.linspace(100, 101, 10)
+    data = pd.DataFrame({
+        'open': close,
+        'high': close + 0.5,
+        'low': close - 0.5,
+        'close': close,
+        'htf_bias': 'NEUTRAL',
+        'sweep_detected': False,
+        'sweep_price': np.nan,
+        'displacement_detected': False,
+        'displacement_price': np.nan,
+    }, index=dates)
+
+    engine = BacktestEngineV5.__new__(BacktestEngineV5)
+    trades = engine._simulate_trades(data, {'takeProfit': 2.0})
+
+    assert trades == []
+
+
+def test_combine_block_conditions_per_direction():
+    """Block conditions collapse to one array per direction"""
+    index = pd.date_range('2024-01-01', periods=4, freq='15min')
+    data = pd.DataFrame({
+        'in_bullish_ob': [True, True, False, False],
+        'in_bearish_ob': [False, True, True, False],
+    }, index=index)
+    blocks = {
+        'order_blocks': {'condition_series': pd.Series([True, True, True, False], index=index)},
+        'fair_value_gaps': {'condition_series': pd.Series(True, index=index)},
+        'custom': {'module': object(), 'config': {}},
+    }
+
+    engine = BacktestEngineV5.__new__(BacktestEngineV5)
+    long_ok, short_ok, fallback = engine._combine_block_conditions(data, blocks)
+
+    assert long_ok.tolist() == [False, False, False, False]  # FVG columns missing
+    assert short_ok.tolist() == [False, False, False, False]
+    assert [module_id for module_id, _ in fallback] == ['custom']
+
+    del blocks['fair_value_gaps']
+    long_ok, short_ok, _ = engine._combine_block_conditions(data, blocks)
+
+    assert long_ok.tolist() == [True, True, False, False]
+    assert short_ok.tolist() == [False, True, True, False]
+
+
+def test_walk_trades_long_tp():
+    """Sweep, then bullish displacement -> LONG entry that runs to TP"""
+    n = 5
+    high = np.array([100.0, 100.0, 101.0, 101.5, 104.0])
+    low = np.array([99.0, 98.0, 100.0, 100.5, 101.0])
+    entry_px = np.array([np.nan, np.nan, 101.0, np.nan, np.nan])
+    sweep_px = np.array([np.nan, 99.0, np.nan, np.nan, np.nan])
+    true = np.ones(n, dtype=bool)
+
+    result = _walk_trades(
+        high, low, entry_px, sweep_px,
+        true, np.array([False, False, True, False, False]),
+        np.array([False, True, False, False, False]),
+        np.zeros(n, dtype=np.int8),
+        true, true,
+        1.0, 1.0, False, 20
+    )
+    entry_idx, exit_idx, direction, entry, exit_, sl, tp, risk, stage_counts = result
+
+    assert entry_idx.tolist() == [2]
+    assert exit_idx.tolist() == [4]
+    assert direction.tolist() == [0]
+    assert sl[0] == 101.0 * 0.99
+    assert exit_[0] == tp[0] == 101.0 + (101.0 - sl[0])
+    assert risk[0] == 101.0 - sl[0]
+    assert stage_counts.tolist() == [3, 1, 1, 1, 1]
+
+
+def test_detect_liquidity_sweeps_equal_highs():
+    """A high matching an earlier high within tolerance is a sweep at that price"""
+    index = pd.date_range('2024-01-01', periods=5, freq='h')
+    data = pd.DataFrame({
+        'high': [100.0, 101.0, 102.0, 100.05, 105.0],
+        'low': [99.0, 100.0, 101.0, 99.0, 104.0],
+    }, index=index)
+
+    engine = BacktestEngineV5.__new__(BacktestEngineV5)
+    sweeps = engine._detect_liquidity_sweeps(
+        data, {'sweepType': 'equal_highs', 'lookback': 2, 'tolerance': 0.1}
+    )
+
+    assert sweeps['sweep_detected'].tolist() == [False, False, False, False, False]
+
+    sweeps = engine._detect_liquidity_sweeps(
+        data, {'sweepType': 'equal_highs', 'lookback': 3, 'tolerance': 0.1}
+    )
+
+    assert sweeps['sweep_detected'].tolist() == [False, False, False, True, False]
+    assert sweeps['sweep_price'].iloc[3] == 100.05
+    assert np.isnan(sweeps['sweep_price'].iloc[4])
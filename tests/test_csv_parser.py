@@ -0,0 +1,121 @@
+# tests/test_csv_parser.py
+import sys
+from dataclasses import astuple
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.csv_parser import CSVParser
+from core.quantmetrics_schema import QuantMetricsTrade
+
+SAMPLE_CSV = Path(__file__).parent / 'sample_data' / 'trades_sample.csv'
+
+
+def test_parse_edgelab_sample():
+    """EdgeLab CSV rows become QuantMetricsTrade objects with native values"""
+    trades = CSVParser().parse(str(SAMPLE_CSV))
+    df = pd.read_csv(SAMPLE_CSV)
+
+    assert len(trades) == len(df)
+    assert all(isinstance(t, QuantMetricsTrade) for t in trades)
+
+    first = trades[0]
+    assert first.timestamp_open == pd.Timestamp(df['timestamp_open'].iloc[0])
+    assert first.timestamp_close == pd.Timestamp(df['timestamp_close'].iloc[0])
+    assert first.symbol == df['symbol'].iloc[0]
+    assert first.direction == df['direction'].iloc[0]
+    assert type(first.entry_price) is float
+    assert first.profit_r == float(df['profit_r'].iloc[0])
+    assert [t.result for t in trades] == df['result'].tolist()
+
+
+def test_parse_edgelab_empty(tmp_path):
+    """Header-only EdgeLab CSV -> no trades"""
+    path = tmp_path / 'empty.csv'
+    path.write_text(
+        'timestamp_open,timestamp_close,symbol,direction,entry_price,'
+        'exit_price,sl,tp,profit_usd,profit_r,result\n'
+    )
+
+    assert CSVParser().parse(str(path)) == []
+
+
+def test_parse_edgelab_without_pyarrow(monkeypatch):
+    """The plain pandas reader yields the same trades as the Arrow engine"""
+    import core.csv_parser as csv_parser
+
+    arrow_trades = CSVParser().parse(str(SAMPLE_CSV))
+    monkeypatch.setattr(csv_parser, 'PYARROW_AVAILABLE', False)
+
+    assert CSVParser().detect_format(str(SAMPLE_CSV)) == 'edgelab'
+    pandas_trades = CSVParser().parse(str(SAMPLE_CSV))
+    assert [astuple(t) for t in pandas_trades] == [astuple(t) for t in arrow_trades]
+
+
+def test_detect_format_header_only(tmp_path):
+    """Format comes from the first line; BOM, quotes and case are ignored"""
+    path = tmp_path / 'quoted.csv'
+    path.write_bytes(
+        b'\xef\xbb\xbf"Timestamp_Open",timestamp_close,symbol,direction,entry_price,'
+        b'exit_price,sl,tp,profit_usd,profit_r,RESULT\r\n'
+    )
+    assert CSVParser().detect_format(str(path)) == 'edgelab'
+
+    path.write_text('date,price\n2024-01-01,1.0\n')
+    assert CSVParser().detect_format(str(path)) == 'generic'
+
+
+def test_parse_batch_columnar():
+    """parse_batch keeps one typed array per field and matches parse()"""
+    batch = CSVParser().parse_batch(str(SAMPLE_CSV))
+    trades = CSVParser().parse(str(SAMPLE_CSV))
+
+    assert len(batch) == len(trades)
+    assert batch.timestamp_open.dtype == 'datetime64[ns]'
+    assert batch.profit_r.dtype == 'float64'
+    assert batch.profit_r.tolist() == [t.profit_r for t in trades]
+    assert [astuple(t) for t in batch.to_trades()] == [astuple(t) for t in trades]
+
+
+def test_parse_edgelab_polars_path(monkeypatch):
+    """The Polars reader yields the same trades as the pandas reader"""
+    import pytest
+    import core.csv_parser as csv_parser
+
+    if not (csv_parser.POLARS_AVAILABLE and csv_parser.PYARROW_AVAILABLE):
+        pytest.skip("polars/pyarrow not installed")
+
+    pandas_trades = CSVParser().parse(str(SAMPLE_CSV))
+    monkeypatch.setattr(csv_parser, 'POLARS_MIN_BYTES', 0)
+    polars_trades = CSVParser().parse(str(SAMPLE_CSV))
+
+    assert [astuple(t) for t in polars_trades] == [astuple(t) for t in pandas_trades]
+
+
+def test_iter_batches_streams_all_rows(monkeypatch):
+    """Chunks streamed from the file add up to the parsed trades"""
+    import core.csv_parser as csv_parser
+
+    trades = CSVParser().parse(str(SAMPLE_CSV))
+    expected = [astuple(t) for t in trades]
+
+    monkeypatch.setattr(csv_parser, 'STREAM_BLOCK_BYTES', 200)
+    batches = list(CSVParser().iter_batches(str(SAMPLE_CSV)))
+    assert len(batches) > 1
+    assert [astuple(t) for b in batches for t in b.to_trades()] == expected
+
+    monkeypatch.setattr(csv_parser, 'PYARROW_AVAILABLE', False)
+    monkeypatch.setattr(csv_parser, 'STREAM_CHUNK_ROWS', 3)
+    batches = list(CSVParser().iter_batches(str(SAMPLE_CSV)))
+    assert [len(b) for b in batches] == [3, len(trades) - 3]
+    assert [astuple(t) for b in batches for t in b.to_trades()] == expected
+
+
+def test_parse_edgelab_interns_strings():
+    """Parsed result/direction/symbol strings are the interned objects"""
+    trades = CSVParser().parse(str(SAMPLE_CSV))
+
+    for field in ('result', 'direction', 'symbol'):
+        assert all(getattr(t, field) is sys.intern(getattr(t, field)) for t in trades)
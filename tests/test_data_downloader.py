@@ -0,0 +1,24 @@
+# tests/test_data_downloader.py
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_downloader import DataDownloader, SYMBOL_MAP
+
+
+def test_symbol_map_read_only():
+    """The symbol map cannot be modified at runtime"""
+    with pytest.raises(TypeError):
+        SYMBOL_MAP['FOO'] = 'BAR'
+
+
+def test_supported_symbols():
+    """Supported symbols come straight from the symbol map"""
+    downloader = DataDownloader()
+
+    assert downloader.get_supported_symbols() == tuple(SYMBOL_MAP)
+    assert downloader.is_symbol_supported('xauusd')
+    assert not downloader.is_symbol_supported('FOO')
@@ -0,0 +1,122 @@
+# tests/test_data_manager.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_manager import _merge_newer_wins
+
+
+def _reference_merge(older, newer):
+    combined = pd.concat([older, newer])
+    combined = combined[~combined.index.duplicated(keep='last')]
+    return combined.sort_index()
+
+
+def _frame(index, value):
+    return pd.DataFrame({'close': np.full(len(index), value)}, index=pd.DatetimeIndex(index))
+
+
+def test_merge_newer_wins_tail_overlap():
+    """Recent candles replace the cached tail and extend it"""
+    older = _frame(pd.date_range('2024-01-01', periods=6, freq='h'), 1.0)
+    newer = _frame(pd.date_range('2024-01-01 04:00', periods=4, freq='h'), 2.0)
+
+    merged = _merge_newer_wins(older, newer)
+
+    pd.testing.assert_frame_equal(merged, _reference_merge(older, newer), check_freq=False)
+    assert merged['close'].tolist() == [1.0] * 4 + [2.0] * 4
+
+
+def test_merge_newer_wins_keeps_gaps_and_tail():
+    """Cached rows missing from the recent window and after it are kept"""
+    older = _frame(pd.date_range('2024-01-01', periods=10, freq='h'), 1.0)
+    newer = _frame(['2024-01-01 02:00', '2024-01-01 05:00'], 2.0)
+
+    merged = _merge_newer_wins(older, newer)
+
+    pd.testing.assert_frame_equal(merged, _reference_merge(older, newer), check_freq=False)
+    assert merged.loc['2024-01-01 05:00', 'close'] == 2.0
+    assert len(merged) == 10
+
+
+def test_merge_newer_wins_mixed_units_and_empty():
+    """Index resolution differences and empty sides are handled"""
+    older = _frame(pd.date_range('2024-01-01', periods=3, freq='h').as_unit('us'), 1.0)
+    newer = _frame(pd.date_range('2024-01-01 02:00', periods=2, freq='h'), 2.0)
+
+    merged = _merge_newer_wins(older, newer)
+
+    assert merged['close'].tolist() == [1.0, 1.0, 2.0, 2.0]
+    assert _merge_newer_wins(older.iloc[:0], newer) is newer
+    assert _merge_newer_wins(older, newer.iloc[:0]) is older
+
+
+def test_preload_popular_symbols_runs_every_symbol():
+    """All popular symbols are preloaded; one failure does not stop the rest"""
+    from core.data_manager import DataManager
+
+    seen = []
+
+    def fake_preload(symbol):
+        seen.append(symbol)
+        if symbol == 'EURUSD':
+            raise ValueError("boom")
+        return {}
+
+    manager = DataManager.__new__(DataManager)
+    manager.preload_symbol = fake_preload
+    manager.preload_popular_symbols()
+
+    assert sorted(seen) == sorted(['XAUUSD', 'EURUSD', 'GBPUSD', 'USDJPY', 'BTCUSD'])
+
+
+def test_range_mask_inclusive_bounds():
+    """Range mask is inclusive on both ends and unit independent"""
+    from datetime import datetime
+    from core.data_manager import _range_mask
+
+    index = pd.date_range('2024-01-01', periods=5, freq='h').as_unit('s')
+    mask = _range_mask(index, datetime(2024, 1, 1, 1), datetime(2024, 1, 1, 3))
+
+    assert mask.tolist() == [False, True, True, True, False]
+
+
+def test_calculate_period_thresholds():
+    """Period lookup keeps the inclusive day thresholds and the intraday cap"""
+    from datetime import datetime, timedelta
+    from core.data_manager import DataManager
+
+    manager = DataManager.__new__(DataManager)
+    start = datetime(2024, 1, 1)
+
+    def period(days, timeframe):
+        return manager._calculate_period(start, start + timedelta(days=days - 1), timeframe)
+
+    assert [period(d, '1d') for d in (1, 5, 6, 7, 8, 30, 31, 90, 180, 365, 730, 1825, 1826)] == [
+        '5d', '5d', '7d', '7d', '1mo', '1mo', '3mo', '3mo', '6mo', '1y', '2y', '5y', 'max'
+    ]
+    assert [period(d, '15m') for d in (5, 7, 8, 200)] == ['5d', '7d', '60d', '60d']
+
+
+def test_get_data_uses_single_cache_probe():
+    """A cache hit is answered by one try_get_data call"""
+    from datetime import datetime, timedelta
+    from core.data_manager import DataManager
+
+    cached = _frame(pd.date_range('2024-01-01', periods=3, freq='h'), 1.0)
+    calls = []
+
+    class FakeStorage:
+        def try_get_data(self, *args):
+            calls.append(args)
+            return cached
+
+    manager = DataManager(storage=FakeStorage(), downloader=object(), cache_ttl_hours=1)
+    data = manager.get_data('xauusd', '1h', datetime(2024, 1, 1), datetime(2024, 1, 1, 2))
+
+    assert data is cached
+    assert calls == [('XAUUSD', '1h', datetime(2024, 1, 1), datetime(2024, 1, 1, 2))]
@@ -114,5 +114,75 @@ def test_directional_bias_long_edge():
     print(f"SHORT WR: {results['short_stats']['winrate']}%")
     print(f"Expected improvement: +{results['expected_improvement']}%")
 
+def test_direction_metrics_from_masks():
+    """Per-direction stats; TIMEOUT trades count towards neither wins nor losses"""
+    def trade(direction, result, profit_r):
+        return QuantMetricsTrade(
+            timestamp_open=datetime(2024, 1, 15, 10, 0),
+            timestamp_close=datetime(2024, 1, 15, 11, 0),
+            symbol="XAUUSD", direction=direction,
+            entry_price=2050.0, exit_price=2050.0,
+            sl=2045.0, tp=2060.0,
+            profit_usd=profit_r * 50, profit_r=profit_r, result=result
+        )
+
+    trades = [
+        trade("LONG", "WIN", 2.0),
+        trade("SHORT", "LOSS", -1.0),
+        trade("LONG", "LOSS", -1.0),
+        trade("LONG", "TIMEOUT", 0.5),
+        trade("SHORT", "LOSS", -0.5),
+    ]
+
+    results = DirectionalAnalyzer().analyze(trades)
+    long_stats = results['long_stats']
+
+    assert (long_stats['total_trades'], long_stats['wins'], long_stats['losses']) == (3, 1, 1)
+    assert long_stats['total_profit_r'] == 1.5
+    assert long_stats['avg_win'] == 2.0
+    assert long_stats['avg_loss'] == -1.0
+    assert results['short_stats']['avg_loss'] == -0.75
+    assert results['short_stats']['avg_win'] == 0
+    assert results['bias'] == 'LONG'
+    assert results['expected_improvement'] == round(100 / 3 - 20, 1)
+
+
+
+def test_improvement_from_direction_counts():
+    """Expected improvement is plain arithmetic on the per-direction stats"""
+    analyzer = DirectionalAnalyzer()
+    long_stats = {'total_trades': 6, 'wins': 2}
+    short_stats = {'total_trades': 4, 'wins': 3}
+
+    assert analyzer._calculate_improvement(long_stats, short_stats, 'SHORT') == 25.0
+    assert analyzer._calculate_improvement(long_stats, short_stats, 'LONG') == round(100 / 3 - 50, 1)
+    assert analyzer._calculate_improvement(long_stats, short_stats, 'NEUTRAL') == 0.0
+    assert analyzer._calculate_improvement({'total_trades': 0, 'wins': 0},
+                                           {'total_trades': 0, 'wins': 0}, 'SHORT') == 0.0
+
+
+def test_analyze_memoized_per_trade_list():
+    """A long-lived analyzer reuses its result only for the same unchanged list"""
+    def trade(result, profit_r):
+        return QuantMetricsTrade(
+            timestamp_open=datetime(2024, 1, 15, 10, 0),
+            timestamp_close=datetime(2024, 1, 15, 11, 0),
+            symbol="XAUUSD", direction="LONG",
+            entry_price=2050.0, exit_price=2050.0,
+            sl=2045.0, tp=2060.0,
+            profit_usd=profit_r * 50, profit_r=profit_r, result=result
+        )
+
+    analyzer = DirectionalAnalyzer()
+    trades = [trade("WIN", 1.0) for _ in range(5)]
+    first = analyzer.analyze(trades)
+    first['long_stats'].clear()  # callers get their own copy
+    assert analyzer.analyze(trades)['long_stats']['wins'] == 5
+
+    other = list(trades)
+    other[2] = trade("LOSS", -1.0)
+    assert analyzer.analyze(other)['long_stats']['wins'] == 4
+
+
 if __name__ == '__main__':
     test_directional_bias_long_edge()
\ No newline at end of file
@@ -105,5 +105,142 @@ def test_execution_quality():
     for issue in results['issues']:
         print(f"  - {issue}")
 
+def test_duration_groups_single_pass():
+    """Trades per duration bucket with wins and expectancy"""
+    def trade(hours, result, profit_r):
+        start = datetime(2024, 1, 15, 9, 0)
+        return QuantMetricsTrade(
+            timestamp_open=start, timestamp_close=start + timedelta(hours=hours),
+            symbol="XAUUSD", direction="LONG",
+            entry_price=2050.0, exit_price=2050.0,
+            sl=2045.0, tp=2065.0,
+            profit_usd=profit_r * 50, profit_r=profit_r, result=result
+        )
+
+    duration = ExecutionAnalyzer()._analyze_duration([
+        trade(0.5, "WIN", 2.0),
+        trade(0.25, "LOSS", -1.0),
+        trade(4, "WIN", 1.0),
+        trade(6, "TIMEOUT", 0.3),
+    ])
+
+    assert duration['breakdown'] == {
+        'quick': {'total_trades': 2, 'wins': 1, 'winrate': 50.0, 'expectancy': 0.5},
+        'medium': {'total_trades': 1, 'wins': 1, 'winrate': 100.0, 'expectancy': 1.0},
+        'long': {'total_trades': 1, 'wins': 0, 'winrate': 0.0, 'expectancy': 0.3},
+    }
+    assert duration['optimal_duration'] == 'medium'
+
+
+
+def test_sl_behavior_from_trade_arrays():
+    """Only LOSS trades count; beyond -1.2R the stop was held past"""
+    def trade(result, profit_r):
+        start = datetime(2024, 1, 15, 9, 0)
+        return QuantMetricsTrade(
+            timestamp_open=start, timestamp_close=start + timedelta(hours=1),
+            symbol="XAUUSD", direction="SHORT",
+            entry_price=2050.0, exit_price=2050.0,
+            sl=2055.0, tp=2040.0,
+            profit_usd=profit_r * 50, profit_r=profit_r, result=result
+        )
+
+    sl = ExecutionAnalyzer()._analyze_sl_behavior([
+        trade("LOSS", -1.0),
+        trade("LOSS", -1.5),
+        trade("TIMEOUT", -2.0),
+        trade("LOSS", -1.2),
+        trade("WIN", 2.0),
+    ])
+
+    assert sl == {
+        'total_losses': 3, 'proper_sl_hits': 2, 'held_past_sl': 1,
+        'proper_sl_pct': 66.7, 'extra_loss_cost': 0.5
+    }
+    assert ExecutionAnalyzer()._analyze_sl_behavior([trade("WIN", 1.0)])['proper_sl_pct'] == 100.0
+
+
+
+def test_tp_behavior_full_hits_and_missed_r():
+    """Wins within 0.2R of the planned R are full TP hits; the rest missed R"""
+    def trade(direction, entry, sl, tp, profit_r, result="WIN"):
+        start = datetime(2024, 1, 15, 9, 0)
+        return QuantMetricsTrade(
+            timestamp_open=start, timestamp_close=start + timedelta(hours=1),
+            symbol="XAUUSD", direction=direction,
+            entry_price=entry, exit_price=entry,
+            sl=sl, tp=tp,
+            profit_usd=profit_r * 50, profit_r=profit_r, result=result
+        )
+
+    tp = ExecutionAnalyzer()._analyze_tp_behavior([
+        trade("LONG", 2050.0, 2045.0, 2065.0, 2.9),    # planned 3R -> full TP
+        trade("SHORT", 2050.0, 2055.0, 2040.0, 1.0),   # planned 2R -> missed 1R
+        trade("LONG", 2050.0, 2050.0, 2060.0, 0.5),    # zero risk -> planned 0R, missed -0.5R
+        trade("LONG", 2050.0, 2045.0, 2065.0, -1.0, "LOSS"),
+    ])
+
+    assert tp == {
+        'total_wins': 3, 'full_tp_hits': 1, 'early_exits': 2,
+        'full_tp_pct': 33.3, 'estimated_missed_profit': 0.5
+    }
+    assert type(tp['full_tp_hits']) is int
+
+
+
+def test_analyze_memoized_per_trade_list(monkeypatch):
+    """The same unchanged list reuses the last analysis; callers get their own copy"""
+    def trade(result, profit_r):
+        start = datetime(2024, 1, 15, 9, 0)
+        return QuantMetricsTrade(
+            timestamp_open=start, timestamp_close=start + timedelta(hours=2),
+            symbol="XAUUSD", direction="LONG",
+            entry_price=2050.0, exit_price=2050.0,
+            sl=2045.0, tp=2060.0,
+            profit_usd=profit_r * 50, profit_r=profit_r, result=result
+        )
+
+    analyzer = ExecutionAnalyzer()
+    runs = []
+    analyze = analyzer._analyze
+    monkeypatch.setattr(analyzer, '_analyze', lambda trades: runs.append(len(trades)) or analyze(trades))
+
+    trades = [trade("WIN", 2.0), trade("WIN", 1.0), trade("LOSS", -1.5)]
+    first = analyzer.analyze(trades)
+    first['issues'].clear()
+    assert analyzer.analyze(trades)['issues'] == ExecutionAnalyzer().analyze(trades)['issues']
+    assert runs == [3]
+
+    # Another list with the same endpoints is analysed afresh
+    other = list(trades)
+    other[1] = trade("LOSS", -1.0)
+    assert analyzer.analyze(other)['sl_behavior']['total_losses'] == 2
+    assert runs == [3, 3]
+
+    trades.append(trade("WIN", 1.0))
+    analyzer.analyze(trades)
+    assert runs == [3, 3, 4]
+
+
+
+def test_tp_kernels_agree():
+    """Compiled loop and NumPy version classify winners the same way"""
+    import numpy as np
+    from core._pattern_kernels import tp_behavior, tp_behavior_numpy
+
+    rng = np.random.default_rng(7)
+    n = 400
+    is_long = rng.random(n) < 0.5
+    entry = rng.normal(2050, 5, n)
+    sl = entry + np.where(is_long, -1, 1) * rng.choice([0.0, 2.0, 5.0], n)
+    tp = entry + np.where(is_long, 1, -1) * rng.uniform(2, 15, n)
+    profit_r = rng.uniform(0, 4, n)
+
+    hits, missed = tp_behavior(is_long, entry, sl, tp, profit_r)
+    assert 0 < hits < n
+    assert tp_behavior_numpy(is_long, entry, sl, tp, profit_r)[0] == hits
+    assert np.isclose(tp_behavior_numpy(is_long, entry, sl, tp, profit_r)[1], missed)
+
+
 if __name__ == '__main__':
     test_execution_quality()
@@ -0,0 +1,127 @@
+# tests/test_indicators.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.indicators import IndicatorEngine
+
+
+def _ohlcv(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + np.abs(rng.normal(0, 0.5, n)),
+        'low': close - np.abs(rng.normal(0, 0.5, n)),
+        'close': close,
+        'volume': 0,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='15min'))
+
+
+def test_calculate_all_columns_and_input_untouched():
+    """Indicator columns are added to a new frame; the input is not modified"""
+    data = _ohlcv()
+    columns = list(data.columns)
+
+    df = IndicatorEngine().calculate_all(data)
+
+    assert list(data.columns) == columns
+    assert list(df.columns) == columns + [
+        'rsi', 'sma_20', 'sma_50', 'ema_20', 'macd', 'macd_signal',
+        'macd_histogram', 'bb_upper', 'bb_middle', 'bb_lower', 'atr', 'adx'
+    ]
+    assert np.isclose(df['sma_20'].iloc[-1], data['close'].iloc[-20:].mean())
+
+
+def test_calculate_all_cache_hit_and_invalidation():
+    """Same candles hit the cache; changed candles are recomputed"""
+    engine = IndicatorEngine()
+    data = _ohlcv()
+
+    first = engine.calculate_all(data)
+    second = engine.calculate_all(data.copy())
+    second['extra'] = 1.0
+
+    assert 'extra' not in engine.calculate_all(data).columns
+    pd.testing.assert_frame_equal(first, engine.calculate_all(data))
+
+    changed = data.copy()
+    changed.iloc[100, changed.columns.get_loc('close')] += 5.0
+    assert not np.isclose(engine.calculate_all(changed)['sma_20'].iloc[110], first['sma_20'].iloc[110])
+
+
+def test_compiled_indicators_match_ta():
+    """RSI/EMA/MACD/ATR/ADX kernels reproduce the ta library, warm-up values included"""
+    import ta
+
+    data = _ohlcv(300, seed=1)
+    data.iloc[150, data.columns.get_loc('close')] = np.nan
+    engine = IndicatorEngine()
+    high, low, close = data['high'], data['low'], data['close']
+
+    expected = {
+        'rsi': (engine.calculate_rsi(data), ta.momentum.rsi(close, window=14)),
+        'ema': (engine.calculate_ema(data), ta.trend.ema_indicator(close, window=20)),
+        'atr': (engine.calculate_atr(data), ta.volatility.average_true_range(high, low, close, window=14)),
+        'adx': (engine.calculate_adx(data), ta.trend.adx(high, low, close, window=14)),
+    }
+    macd, ta_macd = engine.calculate_macd(data), ta.trend.MACD(close)
+    expected['macd'] = (macd['macd'], ta_macd.macd())
+    expected['macd_signal'] = (macd['signal'], ta_macd.macd_signal())
+    expected['macd_histogram'] = (macd['histogram'], ta_macd.macd_diff())
+    for name, (got, ref) in expected.items():
+        pd.testing.assert_series_equal(got, ref, check_names=False, rtol=1e-10, obj=name)
+
+
+def test_compiled_indicators_short_input():
+    """Fewer bars than the window -> warm-up values only, no error"""
+    data = _ohlcv(10)
+    engine = IndicatorEngine()
+
+    assert engine.calculate_rsi(data).isna().all()
+    assert (engine.calculate_atr(data) == 0).all()
+    assert (engine.calculate_adx(data) == 0).all()
+
+
+def test_calculate_all_fused_close_pass_matches_ta():
+    """The single pass over close gives the same SMA/EMA/RSI/Bollinger columns as ta"""
+    import ta
+
+    data = _ohlcv(400, seed=2)
+    data.iloc[[30, 200], data.columns.get_loc('close')] = np.nan
+    close = data['close']
+    bollinger = ta.volatility.BollingerBands(close)
+
+    df = IndicatorEngine().calculate_all(data)
+
+    expected = {
+        'rsi': ta.momentum.rsi(close, window=14),
+        'sma_20': ta.trend.sma_indicator(close, window=20),
+        'sma_50': ta.trend.sma_indicator(close, window=50),
+        'ema_20': ta.trend.ema_indicator(close, window=20),
+        'bb_upper': bollinger.bollinger_hband(),
+        'bb_middle': bollinger.bollinger_mavg(),
+        'bb_lower': bollinger.bollinger_lband(),
+    }
+    for column, ref in expected.items():
+        pd.testing.assert_series_equal(df[column], ref, check_names=False, rtol=1e-10, obj=column)
+
+
+def test_calculate_all_batch_matches_single_calls():
+    """Batched symbols of different lengths give the same frames as one-by-one calls"""
+    frames = [_ohlcv(300, seed=3), _ohlcv(120, seed=4), _ohlcv(10, seed=5)]
+
+    batch = IndicatorEngine().calculate_all_batch(frames)
+
+    assert len(batch) == 3
+    for data, result in zip(frames, batch):
+        pd.testing.assert_frame_equal(result, IndicatorEngine().calculate_all(data))
+
+    engine = IndicatorEngine()
+    engine.calculate_all(frames[1])
+    again = engine.calculate_all_batch(frames)
+    pd.testing.assert_frame_equal(again[1], batch[1])
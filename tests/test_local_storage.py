@@ -0,0 +1,337 @@
+# tests/test_local_storage.py
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.local_storage import LocalStorage
+
+
+def _ohlcv(start, periods):
+    index = pd.date_range(start, periods=periods, freq='15min')
+    close = np.arange(periods, dtype=np.float64) + 100.0
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1,
+        'close': close, 'volume': 0,
+    }, index=index)
+
+
+def test_save_data_merges_arrow_table(tmp_path):
+    """Arrow tables are accepted and merged with the cached frame, newest wins"""
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 4))
+
+    newer = _ohlcv('2024-01-01 00:30', 4)
+    newer['close'] += 50
+    storage.save_data('XAUUSD', '15m', pa.Table.from_pandas(newer, preserve_index=True))
+
+    data = storage.get_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+    assert len(data) == 6
+    assert data.index.is_monotonic_increasing
+    assert data['close'].tolist() == [100.0, 101.0, 150.0, 151.0, 152.0, 153.0]
+    assert storage.metadata['XAUUSD_15m']['rows'] == 6
+
+
+def test_save_data_writes_zstd(tmp_path):
+    """Cache files are zstd-compressed Parquet"""
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('EURUSD', '1h', _ohlcv('2024-01-01', 3))
+
+    meta = pq.ParquetFile(tmp_path / 'EURUSD' / '1h' / 'year=2024' / 'month=1' / 'part-000001.parquet').metadata
+
+    assert meta.row_group(0).column(0).compression == 'ZSTD'
+
+
+def test_save_data_row_groups(tmp_path, monkeypatch):
+    """Large frames are split into fixed-size row groups"""
+    import core.local_storage as local_storage
+
+    monkeypatch.setattr(local_storage, 'PARQUET_ROW_GROUP_SIZE', 4)
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('EURUSD', '15m', _ohlcv('2024-01-01', 10))
+
+    meta = pq.ParquetFile(tmp_path / 'EURUSD' / '15m' / 'year=2024' / 'month=1' / 'part-000001.parquet').metadata
+
+    assert meta.num_row_groups == 3
+    assert meta.num_rows == 10
+
+
+def test_get_data_range_matches_pandas_path(tmp_path, monkeypatch):
+    """Arrow range read returns the same rows as the pandas mask"""
+    import core.local_storage as local_storage
+
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 20))
+    start, end = datetime(2024, 1, 1, 1), datetime(2024, 1, 1, 3)
+
+    arrow_data = storage.get_data('XAUUSD', '15m', start, end)
+    monkeypatch.setattr(local_storage, 'pa', None)
+    pandas_data = storage.get_data('XAUUSD', '15m', start, end)
+
+    assert len(arrow_data) == 9
+    assert isinstance(arrow_data.index, pd.DatetimeIndex)
+    pd.testing.assert_frame_equal(arrow_data, pandas_data, check_freq=False)
+
+
+def test_save_data_skips_unchanged_rewrite(tmp_path):
+    """Saving the same candles again leaves the file alone; changes are written"""
+    storage = LocalStorage(str(tmp_path))
+    data = _ohlcv('2024-01-01', 5)
+    storage.save_data('XAUUSD', '1h', data)
+    partition = tmp_path / 'XAUUSD' / '1h' / 'year=2024' / 'month=1'
+    first_mtime = (partition / 'part-000001.parquet').stat().st_mtime_ns
+
+    storage.save_data('XAUUSD', '1h', data.iloc[2:])
+    assert [p.name for p in partition.iterdir()] == ['part-000001.parquet']
+    assert (partition / 'part-000001.parquet').stat().st_mtime_ns == first_mtime
+
+    changed = data.iloc[-1:].copy()
+    changed['close'] = 999.0
+    storage.save_data('XAUUSD', '1h', changed)
+
+    reloaded = storage.get_data('XAUUSD', '1h', datetime(2024, 1, 1), datetime(2024, 1, 2))
+    assert reloaded['close'].iloc[-1] == 999.0
+    assert len(pq.read_table(partition / 'part-000002.parquet')) == 1
+    assert not list(partition.glob('*.tmp'))
+
+
+def test_metadata_and_clear_cache(tmp_path):
+    """Size scan covers every dataset; stale datasets are removed"""
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 5))
+    storage.save_data('EURUSD', '1h', _ohlcv('2024-01-01', 5))
+    (tmp_path / 'XAUUSD' / 'notes.txt').write_text('not a cache file')
+
+    sizes = storage._scan_parquet_sizes()
+    assert len(sizes) == 2
+    assert storage.get_storage_health()['status'] == 'healthy'
+
+    storage._db.execute(
+        "UPDATE datasets SET last_updated_ns = ? WHERE symbol = 'EURUSD'",
+        (int(datetime(2020, 1, 1).timestamp() * 1e9),)
+    )
+    assert storage.clear_cache(older_than_days=30) == 1
+    assert list(storage.metadata) == ['XAUUSD_15m']
+    assert len(storage._scan_parquet_sizes()) == 1
+
+
+def test_try_get_data_hit_and_miss(tmp_path, monkeypatch):
+    """Uncovered ranges return None; covered ranges read across row groups"""
+    import core.local_storage as local_storage
+
+    monkeypatch.setattr(local_storage, 'PARQUET_ROW_GROUP_SIZE', 3)
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 12))
+
+    assert storage.try_get_data('XAUUSD', '15m', datetime(2023, 12, 1), datetime(2024, 1, 1, 1)) is None
+    assert storage.try_get_data('EURUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 1)) is None
+
+    data = storage.try_get_data('XAUUSD', '15m', datetime(2024, 1, 1, 0, 30), datetime(2024, 1, 1, 1, 45))
+    assert data['close'].tolist() == [102.0, 103.0, 104.0, 105.0, 106.0, 107.0]
+
+
+def test_save_data_appends_month_partitions(tmp_path, monkeypatch):
+    """Appends land in per-month parts; full partitions are compacted"""
+    import core.local_storage as local_storage
+
+    monkeypatch.setattr(local_storage, 'COMPACT_MAX_PARTS', 3)
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '1d', _ohlcv('2024-01-31 23:00', 8))
+
+    dataset = tmp_path / 'XAUUSD' / '1d' / 'year=2024'
+    assert sorted(p.name for p in dataset.iterdir()) == ['month=1', 'month=2']
+
+    for close in (500.0, 600.0, 700.0):
+        update = _ohlcv('2024-02-01 00:00', 2)
+        update['close'] = close
+        storage.save_data('XAUUSD', '1d', update)
+
+    parts = list((dataset / 'month=2').glob('part-*.parquet'))
+    assert [p.name for p in parts] == ['part-000005.parquet']
+
+    data = storage.get_data('XAUUSD', '1d', datetime(2024, 1, 1), datetime(2024, 3, 1))
+    assert len(data) == 8
+    assert data['close'].tolist()[:6] == [100.0, 101.0, 102.0, 103.0, 700.0, 700.0]
+    assert storage.metadata['XAUUSD_1d']['rows'] == 8
+
+    feb_only = storage.get_data('XAUUSD', '1d', datetime(2024, 2, 1), datetime(2024, 2, 2))
+    assert feb_only.index.min() == pd.Timestamp('2024-02-01')
+
+
+def test_legacy_single_file_is_migrated(tmp_path):
+    """A pre-partitioning <symbol>/<timeframe>.parquet cache is still readable"""
+    (tmp_path / 'EURUSD').mkdir()
+    _ohlcv('2024-01-01', 6).to_parquet(tmp_path / 'EURUSD' / '15m.parquet')
+    storage = LocalStorage(str(tmp_path))
+
+    data = storage.get_data('EURUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+    assert len(data) == 6
+    assert not (tmp_path / 'EURUSD' / '15m.parquet').exists()
+    assert (tmp_path / 'EURUSD' / '15m' / 'year=2024' / 'month=1' / 'part-000001.parquet').exists()
+
+
+def test_get_data_column_projection(tmp_path, monkeypatch):
+    """Only the requested columns are loaded; the timestamp index is kept"""
+    import core.local_storage as local_storage
+
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 8))
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 1, 1)
+
+    data = storage.try_get_data('XAUUSD', '15m', start, end, columns=['close', 'high'])
+    assert list(data.columns) == ['close', 'high']
+    assert isinstance(data.index, pd.DatetimeIndex)
+    assert len(data) == 5
+
+    monkeypatch.setattr(local_storage, 'pa', None)
+    pandas_data = storage.get_data('XAUUSD', '15m', start, end, columns=['close', 'high'])
+    pd.testing.assert_frame_equal(data, pandas_data, check_freq=False)
+
+
+def test_metadata_persists_in_sqlite(tmp_path):
+    """Dataset entries survive a restart; old metadata.json files are imported"""
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 4))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01 00:30', 4))
+
+    reloaded = LocalStorage(str(tmp_path))
+    meta = reloaded.metadata['XAUUSD_15m']
+    assert meta['rows'] == 6
+    assert meta['start'] == '2024-01-01T00:00:00'
+    assert meta['end'] == '2024-01-01T01:15:00'
+    assert reloaded.has_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 1))
+    assert not reloaded.has_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 2))
+
+    legacy_dir = tmp_path / 'legacy'
+    legacy_dir.mkdir()
+    (legacy_dir / 'metadata.json').write_text(
+        '{"EURUSD_1h": {"symbol": "EURUSD", "timeframe": "1h", '
+        '"start": "2024-01-01T00:00:00", "end": "2024-02-01T00:00:00", '
+        '"rows": 744, "last_updated": "2024-02-01T12:00:00", "file_size_mb": 0.1}}'
+    )
+    imported = LocalStorage(str(legacy_dir))
+    assert imported.metadata['EURUSD_1h']['rows'] == 744
+    assert imported.has_data('EURUSD', '1h', datetime(2024, 1, 5), datetime(2024, 1, 6))
+    assert not (legacy_dir / 'metadata.json').exists()
+
+
+def test_read_file_range_bounds_inclusive(tmp_path, monkeypatch):
+    """The pandas fallback slices sorted files by binary search, both ends inclusive"""
+    import core.local_storage as local_storage
+
+    monkeypatch.setattr(local_storage, 'pa', None)
+    storage = LocalStorage(str(tmp_path))
+    path = tmp_path / 'sorted.parquet'
+    _ohlcv('2024-01-01', 10).to_parquet(path)
+
+    data = storage._read_file(path, datetime(2024, 1, 1, 0, 30), datetime(2024, 1, 1, 1, 0))
+    assert data['close'].tolist() == [102.0, 103.0, 104.0]
+
+    data = storage._read_file(path, datetime(2024, 1, 1, 0, 20), None)
+    assert data['close'].iloc[0] == 102.0 and len(data) == 8
+
+    shuffled = tmp_path / 'shuffled.parquet'
+    _ohlcv('2024-01-01', 10).iloc[::-1].to_parquet(shuffled)
+    data = storage._read_file(shuffled, datetime(2024, 1, 1, 0, 30), datetime(2024, 1, 1, 1, 0))
+    assert sorted(data['close'].tolist()) == [102.0, 103.0, 104.0]
+
+
+def test_has_data_uses_cached_ranges(tmp_path):
+    """Hits are answered from memory; ranges saved by another instance are seen on a miss"""
+    storage = LocalStorage(str(tmp_path))
+    other = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 8))
+
+    assert storage._ranges[('XAUUSD', '15m')] == (
+        pd.Timestamp('2024-01-01').value, pd.Timestamp('2024-01-01 01:45').value
+    )
+    assert storage.has_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 1, 45))
+    assert storage.has_data('xauusd', '15m', pd.Timestamp('2024-01-01 00:15'), pd.Timestamp('2024-01-01 01:00'))
+    assert not storage.has_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 2))
+
+    # Written through another instance: the miss re-reads metadata.db
+    other.save_data('XAUUSD', '15m', _ohlcv('2024-01-01 02:00', 4))
+    assert storage.has_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 2))
+
+    assert storage.delete_symbol('XAUUSD') == 1
+    assert ('XAUUSD', '15m') not in storage._ranges
+    assert not storage.has_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 1, 1))
+
+
+def test_storage_sizes_tracked_without_rescans(tmp_path, monkeypatch):
+    """Sizes are scanned once, then updated by saves and deletes"""
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 50))
+    first_total = storage.get_metadata()['total_size_mb']
+
+    def no_scan():
+        raise AssertionError("unexpected directory scan")
+
+    monkeypatch.setattr(storage, '_scan_parquet_sizes', no_scan)
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-02-01', 50))
+    storage.save_data('EURUSD', '1h', _ohlcv('2024-01-01', 50))
+
+    sizes = storage._cached_sizes()
+    assert len(sizes) == 2
+    assert sizes[str(tmp_path / 'XAUUSD' / '15m')] == LocalStorage._dataset_size(tmp_path / 'XAUUSD' / '15m')
+    assert storage.get_metadata()['total_size_mb'] >= first_total
+    assert storage.get_storage_health()['status'] == 'healthy'
+
+    storage.delete_symbol('EURUSD')
+    assert list(storage._cached_sizes()) == [str(tmp_path / 'XAUUSD' / '15m')]
+
+
+def test_save_not_blocked_by_other_symbol(tmp_path):
+    """A held data lock only blocks symbols on the same stripe"""
+    import threading
+
+    storage = LocalStorage(str(tmp_path))
+    held = storage._lock_for('XAUUSD')
+    other = next(
+        s for s in ('EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD', 'NZDUSD', 'USDCAD')
+        if storage._lock_for(s) is not held
+    )
+
+    with held:
+        worker = threading.Thread(
+            target=storage.save_data, args=(other, '1h', _ohlcv('2024-01-01', 20))
+        )
+        worker.start()
+        worker.join(timeout=10)
+        assert not worker.is_alive()
+
+    assert storage.has_data(other, '1h', datetime(2024, 1, 1), datetime(2024, 1, 1, 4))
+
+
+def test_save_data_append_skips_read_back(tmp_path, monkeypatch):
+    """Candles after the stored end are written without reading stored rows"""
+    storage = LocalStorage(str(tmp_path))
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01', 8))
+
+    reads = []
+    read_parts = storage._read_parts
+    monkeypatch.setattr(storage, '_read_parts', lambda *a, **k: reads.append(a) or read_parts(*a, **k))
+
+    storage.save_data('XAUUSD', '15m', _ohlcv('2024-01-01 02:00', 4))
+    assert reads == []
+
+    # Overlapping save only reads back the overlapping head
+    changed = _ohlcv('2024-01-01 02:30', 4)
+    changed.iloc[0, 0] = 1.0
+    storage.save_data('XAUUSD', '15m', changed)
+    assert [(start, end) for _, start, end in reads] == [
+        (pd.Timestamp('2024-01-01 02:30'), pd.Timestamp('2024-01-01 02:45'))
+    ]
+
+    result = storage.get_data('XAUUSD', '15m', datetime(2024, 1, 1), datetime(2024, 1, 2))
+    assert len(result) == 14
+    assert result['open'].iloc[10] == 1.0
+    assert storage.metadata['XAUUSD_15m']['rows'] == 14
@@ -101,5 +101,77 @@ def test_loss_forensics():
     print(f"\nCritical Finding:")
     print(f"  {results['critical_finding']}")
 
+def test_categorize_losses_costs():
+    """Losses split at -0.8R / -1.2R with per-category cost and extra cost"""
+    def loss(profit_r):
+        return QuantMetricsTrade(
+            timestamp_open=datetime(2024, 1, 15, 9, 0),
+            timestamp_close=datetime(2024, 1, 15, 10, 0),
+            symbol="XAUUSD", direction="LONG",
+            entry_price=2050.0, exit_price=2045.0,
+            sl=2045.0, tp=2060.0,
+            profit_usd=profit_r * 50, profit_r=profit_r, result="LOSS"
+        )
+
+    breakdown = LossForensics()._categorize_losses(
+        [loss(-1.0), loss(-0.8), loss(-0.5), loss(-0.25), loss(-2.0), loss(-1.25)]
+    )
+
+    assert breakdown['proper'] == {
+        'count': 2, 'avg_loss': 0.9, 'total_cost': 1.8, 'verdict': 'EXPECTED'
+    }
+    assert breakdown['early_exits'] == {
+        'count': 2, 'avg_loss': 0.38, 'total_cost': 0.75, 'extra_cost': -1.25, 'verdict': 'PANIC'
+    }
+    assert breakdown['held_past_sl'] == {
+        'count': 2, 'avg_loss': 1.62, 'total_cost': 3.25, 'extra_cost': 1.25, 'verdict': 'HOPE'
+    }
+
+
+
+def test_identify_causes_from_partition():
+    """Direction first, then session (if trades carry one), then hour"""
+    from types import SimpleNamespace
+
+    def trade(direction, hour, result, session=None):
+        profit_r = 2.0 if result == "WIN" else -1.0
+        fields = dict(
+            timestamp_open=datetime(2024, 1, 15, hour, 0),
+            timestamp_close=datetime(2024, 1, 15, hour, 30),
+            symbol="XAUUSD", direction=direction,
+            entry_price=2050.0, exit_price=2050.0,
+            sl=2045.0, tp=2060.0,
+            profit_usd=profit_r * 50, profit_r=profit_r, result=result
+        )
+        if session is None:
+            return QuantMetricsTrade(**fields)
+        return SimpleNamespace(**fields, session=session)
+
+    trades = [trade("LONG", h, "WIN") for h in (9, 10, 11, 12)] + [
+        trade("LONG", 3, "LOSS"),
+        trade("LONG", 9, "LOSS"),
+        trade("LONG", 9, "LOSS"),
+        trade("SHORT", 14, "LOSS"),
+        trade("SHORT", 15, "LOSS"),
+        trade("SHORT", 20, "WIN"),
+    ]
+    losses = [t for t in trades if t.result == "LOSS"]
+
+    causes = LossForensics()._identify_causes(losses, trades)
+
+    assert {name: c['count'] for name, c in causes.items()} == {
+        'wrong_direction': 2, 'poor_timing': 2, 'wrong_session': 0, 'other': 1
+    }
+    assert causes['poor_timing']['percentage'] == 40.0
+
+    trades = [trade("LONG", 9, "WIN", "London"), trade("LONG", 10, "WIN", "London"),
+              trade("LONG", 2, "LOSS", "Tokyo"), trade("LONG", 3, "LOSS", "London")]
+    losses = [t for t in trades if t.result == "LOSS"]
+    causes = LossForensics()._identify_causes(losses, trades)
+
+    assert causes['wrong_session']['count'] == 1  # Tokyo: 1 loss, no wins
+    assert causes['other']['count'] == 1
+
+
 if __name__ == '__main__':
     test_loss_forensics()
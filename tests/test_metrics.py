@@ -0,0 +1,118 @@
+# tests/test_metrics.py
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.metrics as metrics
+from core.metrics import MetricsContext, clear_metrics, get_metrics_summary, track_performance
+
+
+@pytest.fixture(autouse=True)
+def _clean_store():
+    clear_metrics()
+    yield
+    clear_metrics()
+
+
+def test_track_performance_records_calls():
+    """Each call stores one record; failures are counted and re-raised"""
+    @track_performance("unit_op", log_all=False)
+    def work(fail=False):
+        if fail:
+            raise ValueError("boom")
+        return 42
+
+    assert work() == 42
+    with pytest.raises(ValueError):
+        work(fail=True)
+
+    summary = get_metrics_summary("unit_op")["unit_op"]
+    assert summary['count'] == 2
+    assert summary['success_rate'] == 50.0
+    assert 0 <= summary['min_duration'] <= summary['max_duration']
+    assert summary['slow_count'] == 0
+    assert metrics._metrics_store["unit_op"][-1][3] == "boom"
+
+
+def test_metrics_store_is_bounded(monkeypatch):
+    """Only the last MAX_ENTRIES records are kept per operation"""
+    @track_performance("bounded_op", log_all=False)
+    def work():
+        return None
+
+    for _ in range(metrics.MAX_ENTRIES + 5):
+        work()
+
+    assert get_metrics_summary("bounded_op")["bounded_op"]['count'] == metrics.MAX_ENTRIES
+
+
+def test_metrics_context_keeps_metadata():
+    """MetricsContext records duration and attached metadata"""
+    with MetricsContext("ctx_op") as ctx:
+        ctx.add_metadata(trades=3)
+
+    record = metrics._metrics_store["ctx_op"][-1]
+    assert record[2] is True
+    assert record[4] == {'trades': 3}
+    assert get_metrics_summary()["ctx_op"]['count'] == 1
+
+
+def test_persistent_ring_survives_restart(tmp_path, monkeypatch):
+    """Ring files wrap at MAX_ENTRIES and are reloaded by a new process"""
+    monkeypatch.setattr(metrics, 'MAX_ENTRIES', 4)
+    monkeypatch.setattr(metrics, '_ring_dir', None)
+    monkeypatch.setattr(metrics, '_rings', {})
+    metrics.enable_persistent_metrics(str(tmp_path))
+
+    @track_performance("ring_op", log_all=False)
+    def work(fail=False):
+        if fail:
+            raise RuntimeError("x")
+
+    for fail in (True, False, False, False, False, False):
+        try:
+            work(fail)
+        except RuntimeError:
+            pass
+
+    ring_file = tmp_path / 'ring_op.ring'
+    assert ring_file.stat().st_size == 8 + 4 * metrics._RING_RECORD.itemsize
+
+    # Simulate a restart: the in-memory store is gone, the ring file is reopened
+    metrics._metrics_store.clear()
+    metrics.enable_persistent_metrics(str(tmp_path))
+    summary = get_metrics_summary("ring_op")["ring_op"]
+    assert summary['count'] == 4
+    assert summary['success_rate'] == 100.0
+
+    records = metrics._rings['ring_op'].snapshot()
+    assert (records['timestamp_ns'][1:] >= records['timestamp_ns'][:-1]).all()
+
+    clear_metrics("ring_op")
+    assert get_metrics_summary("ring_op") == {}
+
+
+def test_persistent_ring_sanitized_name_reopened_once(tmp_path, monkeypatch):
+    """After a restart, calls to an operation with unsafe characters go to the reopened ring"""
+    monkeypatch.setattr(metrics, '_ring_dir', None)
+    monkeypatch.setattr(metrics, '_rings', {})
+    metrics.enable_persistent_metrics(str(tmp_path))
+
+    @track_performance("load data/XAUUSD", log_all=False)
+    def work():
+        pass
+
+    work()
+    metrics._metrics_store.clear()
+    metrics.enable_persistent_metrics(str(tmp_path))
+    reopened = metrics._rings['load_data_XAUUSD']
+    work()
+
+    assert list(metrics._rings) == ['load_data_XAUUSD']
+    assert metrics._rings['load_data_XAUUSD'] is reopened
+    assert len(reopened.snapshot()) == 2
+    assert get_metrics_summary("load data/XAUUSD")["load data/XAUUSD"]['count'] == 2
+    assert list(get_metrics_summary()) == ["load data/XAUUSD"]
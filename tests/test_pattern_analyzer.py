@@ -96,7 +96,7 @@ print("="*50 + "\n")
 analyzer = TimingAnalyzer(test_trades)
 
 # Run analysis
-results = analyzer.analyze()
+results = analyzer.intelligence()
 
 print("SESSION BREAKDOWN")
 print("-"*50)
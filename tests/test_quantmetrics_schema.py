@@ -0,0 +1,168 @@
+# tests/test_quantmetrics_schema.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.quantmetrics_schema import (
+    calculate_rr, calculate_rr_vec, detect_session, detect_session_vec
+)
+
+
+def test_detect_session_vec_matches_scalar():
+    """Every hour maps to the same session as detect_session"""
+    timestamps = pd.date_range('2024-01-01', periods=24, freq='h')
+
+    sessions = detect_session_vec(timestamps)
+
+    assert sessions.tolist() == [detect_session(ts) for ts in timestamps]
+
+
+def test_calculate_rr_vec_matches_scalar():
+    """LONG/SHORT, losses and zero risk follow calculate_rr"""
+    entry = [100.0, 100.0, 100.0, 100.0]
+    exit_ = [104.0, 98.0, 97.0, 101.0]
+    sl = [98.0, 101.0, 101.0, 100.0]
+    direction = ['LONG', 'LONG', 'SHORT', 'SHORT']
+
+    rr = calculate_rr_vec(entry, exit_, sl, direction)
+
+    assert rr.tolist() == [calculate_rr(*args) for args in zip(entry, exit_, sl, direction)]
+    assert calculate_rr_vec(entry, exit_, sl, np.array(direction) == 'LONG').tolist() == rr.tolist()
+
+
+def test_detect_session_boundaries():
+    """Tokyo 00-07, London 08-13, NY 14-23"""
+    hours = [0, 7, 8, 13, 14, 23]
+    timestamps = [pd.Timestamp(2024, 1, 1, hour) for hour in hours]
+
+    assert [detect_session(ts) for ts in timestamps] == ['Tokyo', 'Tokyo', 'London', 'London', 'NY', 'NY']
+    assert type(detect_session(timestamps[0])) is str
+
+
+def test_trade_batch_from_frame_timestamp_formats():
+    """ISO 8601 and non-ISO timestamp columns both parse to datetime64[ns]"""
+    from core.quantmetrics_schema import TradeBatch
+
+    row = {
+        'symbol': 'XAUUSD', 'direction': 'LONG', 'entry_price': 1.0, 'exit_price': 2.0,
+        'sl': 0.5, 'tp': 2.0, 'profit_usd': 1.0, 'profit_r': 2.0, 'result': 'WIN',
+    }
+    iso = pd.DataFrame([{**row, 'timestamp_open': '2024-01-15T14:30:00', 'timestamp_close': '2024-01-15 15:45:00'}])
+    us = pd.DataFrame([{**row, 'timestamp_open': '01/15/2024 14:30', 'timestamp_close': '01/15/2024 15:45'}])
+
+    for df in (iso, us):
+        batch = TradeBatch.from_frame(df)
+        assert batch.timestamp_open.dtype == 'datetime64[ns]'
+        assert batch.timestamp_open[0] == np.datetime64('2024-01-15T14:30')
+        assert batch.timestamp_close[0] == np.datetime64('2024-01-15T15:45')
+
+
+def test_trade_batch_to_trades_positional():
+    """to_trades builds each trade positionally in QuantMetricsTrade field order"""
+    from dataclasses import fields
+    from core.quantmetrics_schema import QuantMetricsTrade, TradeBatch
+
+    assert [f.name for f in fields(TradeBatch)] == [f.name for f in fields(QuantMetricsTrade)]
+
+    batch = TradeBatch(
+        timestamp_open=np.array(['2024-01-01T10:00'], dtype='datetime64[ns]'),
+        timestamp_close=np.array(['2024-01-01T11:00'], dtype='datetime64[ns]'),
+        symbol=np.array(['XAUUSD'], dtype=object),
+        direction=np.array(['SHORT'], dtype=object),
+        entry_price=np.array([10.0]), exit_price=np.array([8.0]),
+        sl=np.array([11.0]), tp=np.array([8.0]),
+        profit_usd=np.array([2.0]), profit_r=np.array([2.0]),
+        result=np.array(['WIN'], dtype=object),
+    )
+    trade = batch.to_trades()[0]
+
+    assert trade.timestamp_open == pd.Timestamp('2024-01-01 10:00')
+    assert (trade.symbol, trade.direction, trade.sl, trade.tp, trade.result) == ('XAUUSD', 'SHORT', 11.0, 8.0, 'WIN')
+    assert type(trade.entry_price) is float
+
+
+def test_trade_batch_categorical_columns():
+    """String fields are Categoricals with stable codes; unknown values are kept"""
+    from core.quantmetrics_schema import TradeBatch
+
+    df = pd.DataFrame({
+        'timestamp_open': ['2024-01-01 10:00'] * 3,
+        'timestamp_close': ['2024-01-01 11:00'] * 3,
+        'symbol': ['XAUUSD', 'EURUSD', 'XAUUSD'],
+        'direction': ['SHORT', 'LONG', 'long'],
+        'entry_price': 1.0, 'exit_price': 2.0, 'sl': 0.5, 'tp': 2.0,
+        'profit_usd': 1.0, 'profit_r': 2.0,
+        'result': ['WIN', 'LOSS', 'WIN'],
+    })
+
+    batch = TradeBatch.from_frame(df)
+
+    assert batch.direction.codes.tolist() == [1, 0, 2]
+    assert batch.direction.codes.dtype == np.int8
+    assert batch.result.codes.tolist() == [0, 1, 0]
+    assert sorted(batch.symbol.categories) == ['EURUSD', 'XAUUSD']
+    assert [t.direction for t in batch.to_trades()] == ['SHORT', 'LONG', 'long']
+    assert type(batch.to_trades()[0].symbol) is str
+
+
+def test_detect_session_vec_accepts_hours():
+    """Integer hour arrays map directly through the session table"""
+    timestamps = pd.date_range('2024-01-01', periods=24, freq='h')
+
+    by_hour = detect_session_vec(np.arange(24))
+
+    assert by_hour.tolist() == detect_session_vec(timestamps).tolist()
+    assert detect_session_vec(timestamps.hour).tolist() == by_hour.tolist()
+
+
+def test_calculate_rr_vec_nan_and_no_warnings():
+    """Missing prices give NaN like the scalar version; zero risk raises no warning"""
+    import warnings
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        rr = calculate_rr_vec([100.0, 100.0], [np.nan, 101.0], [99.0, 100.0], ['LONG', 'SHORT'])
+
+    assert np.isnan(rr[0]) and np.isnan(calculate_rr(100.0, np.nan, 99.0, 'LONG'))
+    assert rr[1] == 0.0
+
+
+def test_trade_batch_from_trades_round_trip():
+    """from_trades -> to_trades reproduces the trade fields"""
+    from dataclasses import astuple
+    from core.quantmetrics_schema import QuantMetricsTrade, TradeBatch
+
+    trades = [
+        QuantMetricsTrade(pd.Timestamp('2024-01-01 10:00'), pd.Timestamp('2024-01-01 11:00'), 'XAUUSD',
+                          'LONG', 100.0, 102.0, 99.0, 102.0, 2.0, 2.0, 'WIN'),
+        QuantMetricsTrade(pd.Timestamp('2024-01-02 15:00'), pd.Timestamp('2024-01-02 16:30'), 'EURUSD',
+                          'SHORT', 1.1, 1.11, 1.105, 1.09, -0.01, -2.0, 'LOSS'),
+    ]
+
+    batch = TradeBatch.from_trades(trades)
+
+    assert batch.profit_r.tolist() == [2.0, -2.0]
+    assert batch.direction.codes.tolist() == [0, 1]
+    assert [astuple(t) for t in batch.to_trades()] == [astuple(t) for t in trades]
+    assert len(TradeBatch.from_trades([])) == 0
+
+
+def test_trade_batch_to_frame_categoricals():
+    """to_frame exposes categorical direction/result/symbol/session columns"""
+    from core.csv_parser import CSVParser
+
+    sample = Path(__file__).parent / 'sample_data' / 'trades_sample.csv'
+    batch = CSVParser().parse_batch(str(sample))
+
+    df = batch.to_frame()
+
+    assert len(df) == len(batch)
+    for column in ('symbol', 'direction', 'result', 'session'):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype), column
+    assert list(df['session'].cat.categories) == ['Tokyo', 'London', 'NY']
+    assert df['session'].astype(str).tolist() == detect_session_vec(df['timestamp_open']).tolist()
+    assert df['profit_r'].dtype == np.float64
@@ -0,0 +1,342 @@
+# tests/test_timing_analyzer.py
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pattern_analyzer import HourStats, TimingAnalyzer, _trades_to_soa
+from core.quantmetrics_schema import QuantMetricsTrade
+
+
+def _trade(hour, result, profit_r, direction='LONG', day=15):
+    return QuantMetricsTrade(
+        timestamp_open=datetime(2024, 1, day, hour, 30),
+        timestamp_close=datetime(2024, 1, day, hour, 45),
+        symbol='XAUUSD', direction=direction,
+        entry_price=2050.0, exit_price=2050.0 + profit_r * 5,
+        sl=2045.0, tp=2060.0,
+        profit_usd=profit_r * 50, profit_r=profit_r, result=result
+    )
+
+
+def test_sessions_count_overlap_in_london_and_ny():
+    """Hours 14-15 belong to London and NY; 22-23 to no session"""
+    trades = [
+        _trade(2, 'LOSS', -1.0),
+        _trade(10, 'WIN', 2.0),
+        _trade(14, 'WIN', 3.0),
+        _trade(15, 'TIMEOUT', 0.2),
+        _trade(23, 'WIN', 1.0),
+    ]
+
+    sessions = TimingAnalyzer().analyze(trades)['session_breakdown']
+
+    assert sessions['Tokyo'] == {
+        'total_trades': 1, 'wins': 0, 'losses': 1, 'winrate': 0.0,
+        'expectancy': -1.0, 'verdict': 'AVOID', 'time_range': '00:00-08:00 UTC'
+    }
+    assert sessions['London']['total_trades'] == 3
+    assert sessions['London']['wins'] == 2
+    assert sessions['London']['losses'] == 0
+    assert sessions['London']['expectancy'] == round(5.2 / 3, 2)
+    assert sessions['NY']['total_trades'] == 2
+    assert sessions['NY']['verdict'] == 'NEUTRAL'  # 50% winrate
+
+
+def test_sessions_no_trades():
+    """Empty trade list -> every session reports NO_DATA"""
+    sessions = TimingAnalyzer().analyze([])['session_breakdown']
+
+    assert [s['verdict'] for s in sessions.values()] == ['NO_DATA'] * 3
+    assert all(type(s['total_trades']) is int for s in sessions.values())
+
+
+def test_hourly_breakdown_first_seen_order():
+    """Hours keep their first-appearance order; ties go to the earlier hour"""
+    trades = [
+        _trade(15, 'WIN', 2.0),
+        _trade(9, 'WIN', 2.0),
+        _trade(15, 'LOSS', -1.0),
+        _trade(9, 'LOSS', -1.0),
+        _trade(3, 'WIN', 1.0),
+    ]
+
+    results = TimingAnalyzer().analyze(trades)
+    hourly = results['hourly_breakdown']
+
+    assert list(hourly) == [15, 9, 3]
+    assert hourly[15] == HourStats(total_trades=2, wins=1, winrate=50.0, expectancy=0.5)
+    assert type(hourly[3].wins) is int
+    assert hourly[3]['expectancy'] == hourly[3].expectancy == 1.0
+    assert results['best_hour']['hour'] == 15
+
+
+def test_trades_to_soa_fields():
+    """One array per analysed field, aligned with the trade list"""
+    arrays = _trades_to_soa([
+        _trade(2, 'LOSS', -1.0, 'SHORT'),
+        _trade(14, 'WIN', 3.0),
+        _trade(21, 'TIMEOUT', 0.1, 'SHORT'),
+    ])
+
+    assert len(arrays) == 3
+    assert arrays.hour.dtype == 'int8'
+    assert arrays.hour.tolist() == [2, 14, 21]
+    assert arrays.profit_r.tolist() == [-1.0, 3.0, 0.1]
+    assert arrays.result_code.dtype == 'int8'
+    assert arrays.result_code.tolist() == [-1, 1, 0]
+    assert arrays.is_win.tolist() == [False, True, False]
+    assert arrays.is_loss.tolist() == [True, False, False]
+    assert arrays.is_long.tolist() == [False, True, False]
+    assert len(_trades_to_soa([])) == 0
+
+
+@pytest.mark.parametrize('kernel', ['fused_timing', 'fused_timing_numpy', 'fused_timing_parallel'])
+def test_fused_timing_matches_numpy(kernel):
+    """Every tally implementation equals plain bincount/mask reductions"""
+    from functools import partial
+
+    import numpy as np
+    import core._pattern_kernels as kernels
+
+    fused_timing = getattr(kernels, kernel)
+    if kernel == 'fused_timing_parallel':
+        fused_timing = partial(fused_timing, n_chunks=4)
+
+    rng = np.random.default_rng(3)
+    hours = rng.integers(0, 24, 500).astype(np.int8)
+    profit = rng.normal(size=500)
+    is_win = profit > 0.3
+    is_loss = profit < -0.3
+    starts, ends = np.array([0, 8, 14]), np.array([8, 16, 22])
+    hour_session_mask = np.zeros(24, dtype=np.uint8)
+    for s, (start, end) in enumerate(zip(starts, ends)):
+        hour_session_mask[start:end] |= 1 << s
+
+    (hour_counts, hour_wins, hour_profit, hour_first,
+     session_counts, session_wins, session_losses, session_profit,
+     session_win_profit, session_loss_profit) = fused_timing(
+        hours, profit, is_win, is_loss, hour_session_mask, 3
+    )
+
+    assert hour_counts.tolist() == np.bincount(hours, minlength=24).tolist()
+    assert hour_wins.tolist() == np.bincount(hours[is_win], minlength=24).tolist()
+    assert np.allclose(hour_profit, np.bincount(hours, weights=profit, minlength=24))
+    seen, first = np.unique(hours, return_index=True)
+    assert hour_first[seen].tolist() == first.tolist()
+    for s, (start, end) in enumerate(zip(starts, ends)):
+        mask = (hours >= start) & (hours < end)
+        assert session_counts[s] == mask.sum()
+        assert session_wins[s] == (mask & is_win).sum()
+        assert session_losses[s] == (mask & is_loss).sum()
+        assert np.isclose(session_profit[s], profit[mask].sum())
+        assert np.isclose(session_win_profit[s], profit[mask & is_win].sum())
+        assert np.isclose(session_loss_profit[s], profit[mask & is_loss].sum())
+
+
+def test_analyze_memoized_per_trade_list(monkeypatch):
+    """The same unchanged list reuses the last result; appended trades are tallied alone"""
+    analyzer = TimingAnalyzer()
+    batches = []
+    add_trades = analyzer._add_trades
+    monkeypatch.setattr(analyzer, '_add_trades', lambda trades: batches.append(len(trades)) or add_trades(trades))
+
+    trades = [_trade(10, 'WIN', 2.0), _trade(12, 'WIN', 1.0), _trade(15, 'LOSS', -1.0)]
+    first = analyzer.analyze(trades)
+    first['session_breakdown'].clear()  # callers get their own copy
+    second = analyzer.analyze(trades)
+    assert batches == [3]
+    assert second['session_breakdown']['London']['total_trades'] == 3
+
+    # Another list with the same endpoints is analysed afresh
+    other = list(trades)
+    other[1] = _trade(12, 'LOSS', -1.0)
+    assert analyzer.analyze(other)['session_breakdown']['London']['wins'] == 1
+    assert batches == [3, 3]
+
+    trades.append(_trade(3, 'WIN', 1.0))
+    analyzer.analyze(trades)  # not the last list -> full rebuild
+    assert batches == [3, 3, 4]
+    trades.append(_trade(4, 'WIN', 1.0))
+    third = analyzer.analyze(trades)
+    assert batches == [3, 3, 4, 1]
+    assert third == TimingAnalyzer().analyze(trades)
+
+    analyzer.analyze(trades[1:])  # not an extension -> full rebuild
+    assert batches == [3, 3, 4, 1, 4]
+
+
+def test_add_trade_matches_batch_analysis():
+    """Trades added one at a time give the same analysis as the full list"""
+    trades = [
+        _trade(hour, result, profit, day=day)
+        for day in (15, 16)
+        for hour, result, profit in [(2, 'LOSS', -1.0), (9, 'WIN', 2.5), (14, 'WIN', 1.5),
+                                     (15, 'TIMEOUT', 0.2), (21, 'LOSS', -0.5), (9, 'WIN', 1.0)]
+    ]
+
+    analyzer = TimingAnalyzer()
+    for trade in trades:
+        analyzer.add_trade(trade)
+
+    assert analyzer.analyze() == TimingAnalyzer().analyze(trades)
+    assert analyzer.analyze(trades) == TimingAnalyzer().analyze(trades)
+
+
+def test_verdict_table_boundaries():
+    """Band edges: expectancy > 0 / > 0.5R, winrate >= 45 / >= 55 (>= 50 for edge)"""
+    from core.pattern_analyzer import (
+        _DIRECTION_EDGE, _DIRECTION_WINRATE_BANDS, _SESSION_VERDICT,
+        _SESSION_WINRATE_BANDS, _grade
+    )
+
+    def verdict(expectancy, winrate):
+        return _grade(expectancy, winrate, _SESSION_WINRATE_BANDS, _SESSION_VERDICT)
+
+    assert verdict(0.0, 100.0) == 'AVOID'
+    assert verdict(0.01, 45.0) == 'NEUTRAL'
+    assert verdict(0.5, 60.0) == 'NEUTRAL'
+    assert verdict(0.51, 55.0) == 'FOCUS'
+    assert verdict(0.51, 54.9) == 'NEUTRAL'
+    assert verdict(2.0, 44.9) == 'AVOID'
+    assert _grade(0.51, 50.0, _DIRECTION_WINRATE_BANDS, _DIRECTION_EDGE) == 'STRONG'
+    assert _grade(0.51, 49.9, _DIRECTION_WINRATE_BANDS, _DIRECTION_EDGE) == 'WEAK'
+
+
+def test_best_key_ties_and_minimum():
+    """Highest/lowest expectancy among qualifying entries; first entry wins ties"""
+    from core.pattern_analyzer import _best_key
+
+    breakdown = {
+        9: {'expectancy': 1.5, 'total_trades': 1},
+        14: {'expectancy': 0.8, 'total_trades': 3},
+        3: {'expectancy': 0.8, 'total_trades': 2},
+        20: {'expectancy': -0.4, 'total_trades': 2},
+    }
+
+    assert _best_key(breakdown) == 9
+    assert _best_key(breakdown, min_trades=2) == 14
+    assert _best_key(breakdown, lowest=True) == 20
+    assert _best_key(breakdown, min_trades=4) is None
+    assert _best_key({}) is None
+
+
+def test_intelligence_session_performance():
+    """Typed view: unrounded session stats, 0-1 winrates, overlap winrate"""
+    trades = [
+        _trade(2, 'LOSS', -1.0),
+        _trade(10, 'WIN', 3.0),
+        _trade(14, 'WIN', 2.0),
+        _trade(15, 'LOSS', -0.5),
+    ]
+
+    intel = TimingAnalyzer(trades).intelligence()
+
+    london = intel.sessions['London']
+    assert (london.total_trades, london.wins, london.losses) == (3, 2, 1)
+    assert london.winrate == 2 / 3
+    assert london.avg_win_r == 2.5
+    assert london.avg_loss_r == -0.5
+    assert london.total_profit_r == 4.5
+    assert london.to_dict() == TimingAnalyzer().analyze(trades)['session_breakdown']['London']
+    assert intel.best_session == 'London'
+    assert intel.worst_session == 'Tokyo'
+    assert intel.best_hour is None
+    assert intel.overlap_performance == {'London-NY': 0.5}
+
+
+def test_hour_session_mask_overlap():
+    """Hours 14-15 are in London and NY, 22-23 in no session"""
+    from core.pattern_analyzer import _HOUR_SESSION_MASK
+
+    assert _HOUR_SESSION_MASK[:8].tolist() == [0b001] * 8
+    assert _HOUR_SESSION_MASK[8:14].tolist() == [0b010] * 6
+    assert _HOUR_SESSION_MASK[14:16].tolist() == [0b110] * 2
+    assert _HOUR_SESSION_MASK[16:22].tolist() == [0b100] * 6
+    assert _HOUR_SESSION_MASK[22:].tolist() == [0, 0]
+
+
+def test_overlap_performance_from_hour_tallies():
+    """Overlap winrate covers hours 14 and 15 only, incrementally updated"""
+    trades = [
+        _trade(13, 'WIN', 1.0),
+        _trade(14, 'WIN', 2.0),
+        _trade(15, 'LOSS', -1.0),
+        _trade(15, 'TIMEOUT', 0.1),
+        _trade(16, 'WIN', 1.0),
+    ]
+
+    analyzer = TimingAnalyzer()
+    assert analyzer.intelligence(trades).overlap_performance == {'London-NY': 1 / 3}
+
+    analyzer.add_trade(_trade(14, 'WIN', 1.5))
+    assert analyzer.intelligence().overlap_performance == {'London-NY': 2 / 4}
+    assert TimingAnalyzer().intelligence([]).overlap_performance == {'London-NY': 0.0}
+
+
+def test_trade_arrays_shared_between_analyzers(monkeypatch):
+    """One list object is converted once; copies and look-alikes are not hits"""
+    import core.pattern_analyzer as pattern_analyzer
+    from core.pattern_analyzer import DirectionalAnalyzer
+
+    conversions = []
+    to_soa = pattern_analyzer._trades_to_soa
+    monkeypatch.setattr(pattern_analyzer, '_trades_to_soa',
+                        lambda trades: conversions.append(len(trades)) or to_soa(trades))
+
+    trades = [_trade(10, 'WIN', 2.0), _trade(12, 'WIN', 1.0), _trade(15, 'LOSS', -1.0, 'SHORT')]
+    TimingAnalyzer().analyze(trades)
+    DirectionalAnalyzer().analyze(trades)
+    assert conversions == [3]
+
+    trades.append(_trade(3, 'WIN', 1.0))
+    assert DirectionalAnalyzer().analyze(trades)['long_stats']['total_trades'] == 3
+    assert conversions == [3, 4]
+
+    DirectionalAnalyzer().analyze(list(trades))  # equal copy, other object
+    assert conversions == [3, 4, 4]
+
+    # Same length and endpoints, different middle trade
+    other = list(trades)
+    other[1] = _trade(12, 'LOSS', -1.0)
+    assert DirectionalAnalyzer().analyze(other)['long_stats']['wins'] == 2
+    assert conversions == [3, 4, 4, 4]
+
+    TimingAnalyzer().analyze(trades)  # the original list is still cached
+    assert conversions == [3, 4, 4, 4]
+
+
+def test_trade_arrays_not_shared_with_other_list_same_endpoints():
+    """Another list with the same first and last trade gets its own arrays"""
+    from core.pattern_analyzer import DirectionalAnalyzer, ExecutionAnalyzer, LossForensics
+
+    trades = [_trade(hour, 'WIN', 1.0) for hour in (9, 10, 12, 13, 14)]
+    other = list(trades)
+    other[2] = _trade(12, 'LOSS', -1.0)
+
+    TimingAnalyzer().analyze(trades)
+    assert DirectionalAnalyzer().analyze(other)['long_stats']['wins'] == 4
+    assert ExecutionAnalyzer().analyze(other)['sl_behavior']['total_losses'] == 1
+    assert TimingAnalyzer().analyze(other)['hourly_breakdown'][12]['wins'] == 0
+    breakdown = LossForensics().analyze(other)['loss_breakdown']
+    assert sum(breakdown[kind]['count'] for kind in ('proper', 'early_exits', 'held_past_sl')) == 1
+
+
+def test_parallel_tallies_match_single_thread(monkeypatch):
+    """Large histories (threshold lowered here) analyse the same in chunks"""
+    import core._pattern_kernels as kernels
+
+    trades = [
+        _trade(hour, result, profit, day=day)
+        for day in range(1, 20)
+        for hour, result, profit in [(2, 'LOSS', -1.0), (9, 'WIN', 2.5), (14, 'WIN', 1.5),
+                                     (15, 'TIMEOUT', 0.25), (21, 'LOSS', -0.5)]
+    ]
+    expected = TimingAnalyzer().analyze(trades)
+
+    monkeypatch.setattr(kernels, 'PARALLEL_MIN_TRADES', 0)
+    monkeypatch.setattr(kernels.os, 'cpu_count', lambda: 4)
+    assert TimingAnalyzer().analyze(trades) == expected